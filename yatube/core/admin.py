@@ -1,5 +1,27 @@
+import typing
+
 from django.contrib import admin
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+
+from core.search import FullTextIndex
 
 
 class BaseAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
+
+
+class FullTextSearchAdmin(BaseAdmin):
+    """Админка, ищущая по полнотекстовому индексу вместо LIKE."""
+
+    search_index: FullTextIndex
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> typing.Tuple[QuerySet, bool]:
+        if not search_term:
+            return queryset, False
+        return self.search_index.filter(queryset, search_term), False
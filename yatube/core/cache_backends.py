@@ -0,0 +1,346 @@
+import contextlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import typing
+from pathlib import Path
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Максимальный суммарный размер ключей и значений в байтах.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# Время последнего обращения копится в памяти процесса и записывается
+# не чаще этого интервала: чтение не должно брать блокировку на запись.
+ACCESS_FLUSH_INTERVAL = 1.0
+
+# Ограничение числа параметров одного SQL-запроса.
+VARIABLES_LIMIT = 500
+
+SCHEMA = '''
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS cache_entries (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_entries_accessed
+    ON cache_entries (accessed);
+CREATE INDEX IF NOT EXISTS cache_entries_expires
+    ON cache_entries (expires) WHERE expires IS NOT NULL;
+CREATE TABLE IF NOT EXISTS cache_usage (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_usage VALUES (1, 0, 0);
+CREATE TRIGGER IF NOT EXISTS cache_entries_inserted
+AFTER INSERT ON cache_entries BEGIN
+    UPDATE cache_usage
+    SET entries = entries + 1, size = size + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_updated
+AFTER UPDATE OF size ON cache_entries BEGIN
+    UPDATE cache_usage SET size = size + new.size - old.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_deleted
+AFTER DELETE ON cache_entries BEGIN
+    UPDATE cache_usage
+    SET entries = entries - 1, size = size - old.size;
+END;
+COMMIT;
+'''
+
+UPSERT = '''
+INSERT INTO cache_entries (key, value, expires, accessed, size)
+VALUES (:key, :value, :expires, :now, :size)
+ON CONFLICT (key) DO UPDATE SET
+    value = excluded.value,
+    expires = excluded.expires,
+    accessed = excluded.accessed,
+    size = excluded.size
+'''
+
+
+def _chunked(
+    keys: typing.Sequence[str],
+) -> typing.Iterator[typing.Sequence[str]]:
+    for start in range(0, len(keys), VARIABLES_LIMIT):
+        end = start + VARIABLES_LIMIT
+        yield keys[start:end]
+
+
+def _placeholders(keys: typing.Sequence[str]) -> str:
+    return ', '.join('?' * len(keys))
+
+
+class SQLiteCache(BaseCache):
+    """Кэш в файле SQLite, общий для всех процессов сервера на машине.
+
+    База работает в режиме WAL: читатели не блокируют друг друга
+    и писателя, а запись идёт в транзакциях ``BEGIN IMMEDIATE``, поэтому
+    ``add``, ``incr`` и ``decr`` атомарны между процессами. Число записей
+    и их суммарный размер поддерживаются триггерами; при превышении
+    ``MAX_ENTRIES`` или ``MAX_SIZE`` сначала удаляются просроченные
+    записи, затем давно не читавшиеся.
+
+    Настройки ``OPTIONS``:
+        MAX_ENTRIES: Наибольшее число записей.
+        MAX_SIZE: Наибольший суммарный размер ключей и значений в байтах.
+        CULL_FREQUENCY: Какая доля записей удаляется за один шаг
+            вытеснения: ``1 / CULL_FREQUENCY``.
+        BUSY_TIMEOUT: Сколько секунд ждать блокировку на запись.
+    """
+
+    def __init__(self, location: str, params: typing.Dict) -> None:
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = Path(location)
+        self._max_size = int(options.get('MAX_SIZE', DEFAULT_MAX_SIZE))
+        self._busy_timeout = float(options.get('BUSY_TIMEOUT', 5))
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока.
+
+        Соединение, унаследованное через ``fork``, не используется:
+        SQLite запрещает работать с ним из дочернего процесса.
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self._path),
+                timeout=self._busy_timeout,
+                isolation_level=None,
+            )
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            self._local.accessed = {}
+            self._local.flushed = time.time()
+        return self._local.connection
+
+    @contextlib.contextmanager
+    def _write(self) -> typing.Iterator[sqlite3.Connection]:
+        """Транзакция на запись с вытеснением лишних записей в конце."""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            self._flush_access(connection)
+            yield connection
+            self._evict(connection)
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _touch_accessed(self, keys: typing.Iterable[str]) -> None:
+        now = time.time()
+        self._local.accessed.update(dict.fromkeys(keys, now))
+        if now - self._local.flushed >= ACCESS_FLUSH_INTERVAL:
+            with self._write():
+                pass
+
+    def _flush_access(self, connection: sqlite3.Connection) -> None:
+        if self._local.accessed:
+            connection.executemany(
+                'UPDATE cache_entries SET accessed = :now '
+                'WHERE key = :key AND accessed < :now',
+                (
+                    {'key': key, 'now': now}
+                    for key, now in self._local.accessed.items()
+                ),
+            )
+            self._local.accessed.clear()
+        self._local.flushed = time.time()
+
+    def _usage(self, connection: sqlite3.Connection) -> typing.Tuple[int, int]:
+        return connection.execute(
+            'SELECT entries, size FROM cache_usage',
+        ).fetchone()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        entries, size = self._usage(connection)
+        if entries <= self._max_entries and size <= self._max_size:
+            return
+        if self._cull_frequency == 0:
+            connection.execute('DELETE FROM cache_entries')
+            return
+        connection.execute(
+            'DELETE FROM cache_entries WHERE expires <= ?',
+            (time.time(),),
+        )
+        entries, size = self._usage(connection)
+        while entries > self._max_entries or size > self._max_size:
+            connection.execute(
+                'DELETE FROM cache_entries WHERE id IN ('
+                'SELECT id FROM cache_entries ORDER BY accessed LIMIT ?)',
+                (max(1, entries // self._cull_frequency),),
+            )
+            entries, size = self._usage(connection)
+
+    def _key(self, key: str, version: typing.Optional[int]) -> str:
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _row(
+        self,
+        key: str,
+        value: typing.Any,
+        timeout: typing.Any,
+    ) -> typing.Dict[str, typing.Any]:
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return {
+            'key': key,
+            'value': value,
+            'expires': self.get_backend_timeout(timeout),
+            'now': time.time(),
+            'size': len(key) + len(value),
+        }
+
+    def _fetch(self, keys: typing.Sequence[str]) -> typing.Dict[str, bytes]:
+        now = time.time()
+        connection = self._connection()
+        found = {}
+        for chunk in _chunked(keys):
+            found.update(
+                connection.execute(
+                    'SELECT key, value FROM cache_entries '
+                    f'WHERE key IN ({_placeholders(chunk)}) '
+                    'AND (expires IS NULL OR expires > ?)',
+                    (*chunk, now),
+                ),
+            )
+        if found:
+            self._touch_accessed(found)
+        return found
+
+    def get(
+        self,
+        key: str,
+        default: typing.Any = None,
+        version: typing.Optional[int] = None,
+    ) -> typing.Any:
+        key = self._key(key, version)
+        found = self._fetch((key,))
+        return pickle.loads(found[key]) if key in found else default
+
+    def get_many(
+        self,
+        keys: typing.Iterable[str],
+        version: typing.Optional[int] = None,
+    ) -> typing.Dict[str, typing.Any]:
+        names = {self._key(key, version): key for key in keys}
+        return {
+            names[key]: pickle.loads(value)
+            for key, value in self._fetch(list(names)).items()
+        }
+
+    def has_key(self, key: str, version: typing.Optional[int] = None) -> bool:
+        return bool(self._fetch((self._key(key, version),)))
+
+    def set(
+        self,
+        key: str,
+        value: typing.Any,
+        timeout: typing.Any = DEFAULT_TIMEOUT,
+        version: typing.Optional[int] = None,
+    ) -> None:
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(
+        self,
+        data: typing.Dict[str, typing.Any],
+        timeout: typing.Any = DEFAULT_TIMEOUT,
+        version: typing.Optional[int] = None,
+    ) -> typing.List[str]:
+        rows = [
+            self._row(self._key(key, version), value, timeout)
+            for key, value in data.items()
+        ]
+        with self._write() as connection:
+            connection.executemany(UPSERT, rows)
+        return []
+
+    def add(
+        self,
+        key: str,
+        value: typing.Any,
+        timeout: typing.Any = DEFAULT_TIMEOUT,
+        version: typing.Optional[int] = None,
+    ) -> bool:
+        row = self._row(self._key(key, version), value, timeout)
+        with self._write() as connection:
+            # Просроченная запись заменяется, живая остаётся как есть.
+            added = connection.execute(
+                f'{UPSERT} WHERE cache_entries.expires <= :now',
+                row,
+            ).rowcount
+        return added == 1
+
+    def touch(
+        self,
+        key: str,
+        timeout: typing.Any = DEFAULT_TIMEOUT,
+        version: typing.Optional[int] = None,
+    ) -> bool:
+        key = self._key(key, version)
+        with self._write() as connection:
+            touched = connection.execute(
+                'UPDATE cache_entries SET expires = ? WHERE key = ? '
+                'AND (expires IS NULL OR expires > ?)',
+                (self.get_backend_timeout(timeout), key, time.time()),
+            ).rowcount
+        return touched == 1
+
+    def incr(
+        self,
+        key: str,
+        delta: int = 1,
+        version: typing.Optional[int] = None,
+    ) -> int:
+        key = self._key(key, version)
+        with self._write() as connection:
+            row = connection.execute(
+                'SELECT value FROM cache_entries WHERE key = ? '
+                'AND (expires IS NULL OR expires > ?)',
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            stored = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            connection.execute(
+                'UPDATE cache_entries SET value = ?, size = ? WHERE key = ?',
+                (stored, len(key) + len(stored), key),
+            )
+        return value
+
+    def delete(self, key: str, version: typing.Optional[int] = None) -> None:
+        self.delete_many((key,), version)
+
+    def delete_many(
+        self,
+        keys: typing.Iterable[str],
+        version: typing.Optional[int] = None,
+    ) -> None:
+        keys = [self._key(key, version) for key in keys]
+        with self._write() as connection:
+            for chunk in _chunked(keys):
+                connection.execute(
+                    'DELETE FROM cache_entries '
+                    f'WHERE key IN ({_placeholders(chunk)})',
+                    chunk,
+                )
+
+    def clear(self) -> None:
+        with self._write() as connection:
+            connection.execute('DELETE FROM cache_entries')
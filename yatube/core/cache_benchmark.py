@@ -0,0 +1,119 @@
+import itertools
+import random
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.cache.backends.base import BaseCache
+from django.utils.module_loading import import_string
+
+from core.metrics import Summary
+
+# Показатель степенного распределения популярности ключей.
+ZIPF_EXPONENT = 1.1
+
+
+class Workload(typing.NamedTuple):
+    """Нагрузка «читай из кэша, при промахе вычисли и запиши»."""
+
+    operations: int
+    keys: int
+    value_size: int
+    write_ratio: float
+    seed: int
+
+
+def _run(
+    backend: str,
+    location: str,
+    params: typing.Dict[str, typing.Any],
+    workload: Workload,
+    worker: int,
+) -> typing.Tuple[typing.List[float], int, int, float]:
+    """Выполняет нагрузку в одном процессе.
+
+    Returns:
+        Длительности операций в микросекундах, число чтений, число
+        попаданий и время работы процесса в секундах.
+    """
+    cache: BaseCache = import_string(backend)(location, params)
+    rng = random.Random(f'{workload.seed}:{worker}')
+    weights = list(
+        itertools.accumulate(
+            1 / rank**ZIPF_EXPONENT for rank in range(1, workload.keys + 1)
+        ),
+    )
+    payload = rng.randbytes(workload.value_size)
+    latencies = []
+    reads = hits = 0
+    started = time.perf_counter()
+    for key in rng.choices(
+        range(workload.keys),
+        cum_weights=weights,
+        k=workload.operations,
+    ):
+        key = f'benchmark:{key}'
+        operation_started = time.perf_counter()
+        if rng.random() < workload.write_ratio:
+            cache.set(key, payload)
+        else:
+            reads += 1
+            if cache.get(key) is None:
+                cache.set(key, payload)
+            else:
+                hits += 1
+        latencies.append((time.perf_counter() - operation_started) * 10**6)
+    return latencies, reads, hits, time.perf_counter() - started
+
+
+def run(
+    backend: str,
+    location: str,
+    params: typing.Dict[str, typing.Any],
+    workload: Workload,
+    processes: int,
+) -> typing.Dict[str, float]:
+    """Запускает нагрузку одновременно в нескольких процессах.
+
+    Каждый процесс создаёт свой экземпляр бэкенда, как рабочий процесс
+    сервера: кэш в памяти процесса у каждого свой, а общий кэш копит
+    записи всех процессов, что видно по доле попаданий.
+
+    Args:
+        backend: Путь к классу бэкенда кэша.
+        location: Параметр ``LOCATION`` бэкенда.
+        params: Остальные параметры бэкенда.
+        workload: Параметры нагрузки.
+        processes: Количество процессов.
+
+    Returns:
+        Пропускная способность, квантили задержки операций
+        в микросекундах и доля попаданий.
+    """
+    latency = Summary(window=workload.operations * processes)
+    reads = hits = 0
+    elapsed = 0.0
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_run, backend, location, params, workload, worker)
+            for worker in range(processes)
+        ]
+        for future in futures:
+            (
+                latencies,
+                worker_reads,
+                worker_hits,
+                worker_elapsed,
+            ) = future.result()
+            for value in latencies:
+                latency.observe(value)
+            reads += worker_reads
+            hits += worker_hits
+            elapsed = max(elapsed, worker_elapsed)
+    quantiles = dict(latency.quantiles())
+    return {
+        'ops_per_second': round(latency.count / elapsed),
+        'p50_us': round(quantiles[0.5], 1),
+        'p99_us': round(quantiles[0.99], 1),
+        'hit_ratio': round(hits / reads, 3) if reads else 0.0,
+    }
@@ -0,0 +1,88 @@
+import datetime
+import time
+import typing
+import uuid
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def _tag_key(tag: str) -> str:
+    return f'cache_tag:{tag}'
+
+
+def _new_version() -> str:
+    """Версия тега: время смены в наносекундах и случайный хвост."""
+    return f'{time.time_ns()}-{uuid.uuid4().hex[:8]}'
+
+
+def versions(tags: typing.Iterable[str]) -> str:
+    """Возвращает текущие версии тегов одной строкой для ключа кэша.
+
+    Отсутствующим тегам присваивается новая случайная версия, поэтому
+    вытесненный из кэша тег не может вернуть к жизни устаревшие записи.
+
+    Args:
+        tags: Теги, от которых зависит запись кэша.
+
+    Returns:
+        Версии тегов через точку.
+    """
+    return versions_many([tags])[0]
+
+
+def versions_many(
+    tag_sets: typing.Iterable[typing.Iterable[str]],
+) -> typing.List[str]:
+    """Возвращает версии нескольких наборов тегов одним запросом к кэшу.
+
+    Args:
+        tag_sets: Наборы тегов, по одному на запись кэша.
+
+    Returns:
+        Версии каждого набора через точку, как в ``versions``.
+    """
+    key_sets = [[_tag_key(tag) for tag in tags] for tags in tag_sets]
+    keys = list(dict.fromkeys(key for key_set in key_sets for key in key_set))
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), None)
+        found.update(cache.get_many(missing))
+    return [
+        '.'.join(str(found.get(key)) for key in key_set)
+        for key_set in key_sets
+    ]
+
+
+def changed_at(versions: str) -> typing.Optional[datetime.datetime]:
+    """Возвращает время последней смены версий из строки ``versions``.
+
+    Args:
+        versions: Версии тегов через точку.
+
+    Returns:
+        Время самой поздней смены или None, если тегов нет.
+    """
+    times = [
+        int(version.partition('-')[0])
+        for version in versions.split('.')
+        if version.partition('-')[0].isdigit()
+    ]
+    if not times:
+        return None
+    return datetime.datetime.fromtimestamp(max(times) / 10**9, timezone.utc)
+
+
+def invalidate(*tags: str) -> None:
+    """Сменяет версии тегов, делая недоступными все зависящие записи.
+
+    Args:
+        tags: Теги изменившихся данных.
+    """
+    if tags:
+        cache.set_many(
+            {_tag_key(tag): _new_version() for tag in set(tags)},
+            None,
+        )
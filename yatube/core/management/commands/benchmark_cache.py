@@ -0,0 +1,68 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from core import cache_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает кэш в памяти процесса и общий кэш SQLite на одной '
+        'и той же нагрузке из нескольких процессов.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        for name, kind, default, help_text in (
+            ('operations', int, 20_000, 'Количество операций на процесс.'),
+            ('keys', int, 5_000, 'Количество различных ключей.'),
+            ('value-size', int, 4096, 'Размер значения в байтах.'),
+            ('write-ratio', float, 0.05, 'Доля безусловных записей.'),
+            ('processes', int, 4, 'Количество процессов нагрузки.'),
+            ('seed', int, 0, 'Зерно генератора случайных чисел.'),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=kind,
+                default=default,
+                help=help_text,
+            )
+
+    def handle(self, *args, **options) -> None:
+        workload = cache_benchmark.Workload(
+            operations=options['operations'],
+            keys=options['keys'],
+            value_size=options['value_size'],
+            write_ratio=options['write_ratio'],
+            seed=options['seed'],
+        )
+        params = {
+            'OPTIONS': settings.CACHES['default'].get('OPTIONS', {}),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for name, backend, location in (
+                (
+                    'locmem',
+                    'django.core.cache.backends.locmem.LocMemCache',
+                    'benchmark',
+                ),
+                (
+                    'sqlite',
+                    'core.cache_backends.SQLiteCache',
+                    str(Path(directory, 'cache.sqlite3')),
+                ),
+            ):
+                result = cache_benchmark.run(
+                    backend,
+                    location,
+                    params,
+                    workload,
+                    options['processes'],
+                )
+                self.stdout.write(
+                    f'{name}: '
+                    + ', '.join(
+                        f'{metric}={value}' for metric, value in result.items()
+                    ),
+                )
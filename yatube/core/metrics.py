@@ -0,0 +1,197 @@
+import collections
+import contextlib
+import math
+import threading
+import time
+import typing
+
+from django.conf import settings
+from django.db import connections
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+METRICS = (
+    (
+        'request_duration_seconds',
+        'Полное время обработки запроса.',
+    ),
+    (
+        'sql_queries',
+        'Количество SQL-запросов за запрос.',
+    ),
+    (
+        'sql_duration_seconds',
+        'Суммарное время SQL-запросов за запрос.',
+    ),
+    (
+        'template_duration_seconds',
+        'Суммарное время рендера шаблонов за запрос.',
+    ),
+)
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Показатели одного запроса, накапливаемые по ходу его обработки."""
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def execute(
+        self,
+        execute: typing.Callable,
+        sql: str,
+        params: typing.Any,
+        many: bool,
+        context: typing.Dict[str, typing.Any],
+    ) -> typing.Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - started
+
+    def values(self, wall_time: float) -> typing.Dict[str, float]:
+        return {
+            'request_duration_seconds': wall_time,
+            'sql_queries': self.queries,
+            'sql_duration_seconds': self.sql_time,
+            'template_duration_seconds': self.template_time,
+        }
+
+    def server_timing(self, wall_time: float) -> str:
+        """Возвращает значение заголовка ``Server-Timing``.
+
+        Args:
+            wall_time: Полное время обработки запроса в секундах.
+
+        Returns:
+            Длительности SQL, шаблонов и запроса в миллисекундах.
+        """
+        return ', '.join(
+            (
+                f'sql;dur={self.sql_time * 1000:.1f};'
+                f'desc="{self.queries} queries"',
+                f'tpl;dur={self.template_time * 1000:.1f}',
+                f'total;dur={wall_time * 1000:.1f}',
+            ),
+        )
+
+
+def current() -> typing.Optional[RequestMetrics]:
+    return getattr(_local, 'metrics', None)
+
+
+@contextlib.contextmanager
+def collect() -> typing.Iterator[RequestMetrics]:
+    """Собирает показатели кода внутри блока, включая SQL всех баз."""
+    metrics = _local.metrics = RequestMetrics()
+    try:
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(metrics.execute),
+                )
+            yield metrics
+    finally:
+        _local.metrics = None
+
+
+@contextlib.contextmanager
+def template_timer() -> typing.Iterator[None]:
+    """Учитывает время рендера шаблона, не считая вложенные дважды."""
+    metrics = current()
+    if metrics is None:
+        yield
+        return
+    metrics.template_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.template_depth -= 1
+        if not metrics.template_depth:
+            metrics.template_time += time.perf_counter() - started
+
+
+class Summary:
+    """Скользящее окно последних значений с накопленными суммой и числом."""
+
+    def __init__(self, window: int) -> None:
+        self.values: typing.Deque[float] = collections.deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.values.append(value)
+        self.count += 1
+        self.sum += value
+
+    def quantiles(self) -> typing.List[typing.Tuple[float, float]]:
+        """Возвращает квантили окна по методу ближайшего ранга."""
+        values = sorted(self.values)
+        if not values:
+            return []
+        return [
+            (
+                quantile,
+                values[max(math.ceil(quantile * len(values)) - 1, 0)],
+            )
+            for quantile in QUANTILES
+        ]
+
+
+class Registry:
+    """Потокобезопасное хранилище показателей по именам представлений."""
+
+    def __init__(self, window: int = settings.METRICS_WINDOW) -> None:
+        self.window = window
+        self.summaries: typing.Dict[typing.Tuple[str, str], Summary] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, view: str, values: typing.Dict[str, float]) -> None:
+        with self.lock:
+            for name, value in values.items():
+                self.summaries.setdefault(
+                    (name, view),
+                    Summary(self.window),
+                ).observe(value)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.summaries.clear()
+
+    def render(self) -> str:
+        """Выводит показатели в текстовом формате Prometheus.
+
+        Returns:
+            Метрики типа summary с квантилями, суммой и числом значений.
+        """
+        lines = []
+        with self.lock:
+            for name, description in METRICS:
+                metric = f'{settings.METRICS_PREFIX}_{name}'
+                lines.append(f'# HELP {metric} {description}')
+                lines.append(f'# TYPE {metric} summary')
+                for (summary_name, view), summary in sorted(
+                    self.summaries.items(),
+                ):
+                    if summary_name != name:
+                        continue
+                    label = f'view="{view}"'
+                    for quantile, value in summary.quantiles():
+                        lines.append(
+                            f'{metric}{{{label},quantile="{quantile}"}} '
+                            f'{value:.6g}',
+                        )
+                    lines.append(f'{metric}_sum{{{label}}} {summary.sum:.6g}')
+                    lines.append(f'{metric}_count{{{label}}} {summary.count}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
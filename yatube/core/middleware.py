@@ -0,0 +1,33 @@
+import time
+import typing
+
+from django.http import HttpRequest, HttpResponse
+
+from core import metrics
+
+
+class MetricsMiddleware:
+    """Собирает время и число SQL-запросов по представлениям.
+
+    Показатели отдаются клиенту в заголовке ``Server-Timing`` и
+    накапливаются в ``metrics.REGISTRY`` для страницы метрик.
+    """
+
+    def __init__(
+        self,
+        get_response: typing.Callable[[HttpRequest], HttpResponse],
+    ) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        with metrics.collect() as collected:
+            response = self.get_response(request)
+        wall_time = time.perf_counter() - started
+        match = request.resolver_match
+        metrics.REGISTRY.observe(
+            match.view_name if match else 'unresolved',
+            collected.values(wall_time),
+        )
+        response['Server-Timing'] = collected.server_timing(wall_time)
+        return response
@@ -0,0 +1,223 @@
+import base64
+import datetime
+import functools
+import hashlib
+import json
+import re
+import typing
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from core.cache_tags import changed_at, versions
+from core.tiered_cache import tiered_cache
+
+HOLE = re.compile(r'<!--hole:([A-Za-z0-9_\-]+=*)-->')
+
+
+def hole_marker(template_name: str, context: typing.Dict) -> str:
+    """Возвращает метку, на место которой при выдаче встанет фрагмент.
+
+    Args:
+        template_name: Шаблон персонального фрагмента.
+        context: Дополнительный JSON-сериализуемый контекст фрагмента.
+
+    Returns:
+        HTML-комментарий с закодированными параметрами фрагмента.
+    """
+    payload = json.dumps([template_name, context]).encode()
+    return f'<!--hole:{base64.urlsafe_b64encode(payload).decode()}-->'
+
+
+def fill_holes(content: str, request: HttpRequest) -> str:
+    """Рендерит персональные фрагменты страницы для текущего запроса.
+
+    Args:
+        content: HTML страницы с метками фрагментов.
+        request: Передаваемый запрос.
+
+    Returns:
+        HTML страницы с подставленными фрагментами.
+    """
+
+    def render(match: typing.Match) -> str:
+        template_name, context = json.loads(
+            base64.urlsafe_b64decode(match.group(1)),
+        )
+        return render_to_string(template_name, context, request=request)
+
+    return HOLE.sub(render, content)
+
+
+def page_key(
+    request: HttpRequest,
+    versions: str,
+    per_user: bool = False,
+) -> str:
+    """Строит ключ кэша страницы с учётом версий её тегов."""
+    parts = [request.get_full_path(), versions]
+    if per_user:
+        parts.append(str(request.user.pk))
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f'page_cache:{digest}'
+
+
+def page_etag(request: HttpRequest, versions: str) -> str:
+    """Строит ETag страницы по версиям её тегов.
+
+    Персональные фрагменты делают страницы разных пользователей
+    разными, поэтому ETag зависит и от пользователя, и от его токена
+    CSRF, который выводится в формах фрагментов. Данные фрагментов
+    учитываются версиями тегов из ``personal_tags``.
+    """
+    parts = [
+        request.get_full_path(),
+        versions,
+        str(request.user.pk),
+        request.META.get('CSRF_COOKIE', ''),
+    ]
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _set_validators(
+    response: HttpResponse,
+    etag: str,
+    last_modified: typing.Optional[datetime.datetime],
+) -> HttpResponse:
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def _cached_response(
+    request: HttpRequest,
+    view: typing.Callable,
+    args: typing.Tuple,
+    kwargs: typing.Dict[str, typing.Any],
+    key: str,
+    timeout: int,
+) -> HttpResponse:
+    """Отдаёт страницу из кэша, при промахе рендеря её представлением."""
+    rendered: typing.List[HttpResponse] = []
+
+    def render() -> typing.Optional[typing.Tuple[str, str]]:
+        # Метки вместо фрагментов нужны только в кэшируемом ответе:
+        # страницы ошибок и прочие ответы рендерятся как обычно.
+        request.punch_holes = True
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            request.punch_holes = False
+        rendered.append(response)
+        if response.status_code != 200 or response.streaming:
+            if not response.streaming:
+                response.content = fill_holes(
+                    response.content.decode(response.charset),
+                    request,
+                )
+            return None
+        return (
+            response.content.decode(response.charset),
+            response['Content-Type'],
+        )
+
+    cached = tiered_cache.get_or_set(key, render, timeout)
+    if cached is None:
+        # Ответ не кэшируется; если его отрисовал другой поток,
+        # представление вызывается для этого запроса заново.
+        if rendered:
+            return rendered[0]
+        return view(request, *args, **kwargs)
+    content, content_type = cached
+    if rendered:
+        response = rendered[0]
+        response.content = fill_holes(content, request)
+        return response
+    return HttpResponse(
+        fill_holes(content, request),
+        content_type=content_type,
+    )
+
+
+def cache_page_shared(
+    timeout: int = settings.PAGE_CACHE_TIMEOUT,
+    tags: typing.Optional[typing.Callable[..., typing.Iterable[str]]] = None,
+    per_user: bool = False,
+    conditional: bool = False,
+    personal_tags: typing.Optional[
+        typing.Callable[[HttpRequest], typing.Iterable[str]]
+    ] = None,
+) -> typing.Callable:
+    """Кэширует общую для всех пользователей часть страницы.
+
+    Персональные фрагменты, отмеченные тегом ``{% hole %}``, сохраняются
+    в кэше метками и рендерятся заново при каждой выдаче, поэтому одна
+    запись кэша безопасна и для анонимных, и для авторизованных запросов.
+    Запись хранится в ``tiered_cache``: одновременные промахи рендерят
+    страницу один раз, а истёкшая запись отдаётся, пока её обновляют.
+
+    Args:
+        timeout: Время жизни записи кэша в секундах.
+        tags: Функция, возвращающая по аргументам представления теги,
+            при смене версий которых запись становится недействительной.
+        per_user: Хранить отдельную запись для каждого пользователя.
+        conditional: Отдавать ``ETag`` и ``Last-Modified`` по версиям
+            тегов и отвечать ``304 Not Modified``, не обращаясь
+            ни к кэшу страниц, ни к представлению.
+        personal_tags: Функция, возвращающая по запросу теги данных
+            персональных фрагментов. Их версии входят в валидаторы,
+            но не в ключ кэша страницы.
+
+    Returns:
+        Декоратор представления.
+    """
+
+    def decorator(view: typing.Callable) -> typing.Callable:
+        @functools.wraps(view)
+        def wrapper(
+            request: HttpRequest,
+            *args: typing.Any,
+            **kwargs: typing.Any,
+        ) -> HttpResponse:
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            tag_versions = versions(
+                tags(request, *args, **kwargs) if tags else (),
+            )
+            if conditional:
+                validators = tag_versions
+                if personal_tags:
+                    validators += '.' + versions(personal_tags(request))
+                etag = page_etag(request, validators)
+                last_modified = changed_at(validators)
+                not_modified = get_conditional_response(
+                    request,
+                    etag=etag,
+                    last_modified=(
+                        int(last_modified.timestamp())
+                        if last_modified
+                        else None
+                    ),
+                )
+                if not_modified is not None:
+                    return _set_validators(not_modified, etag, last_modified)
+            response = _cached_response(
+                request,
+                view,
+                args,
+                kwargs,
+                page_key(request, tag_versions, per_user),
+                timeout,
+            )
+            if conditional and response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,160 @@
+import base64
+import binascii
+import json
+import typing
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db import models
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorPage(Page):
+    """Страница, полученная по курсору, без подсчёта общего числа записей."""
+
+    def __init__(
+        self,
+        object_list: typing.List[models.Model],
+        paginator: 'CursorPaginator',
+        next_cursor: typing.Optional[str] = None,
+        previous_cursor: typing.Optional[str] = None,
+    ) -> None:
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        return '<Cursor page>'
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(Paginator):
+    """Пагинатор по ключу (keyset), не использующий COUNT и OFFSET.
+
+    Записи упорядочиваются по убыванию полей ``keys``, а граница страницы
+    передаётся непрозрачным токеном ``cursor``.
+    """
+
+    def __init__(
+        self,
+        object_list: QuerySet,
+        per_page: int,
+        keys: typing.Sequence[str] = ('created', 'id'),
+    ) -> None:
+        super().__init__(
+            object_list.order_by(*(f'-{key}' for key in keys)),
+            per_page,
+        )
+        self.keys = tuple(keys)
+        self.fields = [
+            object_list.model._meta.get_field(key) for key in self.keys
+        ]
+
+    def encode_cursor(self, obj: models.Model, direction: str) -> str:
+        """Кодирует положение записи в непрозрачный токен."""
+        values = [field.value_to_string(obj) for field in self.fields]
+        return (
+            base64.urlsafe_b64encode(
+                json.dumps([direction, values]).encode(),
+            )
+            .decode()
+            .rstrip('=')
+        )
+
+    def decode_cursor(
+        self,
+        cursor: str,
+    ) -> typing.Optional[typing.Tuple[str, typing.List[typing.Any]]]:
+        """Раскодирует токен, возвращая None для повреждённых курсоров."""
+        try:
+            direction, values = json.loads(
+                base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)),
+            )
+            if direction not in (NEXT, PREVIOUS) or len(values) != len(
+                self.fields,
+            ):
+                return None
+            return direction, [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            return None
+
+    def _keyset_filter(
+        self,
+        values: typing.List[typing.Any],
+        lookup: str,
+    ) -> Q:
+        condition = Q()
+        for index, key in enumerate(self.keys):
+            condition |= Q(
+                **dict(zip(self.keys[:index], values[:index])),
+                **{f'{key}__{lookup}': values[index]},
+            )
+        return condition
+
+    def _cursor(
+        self,
+        rows: typing.List[models.Model],
+        index: int,
+        direction: str,
+        condition: bool = True,
+    ) -> typing.Optional[str]:
+        if not rows or not condition:
+            return None
+        return self.encode_cursor(rows[index], direction)
+
+    def get_cursor_page(self, cursor: typing.Optional[str]) -> Page:
+        """Возвращает страницу, следующую за курсором или предшествующую ему.
+
+        Первая страница отдаётся обычным ``Page``: число записей для неё
+        не считается запросом, а выводится из того, есть ли следующая
+        страница.
+
+        Args:
+            cursor: Токен из параметра запроса ``cursor``.
+
+        Returns:
+            Страница записей с курсорами соседних страниц.
+        """
+        direction, values = self.decode_cursor(cursor or '') or (NEXT, None)
+        queryset = self.object_list
+        if direction == PREVIOUS:
+            queryset = queryset.filter(
+                self._keyset_filter(values, 'gt'),
+            ).reverse()
+        elif values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, 'lt'))
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == PREVIOUS:
+            rows.reverse()
+            return CursorPage(
+                rows,
+                self,
+                next_cursor=self._cursor(rows, -1, NEXT),
+                previous_cursor=self._cursor(rows, 0, PREVIOUS, has_more),
+            )
+        if values is None:
+            self.count = len(rows) + int(has_more)
+            page = Page(rows, 1, self)
+            page.next_cursor = self._cursor(rows, -1, NEXT, has_more)
+            page.previous_cursor = None
+            return page
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=self._cursor(rows, -1, NEXT, has_more),
+            previous_cursor=self._cursor(rows, 0, PREVIOUS),
+        )
@@ -0,0 +1,211 @@
+import re
+import typing
+
+from django.db import connection, models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils.html import escape
+from django.utils.safestring import SafeText, mark_safe
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+
+def match_expression(query: str) -> str:
+    """Превращает пользовательский запрос в безопасное выражение MATCH.
+
+    Каждое слово запроса берётся в кавычки, поэтому операторы FTS5
+    во вводе пользователя не интерпретируются.
+    """
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', query))
+
+
+def highlight(snippet: str) -> SafeText:
+    """Экранирует фрагмент текста, выделяя найденные слова тегом mark."""
+    return mark_safe(
+        escape(snippet)
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_END, '</mark>'),
+    )
+
+
+class FullTextIndex:
+    """Полнотекстовый индекс FTS5 над текстовым полем модели.
+
+    Виртуальная таблица хранит только индекс (external content) и
+    синхронизируется с таблицей модели триггерами SQLite.
+    """
+
+    def __init__(
+        self,
+        model: typing.Type[models.Model],
+        field: str = 'text',
+    ) -> None:
+        self.model = model
+        self.field = field
+
+    @property
+    def table(self) -> str:
+        return f'{self.model._meta.db_table}_fts'
+
+    @staticmethod
+    def supported(using: BaseDatabaseWrapper = connection) -> bool:
+        return using.vendor == 'sqlite'
+
+    def install(self, using: BaseDatabaseWrapper = connection) -> None:
+        """Создаёт индекс и триггеры, если их ещё нет.
+
+        Триггеры пересоздаются при каждой миграции: SQLite удаляет их,
+        когда Django пересобирает таблицу модели.
+        """
+        if not self.supported(using):
+            return
+        source = self.model._meta.db_table
+        pk = self.model._meta.pk.column
+        column = self.model._meta.get_field(self.field).column
+        delete = (
+            f"INSERT INTO {self.table}({self.table}, rowid, {column}) "
+            f"VALUES ('delete', old.{pk}, old.{column});"
+        )
+        insert = (
+            f'INSERT INTO {self.table}(rowid, {column}) '
+            f'VALUES (new.{pk}, new.{column});'
+        )
+        with using.cursor() as cursor:
+            created = self.table not in using.introspection.table_names(
+                cursor,
+            )
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} '
+                f"USING fts5({column}, content='{source}', "
+                f"content_rowid='{pk}')",
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {self.table}_ai '
+                f'AFTER INSERT ON {source} BEGIN {insert} END',
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {self.table}_ad '
+                f'AFTER DELETE ON {source} BEGIN {delete} END',
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {self.table}_au '
+                f'AFTER UPDATE OF {column} ON {source} '
+                f'BEGIN {delete} {insert} END',
+            )
+            if created:
+                self.rebuild(using)
+
+    def rebuild(self, using: BaseDatabaseWrapper = connection) -> None:
+        """Заново строит индекс по содержимому таблицы модели."""
+        with using.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')",
+            )
+
+    def filter(self, queryset: models.QuerySet, query: str) -> models.QuerySet:
+        """Оставляет в выборке записи, подходящие под запрос.
+
+        Args:
+            queryset: Выборка модели индекса.
+            query: Поисковый запрос пользователя.
+
+        Returns:
+            Отфильтрованная выборка.
+        """
+        expression = match_expression(query)
+        if not expression:
+            return queryset.none()
+        if not self.supported():
+            return queryset.filter(**{f'{self.field}__icontains': query})
+        meta = self.model._meta
+        return queryset.extra(
+            where=(
+                f'"{meta.db_table}"."{meta.pk.column}" IN ('
+                f'SELECT rowid FROM {self.table} '
+                f'WHERE {self.table} MATCH %s)',
+            ),
+            params=(expression,),
+        )
+
+    def search(
+        self,
+        query: str,
+        queryset: typing.Optional[models.QuerySet] = None,
+    ) -> typing.Union['SearchResults', models.QuerySet]:
+        """Возвращает результаты поиска, упорядоченные по BM25.
+
+        Args:
+            query: Поисковый запрос пользователя.
+            queryset: Выборка, из которой берутся найденные объекты.
+
+        Returns:
+            Ленивая последовательность результатов для пагинатора.
+        """
+        if queryset is None:
+            queryset = self.model.objects.all()
+        if not self.supported():
+            return self.filter(queryset, query)
+        return SearchResults(
+            self,
+            match_expression(query),
+            queryset,
+        )
+
+
+class SearchResults:
+    """Результаты поиска с подсчётом и выборкой по срезам для Paginator.
+
+    Найденным объектам добавляется атрибут ``snippet`` с подсвеченным
+    фрагментом текста.
+    """
+
+    def __init__(
+        self,
+        index: FullTextIndex,
+        expression: str,
+        queryset: models.QuerySet,
+    ) -> None:
+        self.index = index
+        self.expression = expression
+        self.queryset = queryset
+
+    def count(self) -> int:
+        if not self.expression:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {self.index.table} '
+                f'WHERE {self.index.table} MATCH %s',
+                (self.expression,),
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, key: slice) -> typing.List[models.Model]:
+        if not self.expression:
+            return []
+        table = self.index.table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, snippet({table}, 0, %s, %s, %s, 16) '
+                f'FROM {table} WHERE {table} MATCH %s '
+                f'ORDER BY bm25({table}) LIMIT %s OFFSET %s',
+                (
+                    HIGHLIGHT_START,
+                    HIGHLIGHT_END,
+                    '…',
+                    self.expression,
+                    key.stop - key.start,
+                    key.start,
+                ),
+            )
+            rows = cursor.fetchall()
+        objects = self.queryset.in_bulk([pk for pk, _ in rows])
+        results = []
+        for pk, snippet in rows:
+            if pk in objects:
+                objects[pk].snippet = highlight(snippet)
+                results.append(objects[pk])
+        return results
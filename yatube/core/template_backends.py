@@ -0,0 +1,31 @@
+import typing
+
+from django.http import HttpRequest
+from django.template.backends import django as backend
+from django.template.exceptions import TemplateDoesNotExist
+from django.utils.safestring import SafeText
+
+from core import metrics
+
+
+class Template(backend.Template):
+    def render(
+        self,
+        context: typing.Optional[typing.Dict[str, typing.Any]] = None,
+        request: typing.Optional[HttpRequest] = None,
+    ) -> SafeText:
+        with metrics.template_timer():
+            return super().render(context, request)
+
+
+class DjangoTemplates(backend.DjangoTemplates):
+    """Шаблонизатор Django, учитывающий время рендера в метриках."""
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Template:
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            backend.reraise(exc, self)
@@ -0,0 +1,99 @@
+import typing
+
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+from django.template.base import FilterExpression, NodeList, Parser, Token
+from django.template.context import Context, RequestContext
+from django.utils.safestring import SafeText, mark_safe
+
+from core.page_cache import fill_holes, hole_marker
+from core.tiered_cache import tiered_cache
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(
+    context: RequestContext,
+    template_name: str,
+    **kwargs: typing.Any,
+) -> SafeText:
+    """Подключает персональный фрагмент страницы.
+
+    При кэшировании страницы через ``cache_page_shared`` или фрагмента
+    через ``{% fragment %}`` вместо фрагмента выводится метка, иначе
+    фрагмент рендерится как обычный ``include``.
+    """
+    if context.get('punch_holes') or getattr(
+        context.get('request'),
+        'punch_holes',
+        False,
+    ):
+        return mark_safe(hole_marker(template_name, kwargs))
+    with context.push(**kwargs):
+        return context.template.engine.get_template(template_name).render(
+            context,
+        )
+
+
+class FragmentNode(template.Node):
+    def __init__(
+        self,
+        nodelist: NodeList,
+        timeout: FilterExpression,
+        name: str,
+        vary_on: typing.List[FilterExpression],
+    ) -> None:
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context: Context) -> str:
+        key = make_template_fragment_key(
+            self.name,
+            [value.resolve(context) for value in self.vary_on],
+        )
+
+        def render() -> str:
+            with context.push(punch_holes=True):
+                return self.nodelist.render(context)
+
+        content = tiered_cache.get_or_set(
+            key,
+            render,
+            self.timeout.resolve(context),
+        )
+        request = context.get('request')
+        if request is None or getattr(request, 'punch_holes', False):
+            # Внутри кэшируемой страницы метки заполнит она сама.
+            return content
+        return fill_holes(content, request)
+
+
+@register.tag
+def fragment(parser: Parser, token: Token) -> FragmentNode:
+    """Кэширует общий для всех пользователей фрагмент шаблона.
+
+    Работает как ``{% cache %}``, но через ``tiered_cache``: фрагмент
+    рендерится один раз на все одновременные промахи, а истёкший
+    отдаётся, пока его обновляют. Персональные части внутри отмечаются
+    тегом ``{% hole %}``.
+
+    Пример::
+
+        {% fragment 60 sidebar group.pk %}...{% endfragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' принимает время жизни, имя и ключевые значения.",
+        )
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        bits[2],
+        [parser.compile_filter(bit) for bit in bits[3:]],
+    )
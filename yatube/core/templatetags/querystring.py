@@ -0,0 +1,22 @@
+import typing
+
+from django import template
+from django.template.context import RequestContext
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def querystring(context: RequestContext, **kwargs: typing.Any) -> str:
+    """Возвращает параметры текущего запроса с заменёнными значениями.
+
+    Параметры со значением None удаляются, остальные сохраняются, поэтому
+    ссылки пагинации не теряют, например, поисковый запрос.
+    """
+    params = context['request'].GET.copy()
+    for key, value in kwargs.items():
+        if value is None:
+            params.pop(key, None)
+        else:
+            params[key] = value
+    return f'?{params.urlencode()}'
@@ -0,0 +1,101 @@
+import itertools
+import multiprocessing
+import tempfile
+import typing
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core import cache_benchmark
+from core.cache_backends import SQLiteCache
+
+
+def _increment(location: str, times: int) -> None:
+    cache = SQLiteCache(location, {})
+    for _ in range(times):
+        cache.incr('counter')
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = str(Path(directory.name, 'cache.sqlite3'))
+
+    def make_cache(self, **options: typing.Any) -> SQLiteCache:
+        return SQLiteCache(self.location, {'OPTIONS': options})
+
+    def test_shared_between_instances(self) -> None:
+        """Записи одного экземпляра видны другому с тем же файлом."""
+        self.make_cache().set_many({'a': [1, 2], 'b': 'text'})
+        cache = self.make_cache()
+        self.assertEqual(
+            cache.get_many(['a', 'b', 'c']),
+            {'a': [1, 2], 'b': 'text'},
+        )
+        cache.delete('a')
+        self.assertIsNone(self.make_cache().get('a'))
+
+    def test_expired_entries(self) -> None:
+        """Просроченная запись не читается и может быть добавлена заново."""
+        cache = self.make_cache()
+        cache.set('key', 'old', timeout=0)
+        self.assertFalse(cache.has_key('key'))
+        self.assertTrue(cache.add('key', 'new'))
+        self.assertFalse(cache.add('key', 'newer'))
+        self.assertEqual(cache.get('key'), 'new')
+
+    def test_incr_and_decr(self) -> None:
+        """Счётчик меняется на заданную величину, пустой ключ — ошибка."""
+        cache = self.make_cache()
+        cache.set('counter', 10)
+        self.assertEqual(cache.incr('counter', 5), 15)
+        self.assertEqual(cache.decr('counter'), 14)
+        with self.assertRaises(ValueError):
+            cache.incr('missing')
+
+    def test_incr_is_atomic_between_processes(self) -> None:
+        """Параллельные процессы не теряют приращения."""
+        self.make_cache().set('counter', 0)
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=_increment, args=(self.location, 50))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(self.make_cache().get('counter'), 200)
+
+    def test_least_recently_read_evicted_over_size(self) -> None:
+        """При превышении размера вытесняется давно не читавшаяся запись."""
+        cache = self.make_cache(MAX_SIZE=2500)
+        with mock.patch(
+            'core.cache_backends.time.time',
+            side_effect=itertools.count(1_000_000),
+        ):
+            cache.set('a', 'x' * 1000, None)
+            cache.set('b', 'x' * 1000, None)
+            cache.get('a')
+            cache.set('c', 'x' * 1000, None)
+        self.assertEqual(set(cache.get_many(['a', 'b', 'c'])), {'a', 'c'})
+
+    def test_benchmark_reports_results(self) -> None:
+        """Замер возвращает пропускную способность и долю попаданий."""
+        result = cache_benchmark.run(
+            'core.cache_backends.SQLiteCache',
+            self.location,
+            {},
+            cache_benchmark.Workload(
+                operations=50,
+                keys=10,
+                value_size=16,
+                write_ratio=0,
+                seed=0,
+            ),
+            processes=2,
+        )
+        self.assertGreater(result['hit_ratio'], 0)
+        self.assertGreater(result['ops_per_second'], 0)
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core import metrics
+
+User = get_user_model()
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.staff = mixer.blend(User, is_staff=True)
+        cls.user = mixer.blend(User, is_staff=False)
+
+    def setUp(self) -> None:
+        metrics.REGISTRY.clear()
+
+    def test_server_timing_header(self) -> None:
+        """Ответ содержит время SQL, шаблонов и всего запроса."""
+        response = Client().get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        for name in ('sql;dur=', 'tpl;dur=', 'total;dur='):
+            self.assertIn(name, timing)
+
+    def test_metrics_collected_by_view_name(self) -> None:
+        """Метрики накапливаются по именам представлений."""
+        Client().get(reverse('posts:index'))
+        Client().get(reverse('posts:index'))
+        client = Client()
+        client.force_login(self.staff)
+        content = client.get(reverse('metrics')).content.decode()
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"} 2',
+            content,
+        )
+        self.assertIn(
+            'yatube_sql_queries{view="posts:index",quantile="0.99"}',
+            content,
+        )
+        self.assertIn(
+            '# TYPE yatube_template_duration_seconds summary',
+            content,
+        )
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_endpoint_is_protected(self) -> None:
+        """Метрики доступны только персоналу и по токену."""
+        client = Client()
+        client.force_login(self.user)
+        self.assertEqual(
+            client.get(reverse('metrics')).status_code,
+            HTTPStatus.FORBIDDEN,
+        )
+        self.assertEqual(
+            Client()
+            .get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+            .status_code,
+            HTTPStatus.FORBIDDEN,
+        )
+        self.assertEqual(
+            Client()
+            .get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+            .status_code,
+            HTTPStatus.OK,
+        )
+
+    def test_summary_quantiles(self) -> None:
+        """Квантили считаются по скользящему окну значений."""
+        summary = metrics.Summary(window=100)
+        for value in range(1, 201):
+            summary.observe(value)
+        self.assertEqual(summary.count, 200)
+        self.assertEqual(
+            dict(summary.quantiles()),
+            {0.5: 150, 0.9: 190, 0.95: 195, 0.99: 199},
+        )
@@ -0,0 +1,95 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from core.tiered_cache import Entry, TieredCache, tiered_cache
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.l2 = LocMemCache('tiered', {})
+        self.l2.clear()
+        self.cache = TieredCache(
+            self.l2,
+            l1_max_entries=10,
+            l1_timeout=5,
+            stale_timeout=60,
+            lock_timeout=5,
+        )
+
+    def test_concurrent_misses_computed_once(self) -> None:
+        """Одновременные промахи по ключу ждут одного вычисления."""
+        calls = []
+
+        def compute() -> str:
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.cache.get_or_set('key', compute, 60),
+                ),
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+
+    def test_stale_served_while_refreshing(self) -> None:
+        """Истёкшая запись отдаётся, пока её обновляет другой процесс."""
+        self.cache.get_or_set('key', lambda: 'old', 0.01)
+        time.sleep(0.02)
+        self.l2.add('key:lock', True)
+        self.assertEqual(
+            self.cache.get_or_set('key', lambda: 'new', 60),
+            'old',
+        )
+        self.l2.delete('key:lock')
+        self.assertEqual(
+            self.cache.get_or_set('key', lambda: 'new', 60),
+            'new',
+        )
+
+    def test_none_is_not_cached(self) -> None:
+        """Результат None не сохраняется."""
+        self.assertIsNone(self.cache.get_or_set('key', lambda: None, 60))
+        self.assertEqual(self.cache.get_or_set('key', lambda: 1, 60), 1)
+
+    def test_early_refresh_probability(self) -> None:
+        """Дорогое значение может считаться устаревшим до срока."""
+        now = time.time()
+        entry = Entry('value', now + 1, delta=1)
+        with mock.patch('core.tiered_cache.random.random', return_value=0):
+            self.assertTrue(entry.fresh(now, beta=1))
+        with mock.patch('core.tiered_cache.random.random', return_value=0.99):
+            self.assertFalse(entry.fresh(now, beta=1))
+
+
+class FragmentTagTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        tiered_cache.clear_local()
+
+    def test_fragment_cached_by_name_and_vary_on(self) -> None:
+        """Фрагмент берётся из кэша, пока не сменятся ключевые значения."""
+        template = Template(
+            '{% load page_cache %}'
+            '{% fragment 60 counters group %}{{ count }}{% endfragment %}',
+        )
+        for group, count, expected in ((1, 5, '5'), (1, 6, '5'), (2, 6, '6')):
+            self.assertEqual(
+                template.render(Context({'group': group, 'count': count})),
+                expected,
+            )
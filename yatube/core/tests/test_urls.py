@@ -27,3 +27,16 @@ class CoreURLTests(TestCase):
         """URL-адрес использует соответствующий шаблон."""
         response = Client().get('/test/missing_404')
         self.assertTemplateUsed(response, 'core/404.html')
+
+    def test_404_on_cached_pages_renders_holes(self) -> None:
+        """Страница 404 кэшируемых адресов выводит фрагменты, а не метки."""
+        for url in ('/group/nope/', '/profile/nobody/', '/posts/9999/'):
+            with self.subTest(url=url):
+                response = self.auth.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+                self.assertTemplateUsed(response, 'includes/header.html')
+                self.assertNotContains(
+                    response,
+                    '<!--hole:',
+                    status_code=HTTPStatus.NOT_FOUND,
+                )
@@ -0,0 +1,295 @@
+import collections
+import math
+import random
+import threading
+import time
+import typing
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import BaseCache
+
+
+class Entry(typing.NamedTuple):
+    """Значение вместе с моментом окончания свежести и ценой вычисления."""
+
+    value: typing.Any
+    expires: float
+    delta: float
+
+    def fresh(self, now: float, beta: float) -> bool:
+        """Проверяет свежесть с вероятностным ранним обновлением.
+
+        Чем ближе окончание свежести и чем дольше вычислялось значение,
+        тем вероятнее запись считается устаревшей раньше срока, поэтому
+        обновления разных процессов не совпадают по времени.
+        """
+        early = -self.delta * beta * math.log(1 - random.random())
+        return now + early < self.expires
+
+
+class TieredCache:
+    """Двухуровневый кэш: словарь процесса перед общим кэшем Django.
+
+    Значения вычисляются через ``get_or_set``: одновременные промахи
+    по одному ключу в процессе ждут единственного вычисления,
+    а между процессами его сериализует блокировка в общем кэше.
+    Устаревшая запись ещё ``stale_timeout`` секунд отдаётся всем,
+    пока один запрос вычисляет новое значение.
+
+    Записи первого уровня не видят удалений из других процессов,
+    поэтому живут не дольше ``l1_timeout`` секунд; ключи, зависящие
+    от изменяемых данных, должны включать версии тегов.
+    """
+
+    def __init__(
+        self,
+        l2: BaseCache,
+        l1_max_entries: int,
+        l1_timeout: float,
+        stale_timeout: float,
+        lock_timeout: float,
+        beta: float = 1.0,
+    ) -> None:
+        self.l2 = l2
+        self.l1_max_entries = l1_max_entries
+        self.l1_timeout = l1_timeout
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.beta = beta
+        self._l1: typing.OrderedDict[str, typing.Tuple[Entry, float]]
+        self._l1 = collections.OrderedDict()
+        self._flights: typing.Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _l1_get(self, key: str, now: float) -> typing.Optional[Entry]:
+        with self._lock:
+            found = self._l1.get(key)
+            if found is None:
+                return None
+            entry, deadline = found
+            if deadline <= now:
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return entry
+
+    def _l1_set(self, key: str, entry: Entry, now: float) -> None:
+        deadline = min(
+            now + self.l1_timeout,
+            entry.expires + self.stale_timeout,
+        )
+        with self._lock:
+            self._l1[key] = (entry, deadline)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _get(self, key: str, now: float) -> typing.Optional[Entry]:
+        entry = self._l1_get(key, now)
+        if entry is None:
+            entry = self.l2.get(key)
+            if entry is not None:
+                self._l1_set(key, entry, now)
+        return entry
+
+    def _store(
+        self,
+        key: str,
+        compute: typing.Callable[[], typing.Any],
+        timeout: typing.Optional[float],
+    ) -> typing.Any:
+        started = time.time()
+        value = compute()
+        if value is None:
+            return None
+        now = time.time()
+        entry = Entry(
+            value,
+            math.inf if timeout is None else now + timeout,
+            now - started,
+        )
+        self.l2.set(
+            key,
+            entry,
+            None if timeout is None else timeout + self.stale_timeout,
+        )
+        self._l1_set(key, entry, now)
+        return value
+
+    def _lock_key(self, key: str) -> str:
+        return f'{key}:lock'
+
+    def _refresh(
+        self,
+        key: str,
+        compute: typing.Callable[[], typing.Any],
+        timeout: typing.Optional[float],
+    ) -> typing.Tuple[bool, typing.Any]:
+        """Вычисляет значение, если никто другой его сейчас не вычисляет.
+
+        Returns:
+            Удалось ли взять блокировку и вычисленное значение.
+        """
+        lock = self._lock_key(key)
+        if not self.l2.add(lock, True, self.lock_timeout):
+            return False, None
+        try:
+            return True, self._store(key, compute, timeout)
+        finally:
+            self.l2.delete(lock)
+
+    def _fill(
+        self,
+        key: str,
+        compute: typing.Callable[[], typing.Any],
+        timeout: typing.Optional[float],
+    ) -> typing.Any:
+        """Заполняет пустой ключ, дожидаясь чужого вычисления."""
+        deadline = time.time() + self.lock_timeout
+        while True:
+            computed, value = self._refresh(key, compute, timeout)
+            if computed:
+                return value
+            time.sleep(0.05)
+            now = time.time()
+            entry = self.l2.get(key)
+            if entry is not None:
+                self._l1_set(key, entry, now)
+                return entry.value
+            if now >= deadline:
+                # Вычисляющий процесс завис или не смог сохранить
+                # значение: дольше ждать не имеет смысла.
+                return self._store(key, compute, timeout)
+
+    def _singleflight(
+        self,
+        key: str,
+        compute: typing.Callable[[], typing.Any],
+        timeout: typing.Optional[float],
+    ) -> typing.Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+        if not leader:
+            try:
+                return flight.result(self.lock_timeout)
+            except FutureTimeoutError:
+                return self._store(key, compute, timeout)
+        try:
+            flight.set_result(self._fill(key, compute, timeout))
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return flight.result()
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: typing.Callable[[], typing.Any],
+        timeout: typing.Optional[float],
+    ) -> typing.Any:
+        """Возвращает значение ключа, при необходимости вычисляя его.
+
+        Args:
+            key: Ключ кэша.
+            compute: Функция без аргументов, вычисляющая значение.
+                Результат ``None`` не кэшируется.
+            timeout: Время свежести значения в секундах, ``None`` —
+                бессрочно.
+
+        Returns:
+            Значение из кэша или результат ``compute``.
+        """
+        now = time.time()
+        entry = self._get(key, now)
+        if entry is None:
+            return self._singleflight(key, compute, timeout)
+        if entry.fresh(now, self.beta):
+            return entry.value
+        computed, value = self._refresh(key, compute, timeout)
+        return value if computed else entry.value
+
+    def get_many_or_set(
+        self,
+        computes: typing.Dict[str, typing.Callable[[], typing.Any]],
+        timeout: typing.Optional[float],
+    ) -> typing.Dict[str, typing.Any]:
+        """Возвращает значения нескольких ключей одним запросом к кэшу.
+
+        Промахи и устаревшие записи вычисляются сразу и сохраняются
+        одним ``set_many``, без блокировок: метод предназначен
+        для дешёвых фрагментов с версионированными ключами.
+
+        Args:
+            computes: Функции вычисления значений по ключам.
+            timeout: Время свежести значений в секундах.
+
+        Returns:
+            Значения по ключам, кроме вычисленных как ``None``.
+        """
+        now = time.time()
+        entries = {}
+        for key in computes:
+            entry = self._l1_get(key, now)
+            if entry is not None:
+                entries[key] = entry
+        remote = self.l2.get_many(
+            [key for key in computes if key not in entries],
+        )
+        for key, entry in remote.items():
+            self._l1_set(key, entry, now)
+        entries.update(remote)
+        values = {}
+        stored = {}
+        for key, compute in computes.items():
+            entry = entries.get(key)
+            if entry is not None and entry.fresh(now, self.beta):
+                values[key] = entry.value
+                continue
+            started = time.time()
+            value = compute()
+            if value is None:
+                continue
+            finished = time.time()
+            values[key] = value
+            stored[key] = Entry(
+                value,
+                math.inf if timeout is None else finished + timeout,
+                finished - started,
+            )
+        if stored:
+            self.l2.set_many(
+                stored,
+                None if timeout is None else timeout + self.stale_timeout,
+            )
+            for key, entry in stored.items():
+                self._l1_set(key, entry, now)
+        return values
+
+    def delete(self, key: str) -> None:
+        """Удаляет ключ из общего кэша и первого уровня этого процесса."""
+        self.l2.delete(key)
+        with self._lock:
+            self._l1.pop(key, None)
+
+    def clear_local(self) -> None:
+        """Очищает первый уровень этого процесса."""
+        with self._lock:
+            self._l1.clear()
+
+
+tiered_cache = TieredCache(
+    cache,
+    l1_max_entries=settings.CACHE_L1_MAX_ENTRIES,
+    l1_timeout=settings.CACHE_L1_TIMEOUT,
+    stale_timeout=settings.CACHE_STALE_TIMEOUT,
+    lock_timeout=settings.CACHE_LOCK_TIMEOUT,
+)
@@ -1,12 +1,36 @@
+import typing
+
 from django.conf import settings
 from django.core.paginator import Page, Paginator
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 
+from core.paginator import CursorPaginator
+
 
 def paginate(
     request: HttpRequest,
     queryset: QuerySet,
     on_page: int = settings.OBJECTS_ON_PAGE,
+    keyset: typing.Optional[typing.Sequence[str]] = None,
 ) -> Page:
-    return Paginator(queryset, on_page).get_page(request.GET.get('page'))
+    """Разбивает выборку на страницы.
+
+    Если передан ``keyset``, страницы выбираются по курсору из параметра
+    ``cursor``, а параметр ``page`` остаётся запасным вариантом со сдвигом.
+
+    Args:
+        request: Передаваемый запрос.
+        queryset: Выборка, разбиваемая на страницы.
+        on_page: Количество записей на странице.
+        keyset: Поля, по убыванию которых упорядочиваются страницы.
+
+    Returns:
+        Запрошенная страница.
+    """
+    page_number = request.GET.get('page')
+    if keyset is None or page_number is not None:
+        return Paginator(queryset, on_page).get_page(page_number)
+    return CursorPaginator(queryset, on_page, keyset).get_cursor_page(
+        request.GET.get('cursor'),
+    )
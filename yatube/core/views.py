@@ -1,8 +1,12 @@
 from http import HTTPStatus
 
-from django.http import HttpRequest, HttpResponse
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
 from django.urls.exceptions import Resolver404
+from django.utils.crypto import constant_time_compare
+
+from core import metrics
 
 
 def page_not_found(
@@ -25,3 +29,30 @@ def csrf_failure(request: HttpRequest, reason: str = '') -> HttpResponse:
         'core/403csrf.html',
         status=HTTPStatus.FORBIDDEN,
     )
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Отдаёт метрики запросов в текстовом формате Prometheus.
+
+    Доступ есть у персонала и у запросов с заголовком
+    ``Authorization: Bearer <METRICS_TOKEN>``.
+
+    Args:
+        request: Передаваемый запрос.
+
+    Returns:
+        Текст метрик.
+    """
+    token = settings.METRICS_TOKEN
+    if not request.user.is_staff and not (
+        token
+        and constant_time_compare(
+            request.META.get('HTTP_AUTHORIZATION', ''),
+            f'Bearer {token}',
+        )
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        metrics.REGISTRY.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
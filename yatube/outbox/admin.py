@@ -0,0 +1,35 @@
+from django.contrib import admin
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+
+from core.admin import BaseAdmin
+from outbox.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(BaseAdmin):
+    """Способ отображения фоновой задачи в админке."""
+
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'priority',
+        'attempts',
+        'run_at',
+        'created',
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name',)
+    actions = ('retry',)
+
+    def retry(self, request: HttpRequest, queryset: QuerySet) -> None:
+        count = queryset.filter(status=Task.DEAD).update(
+            status=Task.PENDING,
+            attempts=0,
+            run_at=timezone.now(),
+        )
+        self.message_user(request, f'Задач снова в очереди: {count}.')
+
+    retry.short_description = 'Повторить невыполненные задачи'
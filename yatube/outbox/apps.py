@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class OutboxConfig(AppConfig):
+    """Очередь фоновых задач в базе данных."""
+
+    name = 'outbox'
+    verbose_name = 'фоновые задачи'
+
+    def ready(self) -> None:
+        # Задачи регистрируются при импорте модулей tasks приложений.
+        autodiscover_modules('tasks')
@@ -0,0 +1,54 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from outbox import worker
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.TASKS_CONCURRENCY,
+            help='Сколько задач выполнять одновременно.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.TASKS_BATCH_SIZE,
+            help='Сколько задач забирать из очереди за раз.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help='Пауза в секундах, если очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        stats = worker.run(
+            concurrency=options['concurrency'],
+            batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'],
+            once=options['once'],
+            stop=stop,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Задач выполнено: {stats["done"]}, '
+                f'с ошибкой: {stats["failed"]}.',
+            ),
+        )
@@ -0,0 +1,107 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import outbox.models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Task",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=200, verbose_name="задача"),
+                ),
+                ("payload", models.TextField(verbose_name="аргументы")),
+                (
+                    "priority",
+                    models.SmallIntegerField(
+                        default=0,
+                        help_text="Задачи с большим приоритетом выполняются раньше",
+                        verbose_name="приоритет",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "ожидает"),
+                            ("running", "выполняется"),
+                            ("dead", "не выполнена"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="статус",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="попытки"),
+                ),
+                (
+                    "max_attempts",
+                    models.PositiveSmallIntegerField(
+                        default=outbox.models.default_max_attempts,
+                        verbose_name="наибольшее число попыток",
+                    ),
+                ),
+                (
+                    "run_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="выполнить после",
+                    ),
+                ),
+                (
+                    "locked_by",
+                    models.CharField(
+                        blank=True, max_length=64, verbose_name="обработчик"
+                    ),
+                ),
+                (
+                    "locked_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="взята в работу"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="последняя ошибка"),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="создана"),
+                ),
+            ],
+            options={
+                "verbose_name": "задача",
+                "verbose_name_plural": "задачи",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "-priority", "run_at"], name="task_claim_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["name", "status"], name="task_name_idx"),
+        ),
+    ]
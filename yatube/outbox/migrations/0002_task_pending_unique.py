@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outbox", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="unique_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Хеш аргументов задачи, которую нельзя ставить дважды",
+                max_length=40,
+                null=True,
+                verbose_name="ключ уникальности",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="task",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(status="pending"),
+                fields=("name", "unique_key"),
+                name="task_pending_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from core.models import DefaultModel
+
+
+def default_max_attempts() -> int:
+    return settings.TASKS_MAX_ATTEMPTS
+
+
+class Task(DefaultModel):
+    """Задача, ожидающая выполнения фоновым обработчиком.
+
+    Задача записывается в той же транзакции, что и изменение, которое
+    её породило, поэтому она появляется в очереди только вместе с ним.
+    Выполненные задачи удаляются, исчерпавшие попытки остаются
+    со статусом ``dead``. Повтор одинаковой ожидающей задачи с
+    ``unique_key`` запрещает уникальный индекс, поэтому две параллельные
+    постановки не создают двух задач.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DEAD = 'dead'
+    STATUSES = (
+        (PENDING, 'ожидает'),
+        (RUNNING, 'выполняется'),
+        (DEAD, 'не выполнена'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name='задача')
+    payload = models.TextField(verbose_name='аргументы')
+    priority = models.SmallIntegerField(
+        default=0,
+        verbose_name='приоритет',
+        help_text='Задачи с большим приоритетом выполняются раньше',
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='статус',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='попытки',
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=default_max_attempts,
+        verbose_name='наибольшее число попыток',
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='выполнить после',
+    )
+    locked_by = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='обработчик',
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='взята в работу',
+    )
+    unique_key = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True,
+        verbose_name='ключ уникальности',
+        help_text='Хеш аргументов задачи, которую нельзя ставить дважды',
+    )
+    last_error = models.TextField(blank=True, verbose_name='последняя ошибка')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='создана')
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'задачи'
+        indexes = (
+            models.Index(
+                fields=('status', '-priority', 'run_at'),
+                name='task_claim_idx',
+            ),
+            models.Index(fields=('name', 'status'), name='task_name_idx'),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('name', 'unique_key'),
+                condition=models.Q(status='pending'),
+                name='task_pending_unique',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.name} #{self.pk}'
@@ -0,0 +1,115 @@
+import datetime
+import hashlib
+import json
+import typing
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from outbox.models import Task
+
+REGISTRY: typing.Dict[str, 'TaskFunction'] = {}
+
+
+class TaskFunction:
+    """Функция, которую можно поставить в очередь фоновых задач.
+
+    Вызов выполняет функцию сразу, ``enqueue`` записывает задачу
+    в очередь. Аргументы задачи сохраняются в JSON.
+    """
+
+    def __init__(
+        self,
+        func: typing.Callable[..., typing.Any],
+        name: str,
+        priority: int,
+        max_attempts: int,
+        unique: bool,
+    ) -> None:
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.unique = unique
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        return self.func(*args, **kwargs)
+
+    def enqueue(
+        self,
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Optional[Task]:
+        """Записывает задачу в очередь в текущей транзакции.
+
+        Задачу с ``unique`` не добавить, пока такая же ещё ждёт
+        выполнения: это проверяет уникальный индекс при вставке, а не
+        отдельный запрос перед ней.
+
+        Returns:
+            Новая задача или ``None``, если такая уже ждёт в очереди.
+        """
+        return self.enqueue_at(timezone.now(), *args, **kwargs)
+
+    def enqueue_at(
+        self,
+        run_at: datetime.datetime,
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Optional[Task]:
+        payload = json.dumps(
+            {'args': args, 'kwargs': kwargs},
+            sort_keys=True,
+        )
+        queued = Task(
+            name=self.name,
+            payload=payload,
+            priority=self.priority,
+            max_attempts=self.max_attempts,
+            run_at=run_at,
+        )
+        if not self.unique:
+            queued.save()
+            return queued
+        queued.unique_key = hashlib.sha1(payload.encode()).hexdigest()
+        try:
+            with transaction.atomic():
+                queued.save()
+        except IntegrityError:
+            return None
+        return queued
+
+
+def task(
+    name: typing.Optional[str] = None,
+    priority: int = 0,
+    max_attempts: typing.Optional[int] = None,
+    unique: bool = False,
+) -> typing.Callable[[typing.Callable[..., typing.Any]], TaskFunction]:
+    """Регистрирует функцию как фоновую задачу.
+
+    Args:
+        name: Имя задачи в очереди, по умолчанию путь к функции.
+        priority: Задачи с большим приоритетом выполняются раньше.
+        max_attempts: Сколько раз выполнять задачу, прежде чем
+            оставить её со статусом ``dead``.
+        unique: Не ставить задачу, если такая же уже ждёт в очереди.
+
+    Returns:
+        Декоратор функции.
+    """
+
+    def decorator(func: typing.Callable[..., typing.Any]) -> TaskFunction:
+        registered = TaskFunction(
+            func,
+            name or f'{func.__module__}.{func.__qualname__}',
+            priority,
+            max_attempts or settings.TASKS_MAX_ATTEMPTS,
+            unique,
+        )
+        REGISTRY[registered.name] = registered
+        return registered
+
+    return decorator
@@ -0,0 +1,108 @@
+import datetime
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from outbox import worker
+from outbox.models import Task
+from outbox.queue import task
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value: str) -> None:
+    calls.append(value)
+
+
+@task(name='tests.urgent', priority=5)
+def urgent(value: str) -> None:
+    calls.append(value)
+
+
+@task(name='tests.unique', unique=True)
+def unique(value: str) -> None:
+    calls.append(value)
+
+
+@task(name='tests.broken', max_attempts=2)
+def broken() -> None:
+    raise ValueError('Ошибка')
+
+
+class WorkerTests(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_tasks_run_by_priority(self) -> None:
+        """Задачи выполняются по приоритету и удаляются из очереди."""
+        record.enqueue('обычная')
+        urgent.enqueue('срочная')
+        self.assertEqual(worker.run(once=True), {'done': 2, 'failed': 0})
+        self.assertEqual(calls, ['срочная', 'обычная'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_claimed_task_not_claimed_again(self) -> None:
+        """Забранную задачу не получит другой обработчик."""
+        record.enqueue('одна')
+        self.assertEqual(len(worker.claim('first', 10)), 1)
+        self.assertEqual(worker.claim('second', 10), [])
+
+    def test_expired_lease_released(self) -> None:
+        """Задача упавшего обработчика возвращается в очередь."""
+        record.enqueue('потерянная')
+        worker.claim('first', 10)
+        Task.objects.update(
+            locked_at=timezone.now() - datetime.timedelta(hours=1),
+        )
+        self.assertEqual(len(worker.claim('second', 10)), 1)
+
+    def test_failed_task_retried_then_dead(self) -> None:
+        """Упавшая задача откладывается, а после всех попыток остаётся."""
+        broken.enqueue()
+        self.assertEqual(worker.run(once=True), {'done': 0, 'failed': 1})
+        retry = Task.objects.get()
+        self.assertEqual(retry.status, Task.PENDING)
+        self.assertGreater(retry.run_at, timezone.now())
+        self.assertIn('ValueError', retry.last_error)
+        Task.objects.update(run_at=timezone.now())
+        worker.run(once=True)
+        self.assertEqual(Task.objects.get().status, Task.DEAD)
+        self.assertEqual(worker.run(once=True), {'done': 0, 'failed': 0})
+
+    def test_unknown_task_dead(self) -> None:
+        """Незарегистрированная задача сразу остаётся невыполненной."""
+        Task.objects.create(name='tests.missing', payload='{}')
+        with mock.patch.object(worker, 'backoff') as backoff:
+            worker.run(once=True)
+        backoff.assert_not_called()
+        self.assertEqual(Task.objects.get().status, Task.DEAD)
+
+    def test_unique_task_enqueued_once(self) -> None:
+        """Одинаковая уникальная задача не дублируется в очереди."""
+        self.assertIsNotNone(unique.enqueue('картинка'))
+        self.assertIsNone(unique.enqueue('картинка'))
+        self.assertIsNotNone(unique.enqueue('другая'))
+
+    def test_unique_task_enforced_by_database(self) -> None:
+        """Дубликат, прошедший мимо проверки, отклоняет уникальный индекс."""
+        queued = unique.enqueue('картинка')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Task.objects.create(
+                name=queued.name,
+                payload=queued.payload,
+                unique_key=queued.unique_key,
+            )
+
+    def test_retried_unique_task_does_not_conflict(self) -> None:
+        """Повтор уникальной задачи не мешает такой же, поставленной заново."""
+        first = unique.enqueue('картинка')
+        worker.claim('first', 10)
+        self.assertIsNotNone(unique.enqueue('картинка'))
+        worker.fail(Task.objects.get(pk=first.pk))
+        self.assertEqual(
+            Task.objects.filter(status=Task.PENDING).count(),
+            2,
+        )
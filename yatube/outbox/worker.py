@@ -0,0 +1,206 @@
+import datetime
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from outbox.models import Task
+from outbox.queue import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+def backoff(attempts: int) -> datetime.timedelta:
+    """Задержка перед повторной попыткой: растёт вдвое с каждой
+    неудачей, со случайным разбросом, чтобы повторы не шли разом."""
+    delay = min(
+        settings.TASKS_RETRY_DELAY * 2 ** max(attempts - 1, 0),
+        settings.TASKS_RETRY_MAX_DELAY,
+    )
+    return datetime.timedelta(seconds=delay * (1 + random.random() / 4))
+
+
+def release_expired(now: datetime.datetime) -> None:
+    """Возвращает в очередь задачи обработчиков, не успевших их выполнить.
+
+    Задачи, у которых закончились попытки, остаются со статусом ``dead``.
+    Возвращённые задачи теряют ``unique_key``, чтобы не столкнуться
+    с такой же задачей, поставленной заново, пока они выполнялись.
+    """
+    expired = Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=now
+        - datetime.timedelta(seconds=settings.TASKS_LEASE_TIMEOUT),
+    )
+    expired.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.DEAD,
+        last_error='Обработчик не завершил задачу вовремя.',
+    )
+    expired.update(
+        status=Task.PENDING,
+        locked_by='',
+        locked_at=None,
+        unique_key=None,
+    )
+
+
+def claim(worker: str, limit: int) -> typing.List[Task]:
+    """Забирает пачку готовых к выполнению задач.
+
+    Задачи отбираются по приоритету и помечаются одним ``UPDATE``
+    с повторной проверкой статуса, поэтому одну задачу не заберут
+    два обработчика.
+
+    Args:
+        worker: Имя обработчика.
+        limit: Наибольшее число задач.
+
+    Returns:
+        Задачи в порядке выполнения.
+    """
+    now = timezone.now()
+    release_expired(now)
+    token = f'{worker}:{uuid4().hex[:8]}'
+    ready = Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+    Task.objects.filter(
+        pk__in=ready.order_by('-priority', 'run_at', 'pk').values('pk')[
+            :limit
+        ],
+        status=Task.PENDING,
+    ).update(
+        status=Task.RUNNING,
+        locked_by=token,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(
+        Task.objects.filter(locked_by=token, status=Task.RUNNING).order_by(
+            '-priority',
+            'run_at',
+            'pk',
+        ),
+    )
+
+
+def fail(task: Task, permanent: bool = False) -> None:
+    """Откладывает задачу до следующей попытки или оставляет её мёртвой.
+
+    Args:
+        task: Задача, завершившаяся ошибкой.
+        permanent: Повторять задачу бессмысленно.
+    """
+    task.last_error = traceback.format_exc()
+    task.locked_by = ''
+    task.locked_at = None
+    if permanent or task.attempts >= task.max_attempts:
+        task.status = Task.DEAD
+    else:
+        task.status = Task.PENDING
+        task.run_at = timezone.now() + backoff(task.attempts)
+        task.unique_key = None
+    task.save(
+        update_fields=(
+            'last_error',
+            'locked_by',
+            'locked_at',
+            'status',
+            'run_at',
+            'unique_key',
+        ),
+    )
+
+
+def execute(task: Task) -> bool:
+    """Выполняет задачу и удаляет её из очереди в одной транзакции.
+
+    Изменения в базе, сделанные упавшей задачей, откатываются.
+
+    Args:
+        task: Забранная задача.
+
+    Returns:
+        Выполнена ли задача.
+    """
+    func = REGISTRY.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {task.name} не зарегистрирована.')
+        payload = json.loads(task.payload)
+        with transaction.atomic():
+            func(*payload['args'], **payload['kwargs'])
+            Task.objects.filter(pk=task.pk).delete()
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', task)
+        fail(task, permanent=func is None)
+        return False
+    return True
+
+
+def _execute_in_thread(task: Task) -> bool:
+    try:
+        return execute(task)
+    finally:
+        connection.close()
+
+
+def run(
+    concurrency: int = 1,
+    batch_size: int = 1,
+    poll_interval: float = 1,
+    once: bool = False,
+    stop: typing.Optional[threading.Event] = None,
+) -> typing.Dict[str, int]:
+    """Выполняет задачи из очереди, пока не попросят остановиться.
+
+    С ``concurrency`` больше единицы задачи пачки выполняются в пуле
+    потоков, иначе по очереди в текущем потоке.
+
+    Args:
+        concurrency: Сколько задач выполнять одновременно.
+        batch_size: Сколько задач забирать за раз.
+        poll_interval: Пауза в секундах, если очередь пуста.
+        once: Выполнить готовые задачи и завершиться.
+        stop: Событие, по которому обработчик завершает работу
+            после текущей пачки.
+
+    Returns:
+        Количество выполненных и упавших задач.
+    """
+    stop = stop or threading.Event()
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    executor = (
+        ThreadPoolExecutor(concurrency, thread_name_prefix='outbox')
+        if concurrency > 1
+        else None
+    )
+    stats = {'done': 0, 'failed': 0}
+    try:
+        while not stop.is_set():
+            tasks = claim(worker, max(batch_size, concurrency))
+            if not tasks:
+                if once:
+                    break
+                stop.wait(poll_interval)
+                continue
+            results = (
+                map(execute, tasks)
+                if executor is None
+                else executor.map(_execute_in_thread, tasks)
+            )
+            for done in results:
+                stats['done' if done else 'failed'] += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return stats
@@ -1,11 +1,12 @@
 from django.contrib import admin
 
-from core.admin import BaseAdmin
+from core.admin import BaseAdmin, FullTextSearchAdmin
+from posts import search
 from posts.models import Comment, Follow, Group, Post
 
 
 @admin.register(Post)
-class PostAdmin(BaseAdmin):
+class PostAdmin(FullTextSearchAdmin):
     """Способ отображения поста в админке."""
 
     list_display = (
@@ -14,9 +15,12 @@ class PostAdmin(BaseAdmin):
         'created',
         'author',
         'group',
+        'view_count',
     )
+    readonly_fields = ('view_count',)
     list_editable = ('group',)
     search_fields = ('text',)
+    search_index = search.POSTS
     list_filter = ('created',)
 
 
@@ -35,7 +39,7 @@ class GroupAdmin(BaseAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(BaseAdmin):
+class CommentAdmin(FullTextSearchAdmin):
     """Способ отображения комментария в админке."""
 
     list_display = (
@@ -45,6 +49,7 @@ class CommentAdmin(BaseAdmin):
         'text',
     )
     search_fields = ('text',)
+    search_index = search.COMMENTS
     list_filter = ('author',)
 
 
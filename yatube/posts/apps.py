@@ -6,3 +6,6 @@ class PostsConfig(AppConfig):
 
     name = 'posts'
     verbose_name = 'посты'
+
+    def ready(self) -> None:
+        import posts.signals  # noqa: F401
@@ -0,0 +1,267 @@
+import random
+import time
+import tracemalloc
+import typing
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.template.loader import render_to_string
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.metrics import Summary
+from posts.cards import CARD_TEMPLATE
+from posts.models import Group, Post, User, UserStats
+from posts.rows import post_rows
+
+SAMPLE_SIZE = 200
+
+
+class Request(typing.NamedTuple):
+    method: str
+    url: str
+    user: typing.Optional[User] = None
+    data: typing.Optional[typing.Dict[str, str]] = None
+
+
+class Sample(typing.NamedTuple):
+    """Выборка объектов набора данных, по которым строятся запросы."""
+
+    post_ids: typing.List[int]
+    slugs: typing.List[str]
+    usernames: typing.List[str]
+    followers: typing.List[User]
+
+    @classmethod
+    def load(cls, size: int = SAMPLE_SIZE) -> 'Sample':
+        return cls(
+            post_ids=list(
+                Post.objects.order_by('?').values_list('pk', flat=True)[:size],
+            ),
+            slugs=list(
+                Group.objects.order_by('?').values_list('slug', flat=True)[
+                    :size
+                ],
+            ),
+            usernames=list(
+                User.objects.filter(posts__isnull=False)
+                .distinct()
+                .order_by('?')
+                .values_list('username', flat=True)[:size],
+            ),
+            followers=list(
+                User.objects.filter(
+                    pk__in=UserStats.objects.filter(
+                        following_count__gt=0,
+                    )
+                    .order_by('?')
+                    .values('user')[:size],
+                ),
+            ),
+        )
+
+
+def _index(sample: Sample, rng: random.Random) -> Request:
+    return Request('get', reverse('posts:index'))
+
+
+def _group_posts(sample: Sample, rng: random.Random) -> Request:
+    return Request(
+        'get',
+        reverse('posts:group_list', args=(rng.choice(sample.slugs),)),
+    )
+
+
+def _profile(sample: Sample, rng: random.Random) -> Request:
+    return Request(
+        'get',
+        reverse('posts:profile', args=(rng.choice(sample.usernames),)),
+    )
+
+
+def _post_detail(sample: Sample, rng: random.Random) -> Request:
+    return Request(
+        'get',
+        reverse('posts:post_detail', args=(rng.choice(sample.post_ids),)),
+    )
+
+
+def _follow_index(sample: Sample, rng: random.Random) -> Request:
+    return Request(
+        'get',
+        reverse('posts:follow_index'),
+        rng.choice(sample.followers),
+    )
+
+
+def _add_comment(sample: Sample, rng: random.Random) -> Request:
+    return Request(
+        'post',
+        reverse('posts:add_comment', args=(rng.choice(sample.post_ids),)),
+        rng.choice(sample.followers),
+        {'text': 'Комментарий из нагрузочного теста'},
+    )
+
+
+SCENARIOS: typing.Dict[
+    str,
+    typing.Callable[[Sample, random.Random], Request],
+] = {
+    'index': _index,
+    'group_posts': _group_posts,
+    'profile': _profile,
+    'post_detail': _post_detail,
+    'follow_index': _follow_index,
+    'add_comment': _add_comment,
+}
+
+
+def _client(
+    request: Request,
+    clients: typing.Dict[typing.Optional[int], Client],
+) -> Client:
+    """Возвращает клиент пользователя запроса, входя под ним один раз."""
+    key = request.user.pk if request.user is not None else None
+    if key not in clients:
+        clients[key] = Client()
+        if request.user is not None:
+            clients[key].force_login(request.user)
+    return clients[key]
+
+
+def _send(client: Client, request: Request, cold: bool) -> None:
+    if cold:
+        cache.clear()
+    getattr(client, request.method)(request.url, request.data)
+
+
+def run_scenario(
+    name: str,
+    sample: Sample,
+    requests: int,
+    warmup: int,
+    memory_requests: int,
+    cold: bool,
+    seed: int,
+) -> typing.Dict[str, float]:
+    """Измеряет задержку, число запросов к базе и пик памяти сценария.
+
+    Время и память замеряются разными проходами: ``tracemalloc``
+    заметно замедляет обработку запроса.
+
+    Args:
+        name: Имя сценария из ``SCENARIOS``.
+        sample: Объекты набора данных для построения запросов.
+        requests: Количество замеряемых запросов.
+        warmup: Количество запросов до начала замеров.
+        memory_requests: Количество запросов для замера памяти.
+        cold: Очищать ли кэш перед каждым запросом.
+        seed: Зерно выбора объектов для запросов.
+
+    Returns:
+        Квантили задержки в миллисекундах, среднее число SQL-запросов
+        и пик памяти в килобайтах.
+    """
+    rng = random.Random(f'{seed}:{name}')
+    build = SCENARIOS[name]
+    clients: typing.Dict[typing.Optional[int], Client] = {}
+    for _ in range(warmup):
+        request = build(sample, rng)
+        _send(_client(request, clients), request, cold)
+    latency = Summary(window=requests)
+    queries = 0
+    for _ in range(requests):
+        request = build(sample, rng)
+        client = _client(request, clients)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            _send(client, request, cold)
+            latency.observe((time.perf_counter() - started) * 1000)
+        queries += len(captured)
+    peak = 0
+    for _ in range(memory_requests):
+        request = build(sample, rng)
+        client = _client(request, clients)
+        tracemalloc.start()
+        try:
+            _send(client, request, cold)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    quantiles = dict(latency.quantiles())
+    return {
+        'p50_ms': round(quantiles[0.5], 2),
+        'p95_ms': round(quantiles[0.95], 2),
+        'p99_ms': round(quantiles[0.99], 2),
+        'mean_ms': round(latency.sum / latency.count, 2),
+        'queries': round(queries / requests, 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(
+    previous: typing.Dict[str, typing.Dict[str, float]],
+    current: typing.Dict[str, typing.Dict[str, float]],
+) -> typing.Iterator[str]:
+    """Построчно сравнивает результаты двух прогонов.
+
+    Yields:
+        Изменение каждого показателя каждого сценария в процентах.
+    """
+    for name, values in current.items():
+        for metric, value in values.items():
+            before = previous.get(name, {}).get(metric)
+            if before is None:
+                continue
+            change = (value - before) / before * 100 if before else 0.0
+            yield f'{name}.{metric}: {before} → {value} ({change:+.1f}%)'
+
+
+READ_PATHS: typing.Dict[str, typing.Callable[[], QuerySet]] = {
+    'models': lambda: Post.objects.select_related('author', 'group'),
+    'rows': lambda: post_rows(Post.objects.all()),
+}
+
+
+def run_read_path(
+    name: str,
+    limit: int,
+    repeats: int,
+) -> typing.Dict[str, float]:
+    """Сравнивает чтение и рендер ленты моделями и ``PostRow``.
+
+    Карточки рендерятся шаблоном напрямую, мимо кэша карточек.
+
+    Args:
+        name: Способ чтения из ``READ_PATHS``.
+        limit: Количество постов в выборке.
+        repeats: Количество повторов замера времени.
+
+    Returns:
+        Среднее время выборки и рендера в миллисекундах, пик памяти
+        при выборке и память, занятую результатом, в килобайтах.
+    """
+    queryset = READ_PATHS[name]().order_by('-created', '-id')[:limit]
+    fetch = render = 0.0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        posts = list(queryset.all())
+        fetched = time.perf_counter()
+        for post in posts:
+            render_to_string(CARD_TEMPLATE, {'post': post})
+        fetch += fetched - started
+        render += time.perf_counter() - fetched
+    tracemalloc.start()
+    try:
+        posts = list(queryset.all())
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'fetch_ms': round(fetch / repeats * 1000, 2),
+        'render_ms': round(render / repeats * 1000, 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'retained_memory_kb': round(retained / 1024, 1),
+    }
@@ -0,0 +1,67 @@
+import functools
+import typing
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeText, mark_safe
+
+from core.cache_tags import versions_many
+from core.tiered_cache import tiered_cache
+from posts.invalidation import author_tag, post_tag
+from posts.models import Post
+
+CARD_TEMPLATE = 'posts/post.html'
+
+
+def card_keys(posts: typing.Sequence[Post]) -> typing.List[str]:
+    """Строит ключи кэша карточек постов.
+
+    Ключ меняется при сохранении поста и записи его просмотров, а также
+    со сменой версий тегов поста (комментарии, готовая миниатюра) и его
+    автора (имя).
+
+    Args:
+        posts: Посты ленты.
+
+    Returns:
+        Ключи в порядке постов.
+    """
+    return [
+        f'post_card:{post.pk}:{(post.modified or post.created).timestamp()}'
+        f':{post.view_count}:{version}'
+        for post, version in zip(
+            posts,
+            versions_many(
+                (post_tag(post.pk), author_tag(post.author_id))
+                for post in posts
+            ),
+        )
+    ]
+
+
+def render_cards(posts: typing.Iterable[Post]) -> typing.List[SafeText]:
+    """Возвращает карточки постов, отрисовывая только отсутствующие в кэше.
+
+    Все карточки страницы читаются из кэша одним запросом. Карточка
+    общая для всех пользователей, поэтому рендерится без запроса.
+
+    Args:
+        posts: Посты ленты.
+
+    Returns:
+        HTML карточек в порядке постов.
+    """
+    posts = list(posts)
+    keys = card_keys(posts)
+    cards = tiered_cache.get_many_or_set(
+        {
+            key: functools.partial(
+                render_to_string,
+                CARD_TEMPLATE,
+                {'post': post},
+            )
+            for key, post in zip(keys, posts)
+        },
+        settings.POST_CARD_TIMEOUT,
+    )
+    return [mark_safe(cards[key]) for key in keys]
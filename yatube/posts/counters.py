@@ -0,0 +1,153 @@
+import typing
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from posts.models import Comment, Follow, Group, Post, User, UserStats
+
+
+def _add(
+    queryset: models.QuerySet,
+    pk: typing.Optional[int],
+    field: str,
+    delta: int,
+) -> None:
+    """Меняет счётчик на ``delta``, не опуская его ниже нуля.
+
+    Разошедшийся с данными счётчик исправит ``reconcile``, а запись
+    не должна падать на ограничении положительного поля.
+    """
+    if pk is not None:
+        queryset.filter(pk=pk).update(
+            **{field: Greatest(F(field) + delta, 0)},
+        )
+
+
+def user_created(user: User) -> None:
+    UserStats.objects.get_or_create(user=user)
+
+
+def post_created(post: Post, delta: int = 1) -> None:
+    """Учитывает пост в счётчиках автора и группы.
+
+    Args:
+        post: Созданный пост.
+        delta: Изменение счётчиков, -1 для удалённого поста.
+    """
+    _add(UserStats.objects, post.author_id, 'post_count', delta)
+    _add(Group.objects, post.group_id, 'post_count', delta)
+
+
+def post_deleted(post: Post) -> None:
+    post_created(post, -1)
+
+
+def post_moved(post: Post, previous_group_id: typing.Optional[int]) -> None:
+    """Переносит пост между счётчиками групп при смене группы.
+
+    Args:
+        post: Сохранённый пост.
+        previous_group_id: Группа поста до сохранения.
+    """
+    if previous_group_id != post.group_id:
+        _add(Group.objects, previous_group_id, 'post_count', -1)
+        _add(Group.objects, post.group_id, 'post_count', 1)
+
+
+def comment_created(comment: Comment, delta: int = 1) -> None:
+    _add(Post.objects, comment.post_id, 'comment_count', delta)
+
+
+def comment_deleted(comment: Comment) -> None:
+    comment_created(comment, -1)
+
+
+def follow_created(follow: Follow, delta: int = 1) -> None:
+    _add(UserStats.objects, follow.author_id, 'follower_count', delta)
+    _add(UserStats.objects, follow.user_id, 'following_count', delta)
+
+
+def follow_deleted(follow: Follow) -> None:
+    follow_created(follow, -1)
+
+
+def _count(model: typing.Type[models.Model], field: str) -> Coalesce:
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=models.PositiveIntegerField(),
+        ),
+        0,
+    )
+
+
+def _reconcile(
+    queryset: models.QuerySet,
+    field: str,
+    actual: Coalesce,
+    batch_size: int,
+) -> int:
+    fixed = 0
+    last_pk = None
+    while True:
+        batch = queryset.order_by('pk')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(
+            batch.annotate(actual=actual).values_list(
+                'pk',
+                field,
+                'actual',
+            )[:batch_size],
+        )
+        if not rows:
+            return fixed
+        last_pk = rows[-1][0]
+        for pk, stored, counted in rows:
+            if stored != counted:
+                queryset.filter(pk=pk).update(**{field: counted})
+                fixed += 1
+
+
+def reconcile(
+    batch_size: int = settings.COUNTERS_BATCH_SIZE,
+) -> typing.Dict[str, int]:
+    """Пересчитывает счётчики пачками и исправляет расхождения.
+
+    Args:
+        batch_size: Количество строк, проверяемых одним запросом.
+
+    Returns:
+        Количество исправленных значений по каждому счётчику.
+    """
+    UserStats.objects.bulk_create(
+        (
+            UserStats(user_id=pk)
+            for pk in User.objects.filter(stats__isnull=True)
+            .values_list('pk', flat=True)
+            .iterator()
+        ),
+        ignore_conflicts=True,
+    )
+    counters = (
+        (UserStats.objects, 'post_count', _count(Post, 'author')),
+        (UserStats.objects, 'follower_count', _count(Follow, 'author')),
+        (UserStats.objects, 'following_count', _count(Follow, 'user')),
+        (Group.objects, 'post_count', _count(Post, 'group')),
+        (Post.objects, 'comment_count', _count(Comment, 'post')),
+    )
+    return {
+        f'{queryset.model._meta.model_name}.{field}': _reconcile(
+            queryset,
+            field,
+            actual,
+            batch_size,
+        )
+        for queryset, field, actual in counters
+    }
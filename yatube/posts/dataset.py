@@ -0,0 +1,261 @@
+import bisect
+import datetime
+import functools
+import itertools
+import random
+import typing
+
+from django.contrib.auth.hashers import make_password
+from django.db import models
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import Comment, Follow, Group, Post, User
+
+Row = typing.Dict[str, typing.Any]
+
+LOCALE = 'ru_RU'
+
+ZIPF_EXPONENT = 1.1
+
+
+class Plan(typing.NamedTuple):
+    """Параметры набора данных, общие для всех процессов-генераторов."""
+
+    seed: int
+    first_user: int
+    users: int
+    first_group: int
+    groups: int
+    first_post: int
+    posts: int
+    first_comment: int
+    comments: int
+    follows: int
+    password: str
+    start: datetime.datetime
+    span: datetime.timedelta
+
+
+@functools.lru_cache(maxsize=None)
+def _zipf_weights(size: int) -> typing.List[float]:
+    return list(
+        itertools.accumulate(
+            1 / rank**ZIPF_EXPONENT for rank in range(1, size + 1)
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _popularity(size: int, seed: int) -> typing.List[int]:
+    order = list(range(size))
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def _zipf(rng: random.Random, size: int, seed: int) -> int:
+    """Выбирает номер от 0 до size по закону Ципфа.
+
+    Самые популярные номера перемешаны с постоянным зерном, чтобы они
+    не совпадали с первыми записями таблицы.
+    """
+    weights = _zipf_weights(size)
+    rank = bisect.bisect(weights, rng.random() * weights[-1])
+    return _popularity(size, seed)[min(rank, size - 1)]
+
+
+COMMENT_DELAY = datetime.timedelta(days=7)
+
+
+def _post_created(plan: Plan, pk: int) -> datetime.datetime:
+    return plan.start + plan.span * (pk - plan.first_post) / plan.posts
+
+
+def _users(plan: Plan, rng: random.Random, fake: Faker, pk: int) -> Row:
+    return {
+        'pk': pk,
+        'username': f'{fake.user_name()}{pk}'[:150],
+        'first_name': fake.first_name(),
+        'last_name': fake.last_name(),
+        'email': fake.email(),
+        'password': plan.password,
+        'date_joined': plan.start,
+    }
+
+
+def _groups(plan: Plan, rng: random.Random, fake: Faker, pk: int) -> Row:
+    return {
+        'pk': pk,
+        'title': fake.sentence(nb_words=3)[:200],
+        'slug': f'group-{pk}',
+        'description': fake.paragraph(),
+    }
+
+
+def _posts(plan: Plan, rng: random.Random, fake: Faker, pk: int) -> Row:
+    return {
+        'pk': pk,
+        'author_id': plan.first_user + _zipf(rng, plan.users, plan.seed + 5),
+        'group_id': (
+            plan.first_group + _zipf(rng, plan.groups, plan.seed + 2)
+            if plan.groups and rng.random() < 0.7
+            else None
+        ),
+        'text': fake.paragraph(nb_sentences=rng.randint(1, 8)),
+        'created': _post_created(plan, pk),
+    }
+
+
+def _comments(plan: Plan, rng: random.Random, fake: Faker, pk: int) -> Row:
+    """Комментарий, оставленный в течение недели после поста, но не
+    позже конца периода набора."""
+    post_id = plan.first_post + _zipf(rng, plan.posts, plan.seed + 3)
+    post_created = _post_created(plan, post_id)
+    delay = min(COMMENT_DELAY, plan.start + plan.span - post_created)
+    return {
+        'pk': pk,
+        'post_id': post_id,
+        'author_id': plan.first_user + rng.randrange(plan.users),
+        'text': fake.sentence(nb_words=rng.randint(3, 25)),
+        'created': post_created
+        + datetime.timedelta(
+            seconds=rng.randint(1, max(1, int(delay.total_seconds()))),
+        ),
+    }
+
+
+def _follows(plan: Plan, rng: random.Random, fake: Faker, pk: int) -> Row:
+    """Подписка, у которой и подписчики, и авторы распределены степенно."""
+    user = _zipf(rng, plan.users, plan.seed + 4)
+    author = _zipf(rng, plan.users, plan.seed + 1)
+    if author == user:
+        author = (author + 1) % plan.users
+    return {
+        'user_id': plan.first_user + user,
+        'author_id': plan.first_user + author,
+    }
+
+
+GENERATORS: typing.Dict[
+    typing.Type[models.Model],
+    typing.Callable[[Plan, random.Random, Faker, int], Row],
+] = {
+    User: _users,
+    Group: _groups,
+    Post: _posts,
+    Comment: _comments,
+    Follow: _follows,
+}
+
+
+FIRST_PK: typing.Dict[typing.Type[models.Model], str] = {
+    User: 'first_user',
+    Group: 'first_group',
+    Post: 'first_post',
+    Comment: 'first_comment',
+}
+
+
+def generate_chunk(
+    plan: Plan,
+    model: typing.Type[models.Model],
+    offset: int,
+    size: int,
+) -> typing.List[Row]:
+    """Генерирует пачку строк модели.
+
+    Зерно зависит только от модели и номера первой строки пачки, поэтому
+    набор данных не зависит от числа процессов и порядка их работы.
+
+    Args:
+        plan: Параметры набора данных.
+        model: Модель, строки которой генерируются.
+        offset: Номер первой строки пачки в наборе.
+        size: Количество строк.
+
+    Returns:
+        Значения полей для конструктора модели.
+    """
+    seed = f'{plan.seed}:{model._meta.label}:{offset}'
+    rng = random.Random(seed)
+    fake = Faker(LOCALE)
+    fake.seed_instance(seed)
+    generator = GENERATORS[model]
+    first_pk = getattr(plan, FIRST_PK[model]) if model in FIRST_PK else 1
+    return [
+        generator(plan, rng, fake, pk)
+        for pk in range(first_pk + offset, first_pk + offset + size)
+    ]
+
+
+def backdate(model: typing.Type[models.Model], rows: typing.List[Row]) -> None:
+    """Записывает запланированные даты создания вставленных строк.
+
+    ``created`` заполняется в ``pre_save`` текущим временем, в том числе
+    при ``bulk_create``, поэтому даты пишутся отдельным ``bulk_update``,
+    который ``pre_save`` не вызывает.
+    """
+    if not rows or 'created' not in rows[0]:
+        return
+    model.objects.bulk_update(
+        [model(pk=row['pk'], created=row['created']) for row in rows],
+        ['created'],
+    )
+
+
+def _next_pk(model: typing.Type[models.Model]) -> int:
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def make_plan(
+    seed: int,
+    users: int,
+    groups: int,
+    posts: int,
+    comments: int,
+    follows: int,
+    password: str,
+    days: int,
+) -> Plan:
+    """Готовит параметры набора данных, продолжающего текущую базу.
+
+    Новые записи получают ключи после существующих, а посты равномерно
+    распределяются по последним ``days`` дням.
+    """
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return Plan(
+        seed=seed,
+        first_user=_next_pk(User),
+        users=users,
+        first_group=_next_pk(Group),
+        groups=groups,
+        first_post=_next_pk(Post),
+        posts=posts,
+        first_comment=_next_pk(Comment),
+        comments=comments,
+        follows=follows,
+        password=make_password(password),
+        start=today - datetime.timedelta(days=days),
+        span=datetime.timedelta(days=days),
+    )
+
+
+def chunks(
+    plan: Plan,
+    chunk_size: int,
+) -> typing.Iterator[typing.Tuple[typing.Type[models.Model], int, int]]:
+    """Делит набор данных на пачки в порядке, допустимом для внешних ключей.
+
+    Yields:
+        Модель, номер первой строки и размер пачки.
+    """
+    for model, total in (
+        (User, plan.users),
+        (Group, plan.groups),
+        (Post, plan.posts if plan.users else 0),
+        (Comment, plan.comments if plan.posts else 0),
+        (Follow, plan.follows if plan.users > 1 else 0),
+    ):
+        for offset in range(0, total, chunk_size):
+            yield model, offset, min(chunk_size, total - offset)
@@ -0,0 +1,234 @@
+import collections
+import datetime
+import hashlib
+import re
+import typing
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils import timezone
+
+from posts.models import Comment, Post, TextFingerprint
+
+BITS = 64
+
+# Полос на одну больше допустимого расстояния: отпечатки, отличающиеся
+# не более чем в трёх битах, совпадают хотя бы в одной полосе целиком.
+BANDS = 4
+
+BAND_BITS = BITS // BANDS
+
+BAND_MASK = (1 << BAND_BITS) - 1
+
+BAND_FIELDS = tuple(f'band_{band}' for band in range(BANDS))
+
+TOKEN = re.compile(r'\w+')
+
+# Биты хэша раскладываются по 32-битным «дорожкам» одного большого
+# целого: сложение таких чисел считает единицы во всех 64 битах сразу.
+LANE_BITS = 32
+
+LANE_MASK = (1 << LANE_BITS) - 1
+
+SPREAD = tuple(
+    sum((byte >> bit & 1) << (bit * LANE_BITS) for bit in range(8))
+    for byte in range(256)
+)
+
+# Расстояние проверяется в запросе до LIMIT: иначе при множестве
+# совпадений полос настоящий дубликат мог бы не попасть в выборку.
+CANDIDATES_SQL = (
+    f'SELECT kind, object_id FROM {TextFingerprint._meta.db_table} '
+    f'WHERE ({" OR ".join(f"{field} = %s" for field in BAND_FIELDS)}) '
+    'AND created >= %s AND NOT (kind = %s AND object_id = %s) '
+    'AND hamming(simhash, %s) <= %s ORDER BY created DESC LIMIT %s'
+)
+
+MODELS: typing.Dict[str, typing.Type[models.Model]] = {
+    TextFingerprint.POST: Post,
+    TextFingerprint.COMMENT: Comment,
+}
+
+
+def tokens(text: str) -> typing.List[str]:
+    return TOKEN.findall(text.lower())
+
+
+def _spread(value: int) -> int:
+    spread = 0
+    for position, byte in enumerate(value.to_bytes(BITS // 8, 'little')):
+        spread |= SPREAD[byte] << (position * 8 * LANE_BITS)
+    return spread
+
+
+def simhash(words: typing.Sequence[str]) -> int:
+    """Считает 64-битный SimHash по словам и парам соседних слов.
+
+    Args:
+        words: Слова текста.
+
+    Returns:
+        Отпечаток: у похожих текстов отличается в немногих битах.
+    """
+    features = collections.Counter(words)
+    features.update(' '.join(pair) for pair in zip(words, words[1:]))
+    ones = 0
+    for feature, count in features.items():
+        ones += count * _spread(
+            int.from_bytes(
+                hashlib.blake2b(feature.encode(), digest_size=8).digest(),
+                'little',
+            ),
+        )
+    total = sum(features.values())
+    return sum(
+        1 << bit
+        for bit in range(BITS)
+        if 2 * (ones >> (bit * LANE_BITS) & LANE_MASK) > total
+    )
+
+
+def bands(value: int) -> typing.Dict[str, int]:
+    return {
+        field: value >> (band * BAND_BITS) & BAND_MASK
+        for band, field in enumerate(BAND_FIELDS)
+    }
+
+
+def to_signed(value: int) -> int:
+    """Приводит отпечаток к знаковому 64-битному целому для базы."""
+    return value - (1 << BITS) if value >> (BITS - 1) else value
+
+
+def distance(first: int, second: int) -> int:
+    return bin((first ^ second) & ((1 << BITS) - 1)).count('1')
+
+
+def install(connection: BaseDatabaseWrapper) -> None:
+    """Регистрирует в соединении SQLite функцию ``hamming``."""
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function(
+            'hamming',
+            2,
+            distance,
+            deterministic=True,
+        )
+
+
+def find(
+    text: str,
+    exclude: typing.Optional[typing.Tuple[str, typing.Optional[int]]] = None,
+) -> typing.List[typing.Tuple[str, int]]:
+    """Ищет недавние посты и комментарии с почти таким же текстом.
+
+    Кандидаты выбираются одним запросом по индексам полос, и в том же
+    запросе у них проверяется расстояние Хэмминга. Короткие тексты
+    не проверяются: короткие ответы вроде «Спасибо!» совпадают и без
+    спама.
+
+    Args:
+        text: Проверяемый текст.
+        exclude: Тип и id записи, которую не считать дубликатом.
+
+    Returns:
+        Типы и id найденных записей.
+    """
+    words = tokens(text)
+    if len(words) < settings.DUPLICATES_MIN_TOKENS:
+        return []
+    value = simhash(words)
+    since = timezone.now() - datetime.timedelta(
+        hours=settings.DUPLICATES_WINDOW_HOURS,
+    )
+    excluded_kind, excluded_id = exclude or ('', None)
+    # Запрос собран заранее: построение его через ORM заняло бы больше
+    # времени, чем сам поиск по индексам полос.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            CANDIDATES_SQL,
+            [
+                *bands(value).values(),
+                connection.ops.adapt_datetimefield_value(since),
+                excluded_kind,
+                -1 if excluded_id is None else excluded_id,
+                to_signed(value),
+                settings.DUPLICATES_DISTANCE,
+                settings.DUPLICATES_CANDIDATES,
+            ],
+        )
+        return cursor.fetchall()
+
+
+def fingerprint(
+    kind: str,
+    object_id: int,
+    text: str,
+    created: datetime.datetime,
+) -> TextFingerprint:
+    value = simhash(tokens(text))
+    return TextFingerprint(
+        kind=kind,
+        object_id=object_id,
+        simhash=to_signed(value),
+        created=created,
+        **bands(value),
+    )
+
+
+def index(kind: str, instance: models.Model) -> None:
+    """Добавляет или обновляет отпечаток сохранённой записи."""
+    item = fingerprint(kind, instance.pk, instance.text, instance.created)
+    TextFingerprint.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults={
+            field: getattr(item, field)
+            for field in ('simhash', 'created', *BAND_FIELDS)
+        },
+    )
+
+
+def unindex(kind: str, instance: models.Model) -> None:
+    TextFingerprint.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def unindex_comments(post: Post) -> None:
+    """Удаляет отпечатки всех комментариев поста одним запросом."""
+    TextFingerprint.objects.filter(
+        kind=TextFingerprint.COMMENT,
+        object_id__in=Comment.objects.filter(post=post).values('pk'),
+    ).delete()
+
+
+def build(batch_size: int) -> int:
+    """Пересобирает отпечатки всех постов и комментариев.
+
+    Записи читаются пачками по ключу, поэтому память не растёт
+    с размером таблиц.
+
+    Args:
+        batch_size: Сколько записей читать и вставлять за раз.
+
+    Returns:
+        Количество отпечатков.
+    """
+    total = 0
+    with transaction.atomic():
+        TextFingerprint.objects.all().delete()
+        for kind, model in MODELS.items():
+            last = 0
+            while True:
+                rows = list(
+                    model.objects.filter(pk__gt=last)
+                    .order_by('pk')
+                    .values_list('pk', 'text', 'created')[:batch_size],
+                )
+                TextFingerprint.objects.bulk_create(
+                    fingerprint(kind, *row) for row in rows
+                )
+                total += len(rows)
+                if len(rows) < batch_size:
+                    break
+                last = rows[-1][0]
+    return total
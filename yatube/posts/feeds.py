@@ -0,0 +1,215 @@
+import abc
+import datetime
+import hashlib
+import io
+import typing
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.urls import reverse
+from django.utils import feedgenerator, timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.text import Truncator
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from core.cache_tags import changed_at, versions
+from posts.rows import PostRow, post_rows
+
+
+class StreamingFeedMixin(abc.ABC):
+    """Выдаёт ленту частями по мере чтения постов из базы.
+
+    Стандартный ``SyndicationFeed.write`` собирает все записи в памяти;
+    здесь документ пишется в буфер, который опустошается после корня
+    и каждой записи.
+    """
+
+    item_element: str
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        updated: datetime.datetime,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.updated = updated
+
+    def latest_post_date(self) -> datetime.datetime:
+        return self.updated
+
+    @abc.abstractmethod
+    def open_root(self, handler: SimplerXMLGenerator) -> None:
+        """Открывает корневые элементы и пишет поля самой ленты."""
+
+    @abc.abstractmethod
+    def close_root(self, handler: SimplerXMLGenerator) -> None:
+        """Закрывает корневые элементы."""
+
+    def item(self, **kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+        """Нормализует поля записи так же, как ``add_item``."""
+        self.add_item(**kwargs)
+        return self.items.pop()
+
+    def stream(
+        self,
+        items: typing.Iterable[typing.Dict[str, typing.Any]],
+    ) -> typing.Iterator[str]:
+        """Пишет документ ленты, отдавая его по частям.
+
+        Args:
+            items: Поля записей для ``item``.
+
+        Yields:
+            Очередной фрагмент XML.
+        """
+        buffer = io.StringIO()
+
+        def drain() -> str:
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        handler = SimplerXMLGenerator(buffer, settings.DEFAULT_CHARSET)
+        handler.startDocument()
+        self.open_root(handler)
+        yield drain()
+        for fields in items:
+            item = self.item(**fields)
+            handler.startElement(self.item_element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield drain()
+        self.close_root(handler)
+        yield drain()
+
+
+class AtomFeed(StreamingFeedMixin, feedgenerator.Atom1Feed):
+    item_element = 'entry'
+
+    def open_root(self, handler: SimplerXMLGenerator) -> None:
+        handler.startElement('feed', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def close_root(self, handler: SimplerXMLGenerator) -> None:
+        handler.endElement('feed')
+
+
+class RssFeed(StreamingFeedMixin, feedgenerator.Rss201rev2Feed):
+    item_element = 'item'
+
+    def open_root(self, handler: SimplerXMLGenerator) -> None:
+        handler.startElement('rss', self.rss_attributes())
+        handler.startElement('channel', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def close_root(self, handler: SimplerXMLGenerator) -> None:
+        self.endChannelElement(handler)
+        handler.endElement('rss')
+
+
+FORMATS: typing.Dict[str, typing.Type[StreamingFeedMixin]] = {
+    'atom': AtomFeed,
+    'rss': RssFeed,
+}
+
+
+def _items(
+    request: HttpRequest,
+    posts: QuerySet,
+) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+    post: PostRow
+    for post in posts.iterator(chunk_size=settings.FEED_CHUNK_SIZE):
+        link = request.build_absolute_uri(
+            reverse('posts:post_detail', args=(post.pk,)),
+        )
+        yield {
+            'title': Truncator(post.text).words(settings.FEED_TITLE_WORDS),
+            'link': link,
+            'description': post.text,
+            'author_name': post.author.get_full_name() or post.author.username,
+            'author_link': request.build_absolute_uri(
+                reverse('posts:profile', args=(post.author.username,)),
+            ),
+            'pubdate': post.created,
+            'updateddate': post.modified or post.created,
+            'unique_id': link,
+        }
+
+
+def feed_response(
+    request: HttpRequest,
+    kind: str,
+    title: str,
+    link: str,
+    posts: QuerySet,
+    tags: typing.Iterable[str],
+) -> HttpResponseBase:
+    """Отдаёт ленту постов, кэшируя готовый документ.
+
+    Документ кэшируется под ключом из адреса ленты без строки запроса,
+    формата и версий тегов, поэтому новые и изменённые посты сразу
+    попадают в ленту, а параметры запроса не плодят записи кэша.
+    При промахе лента передаётся потоком и сохраняется в кэш после
+    последней записи. ``ETag`` и ``Last-Modified`` позволяют ответить
+    ``304`` вообще без обращения к кэшу ленты.
+
+    Args:
+        request: Передаваемый запрос.
+        kind: Формат ленты из ``FORMATS``.
+        title: Заголовок ленты.
+        link: Адрес HTML-страницы, которую повторяет лента.
+        posts: Посты ленты.
+        tags: Теги, при смене версий которых лента устаревает.
+
+    Returns:
+        Ответ с документом ленты.
+    """
+    tag_versions = versions(tags)
+    feed_url = request.build_absolute_uri(request.path)
+    digest = hashlib.md5(
+        f'{feed_url}|{kind}|{tag_versions}'.encode(),
+    ).hexdigest()
+    etag = f'"{digest}"'
+    updated = changed_at(tag_versions) or timezone.now()
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(updated.timestamp()),
+    )
+    if response is None:
+        key = f'feed:{digest}'
+        feed = FORMATS[kind](
+            title=title,
+            link=request.build_absolute_uri(link),
+            description=title,
+            feed_url=feed_url,
+            language=settings.LANGUAGE_CODE,
+            updated=updated,
+        )
+        content = cache.get(key)
+        if content is not None:
+            response = HttpResponse(content, content_type=feed.content_type)
+        else:
+            limit = settings.FEED_ITEMS
+            latest = post_rows(posts).order_by('-created', '-id')[:limit]
+
+            def stream() -> typing.Iterator[str]:
+                chunks = []
+                for chunk in feed.stream(_items(request, latest)):
+                    chunks.append(chunk)
+                    yield chunk
+                cache.set(key, ''.join(chunks), settings.FEED_CACHE_TIMEOUT)
+
+            response = StreamingHttpResponse(
+                stream(),
+                content_type=feed.content_type,
+            )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(updated.timestamp())
+    return response
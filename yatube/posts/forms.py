@@ -1,19 +1,50 @@
 from django import forms
+from django.db import transaction
 
-from posts.models import Comment, Post
+from posts import duplicates, tasks
+from posts.models import Comment, Post, TextFingerprint
 
 
-class PostForm(forms.ModelForm):
+class DuplicateTextMixin:
+    """Отклоняет текст, почти совпадающий с недавно опубликованным."""
+
+    fingerprint_kind: str
+
+    def clean_text(self) -> str:
+        text = self.cleaned_data['text']
+        if duplicates.find(text, (self.fingerprint_kind, self.instance.pk)):
+            raise forms.ValidationError(
+                'Почти такой же текст уже недавно публиковали.',
+            )
+        return text
+
+
+class PostForm(DuplicateTextMixin, forms.ModelForm):
     """Форма на основе модели поста."""
 
+    fingerprint_kind = TextFingerprint.POST
+
     class Meta:
         model = Post
         fields = ('text', 'group', 'image')
 
+    def save(self, commit: bool = True) -> Post:
+        """Сохраняет пост и ставит в очередь миниатюры нового изображения.
+
+        Задачи, порождённые сохранением, пишутся в той же транзакции.
+        """
+        with transaction.atomic():
+            post = super().save(commit)
+            if commit and post.image and 'image' in self.changed_data:
+                tasks.generate_thumbnails.enqueue(post.image.name)
+        return post
 
-class CommentForm(forms.ModelForm):
+
+class CommentForm(DuplicateTextMixin, forms.ModelForm):
     """Форма на основе модели комментария."""
 
+    fingerprint_kind = TextFingerprint.COMMENT
+
     class Meta:
         model = Comment
         fields = ('text',)
@@ -0,0 +1,247 @@
+import typing
+
+from django.core.cache import cache
+from django.http import HttpRequest
+
+from core.cache_tags import invalidate
+from posts.models import Comment, Follow, Group, Post, User
+
+INDEX_TAG = 'posts'
+
+TRENDING_TAG = 'trending'
+
+
+def group_tag(slug: str) -> str:
+    return f'group:{slug}'
+
+
+def group_pk_tag(pk: int) -> str:
+    return f'group_pk:{pk}'
+
+
+def profile_tag(username: str) -> str:
+    return f'profile:{username}'
+
+
+def post_tag(pk: int) -> str:
+    return f'post:{pk}'
+
+
+def follow_tag(user_id: int) -> str:
+    return f'follow:{user_id}'
+
+
+def author_tag(user_id: int) -> str:
+    return f'author:{user_id}'
+
+
+def author_posts_tag(user_id: int) -> str:
+    return f'author_posts:{user_id}'
+
+
+def related_tag(pk: int) -> str:
+    return f'related:{pk}'
+
+
+def suggestions_tag(user_id: int) -> str:
+    return f'suggestions:{user_id}'
+
+
+def _owner_key(pk: int) -> str:
+    return f'post_owner:{pk}'
+
+
+def _remember_owner(post: Post) -> None:
+    cache.set(_owner_key(post.pk), (post.author_id, post.group_id), None)
+
+
+def _post_owner(
+    pk: int,
+) -> typing.Optional[typing.Tuple[int, typing.Optional[int]]]:
+    """Возвращает автора и группу поста, читая базу только при промахе.
+
+    Запись обновляется при каждом сохранении поста, поэтому ответ 304
+    на странице поста обходится без запросов к базе.
+    """
+    owner = cache.get(_owner_key(pk))
+    if owner is None:
+        owner = (
+            Post.objects.filter(pk=pk)
+            .values_list('author_id', 'group_id')
+            .first()
+        )
+        if owner is not None:
+            cache.set(_owner_key(pk), tuple(owner), None)
+    return owner
+
+
+def index_tags(request: HttpRequest) -> typing.List[str]:
+    return [INDEX_TAG]
+
+
+def group_tags(request: HttpRequest, slug: str) -> typing.List[str]:
+    return [group_tag(slug)]
+
+
+def profile_tags(request: HttpRequest, username: str) -> typing.List[str]:
+    return [profile_tag(username)]
+
+
+def post_detail_tags(request: HttpRequest, pk: int) -> typing.List[str]:
+    """Теги страницы поста: сам пост, похожие посты, автор и группа.
+
+    Все теги строятся по ключам, поэтому имя автора и адрес группы
+    не читаются из базы.
+    """
+    tags = [post_tag(pk), related_tag(pk)]
+    owner = _post_owner(pk)
+    if owner is not None:
+        author_id, group_id = owner
+        tags.extend((author_tag(author_id), author_posts_tag(author_id)))
+        if group_id is not None:
+            tags.append(group_pk_tag(group_id))
+    return tags
+
+
+def comments_tags(request: HttpRequest, pk: int) -> typing.List[str]:
+    return [post_tag(pk)]
+
+
+def follow_tags(request: HttpRequest) -> typing.List[str]:
+    """Теги ленты подписок: подписки пользователя и посты его авторов.
+
+    Лента зависит от тегов авторов, поэтому пост сбрасывает один тег
+    автора, а не теги всех его подписчиков.
+    """
+    return [
+        follow_tag(request.user.pk),
+        *(
+            author_posts_tag(author_id)
+            for author_id in Follow.objects.filter(
+                user_id=request.user.pk,
+            ).values_list('author_id', flat=True)
+        ),
+    ]
+
+
+def personal_tags(request: HttpRequest) -> typing.List[str]:
+    """Теги персональных фрагментов: шапка, кнопка подписки, рекомендации.
+
+    Для анонимного пользователя фрагменты одинаковы у всех.
+    """
+    if not request.user.is_authenticated:
+        return []
+    pk = request.user.pk
+    return [author_tag(pk), follow_tag(pk), suggestions_tag(pk)]
+
+
+def trending_tags(request: HttpRequest) -> typing.List[str]:
+    # Посты главной страницы меняются вместе с популярными.
+    return [TRENDING_TAG, INDEX_TAG]
+
+
+def trending_changed() -> None:
+    invalidate(TRENDING_TAG)
+
+
+def related_changed(post_ids: typing.Iterable[int]) -> None:
+    invalidate(*(related_tag(pk) for pk in post_ids))
+
+
+def suggestions_changed(user_ids: typing.Iterable[int]) -> None:
+    invalidate(*(suggestions_tag(pk) for pk in user_ids))
+
+
+def post_changed(
+    post: Post,
+    previous_group_id: typing.Optional[int] = None,
+) -> None:
+    """Сбрасывает ленты и страницы, на которых показан пост.
+
+    Args:
+        post: Созданный, изменённый или удалённый пост.
+        previous_group_id: Группа поста до сохранения.
+    """
+    tags = [INDEX_TAG, post_tag(post.pk), profile_tag(post.author.username)]
+    group_ids = {post.group_id, previous_group_id} - {None}
+    if group_ids:
+        tags.extend(
+            group_tag(slug)
+            for slug in Group.objects.filter(pk__in=group_ids).values_list(
+                'slug',
+                flat=True,
+            )
+        )
+    tags.append(author_posts_tag(post.author_id))
+    invalidate(*tags)
+    _remember_owner(post)
+
+
+def author_posts_changed(author_id: int) -> None:
+    """Сбрасывает ленты подписок после отложенной рассылки поста."""
+    invalidate(author_posts_tag(author_id))
+
+
+def follow_feed_changed(user_id: int) -> None:
+    """Сбрасывает ленту подписок после отложенного заполнения."""
+    invalidate(follow_tag(user_id))
+
+
+def comment_changed(comment: Comment) -> None:
+    """Сбрасывает страницу поста и его карточку.
+
+    Ленты не сбрасываются: число комментариев в них обновится вместе
+    с истечением записи кэша страницы.
+
+    Args:
+        comment: Созданный, изменённый или удалённый комментарий.
+    """
+    invalidate(post_tag(comment.post_id))
+
+
+def follow_changed(follow: Follow) -> None:
+    """Сбрасывает ленту подписчика и профили со счётчиками подписок.
+
+    Args:
+        follow: Созданная или удалённая подписка.
+    """
+    invalidate(
+        follow_tag(follow.user_id),
+        *(
+            profile_tag(username)
+            for username in User.objects.filter(
+                pk__in=(follow.user_id, follow.author_id),
+            ).values_list('username', flat=True)
+        ),
+    )
+
+
+def user_changed(user: User) -> None:
+    """Сбрасывает карточки постов и профиль пользователя.
+
+    Args:
+        user: Изменённый пользователь.
+    """
+    invalidate(author_tag(user.pk), profile_tag(user.username))
+
+
+def group_changed(group: Group) -> None:
+    invalidate(group_tag(group.slug), group_pk_tag(group.pk))
+
+
+def group_slug_changing(group: Group) -> None:
+    """Сбрасывает страницы группы по прежнему адресу перед его сменой.
+
+    Args:
+        group: Сохраняемая группа.
+    """
+    if group.pk is None:
+        return
+    slug = (
+        Group.objects.filter(pk=group.pk)
+        .exclude(slug=group.slug)
+        .values_list('slug', flat=True)
+        .first()
+    )
+    if slug:
+        invalidate(group_tag(slug))
@@ -0,0 +1,41 @@
+from django.core.management import CommandError
+from django.core.management.base import BaseCommand, CommandParser
+from django.test.utils import override_settings
+
+from posts import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время выборки, рендера карточек и расход памяти ленты '
+        'из моделей Post и из облегчённых объектов PostRow.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        for name, default, help_text in (
+            ('limit', 100, 'Количество постов в выборке.'),
+            ('repeats', 20, 'Количество повторов замера времени.'),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=help_text,
+            )
+
+    def handle(self, *args, **options) -> None:
+        if options['repeats'] < 1:
+            raise CommandError('Нужен хотя бы один повтор.')
+        for name in benchmark.READ_PATHS:
+            with override_settings(DEBUG=False):
+                result = benchmark.run_read_path(
+                    name,
+                    limit=options['limit'],
+                    repeats=options['repeats'],
+                )
+            self.stdout.write(
+                f'{name}: '
+                + ', '.join(
+                    f'{metric}={value}' for metric, value in result.items()
+                ),
+            )
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import CommandError
+from django.core.management.base import BaseCommand, CommandParser
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from posts import benchmark
+from posts.models import Comment, Follow, Group, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку, число SQL-запросов и пик памяти представлений '
+        'posts на текущей базе и сохраняет результаты в JSON.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            'scenarios',
+            nargs='*',
+            help=(
+                'Сценарии для замера, по умолчанию все: '
+                + ', '.join(benchmark.SCENARIOS)
+            ),
+        )
+        for name, default, help_text in (
+            ('requests', 100, 'Количество замеряемых запросов сценария.'),
+            ('warmup', 10, 'Количество запросов до начала замеров.'),
+            ('memory-requests', 10, 'Количество запросов для замера памяти.'),
+            ('seed', 0, 'Зерно выбора объектов для запросов.'),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=help_text,
+            )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Очищать кэш перед каждым запросом.',
+        )
+        parser.add_argument(
+            '--output',
+            type=Path,
+            help='Файл результатов, по умолчанию в BENCHMARK_RESULTS_DIR.',
+        )
+        parser.add_argument(
+            '--compare',
+            type=Path,
+            help='Файл результатов предыдущего прогона для сравнения.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options['requests'] < 1:
+            raise CommandError('Нужен хотя бы один замеряемый запрос.')
+        unknown = set(options['scenarios']) - set(benchmark.SCENARIOS)
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {", ".join(unknown)}')
+        started = timezone.now()
+        sample = benchmark.Sample.load()
+        if not all(sample):
+            raise CommandError(
+                'Для замеров нужны посты, группы и подписки: '
+                'заполните базу командой generate_dataset.',
+            )
+        results = {}
+        for name in options['scenarios'] or benchmark.SCENARIOS:
+            # Панель отладки при DEBUG встраивается в каждый ответ и
+            # искажает замеры.
+            with override_settings(DEBUG=False):
+                results[name] = benchmark.run_scenario(
+                    name,
+                    sample,
+                    requests=options['requests'],
+                    warmup=options['warmup'],
+                    memory_requests=options['memory_requests'],
+                    cold=options['cold'],
+                    seed=options['seed'],
+                )
+            self.stdout.write(
+                f'{name}: '
+                + ', '.join(
+                    f'{metric}={value}'
+                    for metric, value in results[name].items()
+                ),
+            )
+        output = options['output'] or Path(
+            settings.BENCHMARK_RESULTS_DIR,
+            f'{started:%Y%m%d-%H%M%S}.json',
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(
+            json.dumps(
+                {
+                    'created': started.isoformat(),
+                    'options': {
+                        key: options[key]
+                        for key in ('requests', 'warmup', 'seed', 'cold')
+                    },
+                    'dataset': {
+                        model._meta.model_name: model.objects.count()
+                        for model in (User, Group, Post, Comment, Follow)
+                    },
+                    'results': results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Результаты: {output}'))
+        if options['compare']:
+            previous = json.loads(options['compare'].read_text())['results']
+            for line in benchmark.compare(previous, results):
+                self.stdout.write(line)
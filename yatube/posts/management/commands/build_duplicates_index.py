@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import duplicates
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает отпечатки SimHash всех постов и комментариев.'
+
+    def handle(self, *args, **options) -> None:
+        count = duplicates.build(settings.DUPLICATES_BATCH_SIZE)
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано {count} текстов.'),
+        )
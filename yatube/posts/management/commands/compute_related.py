@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from posts import related
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновляет похожие посты для постов, изменённых с прошлого '
+        'запуска. Запускается периодически, например из cron.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать похожие посты для всех постов.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        count = related.compute(full=options['full'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Похожие посты пересчитаны для {count}.'),
+        )
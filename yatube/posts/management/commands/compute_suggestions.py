@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts import suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации авторов по графу подписок. '
+        'Запускается периодически, например из cron.'
+    )
+
+    def handle(self, *args, **options) -> None:
+        count = suggestions.compute()
+        self.stdout.write(
+            self.style.SUCCESS(f'Сохранено {count} рекомендаций.'),
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг популярных постов. '
+        'Запускается периодически, например из cron.'
+    )
+
+    def handle(self, *args, **options) -> None:
+        count = trending.compute()
+        self.stdout.write(
+            self.style.SUCCESS(f'В популярном {count} постов.'),
+        )
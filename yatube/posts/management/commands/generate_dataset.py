@@ -0,0 +1,108 @@
+import os
+import typing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections, transaction
+
+from posts import counters, dataset, duplicates, timeline
+from posts.models import Follow
+
+
+def _in_order(
+    executor: ProcessPoolExecutor,
+    tasks: typing.Iterable[typing.Tuple[typing.Any, ...]],
+    function: typing.Callable,
+    window: int,
+) -> typing.Iterator[typing.Tuple[typing.Tuple[typing.Any, ...], typing.Any]]:
+    """Выполняет задачи в пуле, отдавая результаты в порядке задач.
+
+    Одновременно в работе не больше ``window`` задач, поэтому готовые
+    пачки не копятся в памяти, пока основной процесс пишет в базу.
+    """
+    pending: typing.List[typing.Tuple[typing.Tuple[typing.Any, ...], Future]]
+    pending = []
+    for task in tasks:
+        pending.append((task, executor.submit(function, *task)))
+        if len(pending) >= window:
+            task, future = pending.pop(0)
+            yield task, future.result()
+    for task, future in pending:
+        yield task, future.result()
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует большой воспроизводимый набор пользователей, групп, '
+        'постов, комментариев и подписок для нагрузочных тестов.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        for name, default, help_text in (
+            ('users', 10_000, 'Количество пользователей.'),
+            ('groups', 100, 'Количество групп.'),
+            ('posts', 100_000, 'Количество постов.'),
+            ('comments', 300_000, 'Количество комментариев.'),
+            ('follows', 200_000, 'Количество попыток подписки.'),
+            ('seed', 0, 'Зерно генератора случайных чисел.'),
+            ('days', 365, 'За сколько последних дней созданы посты.'),
+            ('chunk-size', 5_000, 'Количество строк в одной пачке.'),
+            ('workers', os.cpu_count(), 'Количество процессов-генераторов.'),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=help_text,
+            )
+        parser.add_argument(
+            '--password',
+            default='yatube',
+            help='Пароль всех созданных пользователей.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        plan = dataset.make_plan(
+            seed=options['seed'],
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            comments=options['comments'],
+            follows=options['follows'],
+            password=options['password'],
+            days=options['days'],
+        )
+        # Дочерние процессы не должны наследовать открытые соединения.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            for (_, model, offset, size), rows in _in_order(
+                executor,
+                (
+                    (plan, *chunk)
+                    for chunk in dataset.chunks(plan, options['chunk_size'])
+                ),
+                dataset.generate_chunk,
+                options['workers'] * 2,
+            ):
+                with transaction.atomic():
+                    model.objects.bulk_create(
+                        (model(**row) for row in rows),
+                        ignore_conflicts=model is Follow,
+                    )
+                    dataset.backdate(model, rows)
+                self.stdout.write(
+                    f'{model._meta.verbose_name_plural}: '
+                    f'{offset + size} строк',
+                )
+        # bulk_create не отправляет сигналы, поэтому производные данные
+        # пересчитываются целиком.
+        self.stdout.write(
+            'Пересчёт счётчиков, лент подписок и отпечатков текстов…',
+        )
+        counters.reconcile()
+        timeline.rebuild()
+        duplicates.build(settings.DUPLICATES_BATCH_SIZE)
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS('Набор данных создан.'))
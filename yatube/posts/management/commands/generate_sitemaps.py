@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from posts import sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновляет файлы карты сайта, перезаписывая только части, '
+        'строки которых изменились.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Перезаписать все части карты сайта.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        stats = sitemaps.build(
+            settings.SITEMAP_ROOT,
+            settings.SITE_URL,
+            settings.SITEMAP_CHUNK_SIZE,
+            settings.SITEMAP_BATCH_SIZE,
+            full=options['full'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Частей записано: {stats["written"]}, '
+                f'без изменений: {stats["unchanged"]}, '
+                f'удалено: {stats["removed"]}.',
+            ),
+        )
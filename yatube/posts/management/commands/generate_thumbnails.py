@@ -0,0 +1,51 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+
+from posts import thumbnails
+from posts.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+def generate(name: str) -> bool:
+    try:
+        thumbnails.generate(name)
+    except Exception:
+        logger.exception('Не удалось создать миниатюры для %s', name)
+        return False
+    return True
+
+
+class Command(BaseCommand):
+    help = 'Создаёт миниатюры изображений всех постов на всех ядрах.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Количество процессов, создающих миниатюры.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        names = list(
+            Post.objects.exclude(image='')
+            .order_by()
+            .values_list('image', flat=True)
+            .distinct(),
+        )
+        # Дочерние процессы не должны наследовать открытые соединения.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            generated = sum(
+                executor.map(generate, names, chunksize=16),
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Обработано изображений: {generated} из {len(names)}.',
+            ),
+        )
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from posts import counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов, подписок и комментариев.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.COUNTERS_BATCH_SIZE,
+            help='Количество строк, проверяемых одним запросом.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        for counter, fixed in counters.reconcile(
+            options['batch_size'],
+        ).items():
+            self.stdout.write(f'{counter}: исправлено {fixed}')
@@ -0,0 +1,64 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0015_alter_comment_text_alter_post_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(verbose_name="дата публикации"),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline",
+                        to="posts.Post",
+                        verbose_name="пост",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "default_related_name": "timeline",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="timelineentry",
+            index=models.Index(
+                fields=["user", "-created"], name="timeline_user_created_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="timelineentry",
+            unique_together={("user", "post")},
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=models.PositiveIntegerField(),
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    UserStats = apps.get_model("posts", "UserStats")
+    Post = apps.get_model("posts", "Post")
+    Comment = apps.get_model("posts", "Comment")
+    Follow = apps.get_model("posts", "Follow")
+    Group = apps.get_model("posts", "Group")
+    UserStats.objects.bulk_create(
+        [
+            UserStats(user_id=pk)
+            for pk in User.objects.values_list("pk", flat=True)
+        ],
+        batch_size=1000,
+    )
+    UserStats.objects.update(
+        post_count=count(Post, "author"),
+        follower_count=count(Follow, "author"),
+        following_count=count(Follow, "user"),
+    )
+    Group.objects.update(post_count=count(Post, "group"))
+    Post.objects.update(comment_count=count(Comment, "post"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0011_update_proxy_permissions"),
+        ("posts", "0016_timelineentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="пользователь",
+                    ),
+                ),
+                (
+                    "post_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="количество постов"
+                    ),
+                ),
+                (
+                    "follower_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="количество подписчиков"
+                    ),
+                ),
+                (
+                    "following_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="количество подписок"
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="group",
+            name="post_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="количество постов"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name="количество комментариев",
+            ),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=models.PositiveIntegerField(),
+        ),
+        0,
+    )
+
+
+def remove_duplicate_follows(apps, schema_editor):
+    Follow = apps.get_model("posts", "Follow")
+    UserStats = apps.get_model("posts", "UserStats")
+    keep = (
+        Follow.objects.order_by()
+        .values("user", "author")
+        .annotate(first=Min("pk"))
+        .values_list("first", flat=True)
+    )
+    deleted, _ = Follow.objects.exclude(pk__in=list(keep)).delete()
+    if deleted:
+        UserStats.objects.update(
+            follower_count=count(Follow, "author"),
+            following_count=count(Follow, "user"),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0017_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_follows,
+            migrations.RunPython.noop,
+        ),
+        migrations.RemoveIndex(
+            model_name="timelineentry",
+            name="timeline_user_created_idx",
+        ),
+        migrations.AlterUniqueTogether(
+            name="follow",
+            unique_together={("user", "author")},
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "-created", "-id"],
+                name="comment_post_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["group", "-created", "-id"],
+                name="post_group_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created", "-id"],
+                name="post_author_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timelineentry",
+            index=models.Index(
+                fields=["user", "-created", "-id"],
+                name="timeline_user_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0018_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="view_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="количество просмотров"
+            ),
+        ),
+    ]
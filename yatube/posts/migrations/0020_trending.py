@@ -0,0 +1,52 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0019_post_view_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendingPost",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending",
+                        serialize=False,
+                        to="posts.Post",
+                        verbose_name="пост",
+                    ),
+                ),
+                (
+                    "rank",
+                    models.PositiveIntegerField(
+                        unique=True, verbose_name="место"
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="рейтинг")),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="follow",
+            name="created",
+            field=models.DateTimeField(
+                auto_now_add=True, null=True, verbose_name="дата подписки"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["author", "created"], name="follow_author_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0020_trending"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SuggestedAuthor",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "rank",
+                    models.PositiveSmallIntegerField(verbose_name="место"),
+                ),
+                ("score", models.FloatField(verbose_name="рейтинг")),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="автор",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="suggested_authors",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="пользователь",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="suggestedauthor",
+            index=models.Index(
+                fields=["user", "rank"], name="suggestion_user_rank_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="suggestedauthor",
+            unique_together={("user", "author")},
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0021_suggested_authors"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "rank",
+                    models.PositiveSmallIntegerField(verbose_name="место"),
+                ),
+                ("score", models.FloatField(verbose_name="сходство")),
+                (
+                    "computed",
+                    models.DateTimeField(verbose_name="дата расчёта"),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="posts.Post",
+                        verbose_name="пост",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="posts.Post",
+                        verbose_name="похожий пост",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="relatedpost",
+            index=models.Index(
+                fields=["post", "rank"], name="related_post_rank_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="relatedpost",
+            index=models.Index(
+                fields=["computed"], name="related_computed_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="relatedpost",
+            unique_together={("post", "related")},
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0022_related_posts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TextFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("post", "пост"), ("comment", "комментарий")],
+                        max_length=10,
+                        verbose_name="тип",
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveIntegerField(verbose_name="id записи"),
+                ),
+                ("simhash", models.BigIntegerField(verbose_name="отпечаток")),
+                ("band_0", models.PositiveIntegerField(db_index=True)),
+                ("band_1", models.PositiveIntegerField(db_index=True)),
+                ("band_2", models.PositiveIntegerField(db_index=True)),
+                ("band_3", models.PositiveIntegerField(db_index=True)),
+                (
+                    "created",
+                    models.DateTimeField(verbose_name="дата публикации"),
+                ),
+            ],
+            options={
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+    ]
@@ -15,6 +15,11 @@ class Group(DefaultModel):
     )
     slug = models.SlugField(unique=True, verbose_name='путь')
     description = models.TextField(verbose_name='описание')
+    post_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='количество постов',
+    )
 
     def __str__(self) -> str:
         return self.title
@@ -37,10 +42,30 @@ class Post(TextModel):
         upload_to='posts/',
         blank=True,
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='количество комментариев',
+    )
+    view_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='количество просмотров',
+    )
 
     class Meta:
         ordering = ('-created',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('group', '-created', '-id'),
+                name='post_group_created_idx',
+            ),
+            models.Index(
+                fields=('author', '-created', '-id'),
+                name='post_author_created_idx',
+            ),
+        )
 
 
 class Comment(TextModel):
@@ -55,6 +80,12 @@ class Comment(TextModel):
     class Meta:
         ordering = ('-created',)
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', '-created', '-id'),
+                name='comment_post_created_idx',
+            ),
+        )
 
 
 class Follow(DefaultModel):
@@ -72,6 +103,196 @@ class Follow(DefaultModel):
         related_name='following',
         on_delete=models.CASCADE,
     )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        null=True,
+        verbose_name='дата подписки',
+    )
+
+    class Meta:
+        unique_together = ('user', 'author')
+        indexes = (
+            models.Index(
+                fields=('author', 'created'),
+                name='follow_author_created_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return f'подписка {self.user} на {self.author}'
+
+
+class UserStats(DefaultModel):
+    """Модель счётчиков пользователя."""
+
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        verbose_name='пользователь',
+        related_name='stats',
+        on_delete=models.CASCADE,
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='количество постов',
+    )
+    follower_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='количество подписчиков',
+    )
+    following_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='количество подписок',
+    )
+
+    def __str__(self) -> str:
+        return f'счётчики {self.user}'
+
+
+class TimelineEntry(DefaultModel):
+    """Модель записи ленты подписок пользователя."""
+
+    user = models.ForeignKey(
+        User,
+        verbose_name='пользователь',
+        on_delete=models.CASCADE,
+    )
+    post = models.ForeignKey(
+        Post,
+        verbose_name='пост',
+        on_delete=models.CASCADE,
+    )
+    created = models.DateTimeField(verbose_name='дата публикации')
+
+    class Meta:
+        default_related_name = 'timeline'
+        unique_together = ('user', 'post')
+        indexes = (
+            models.Index(
+                fields=('user', '-created', '-id'),
+                name='timeline_user_created_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'пост {self.post_id} в ленте {self.user}'
+
+
+class TrendingPost(DefaultModel):
+    """Модель места поста в популярном.
+
+    Таблицу целиком пересчитывает команда ``compute_trending``.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        verbose_name='пост',
+        related_name='trending',
+        on_delete=models.CASCADE,
+    )
+    rank = models.PositiveIntegerField(unique=True, verbose_name='место')
+    score = models.FloatField(verbose_name='рейтинг')
+
+    def __str__(self) -> str:
+        return f'пост {self.post_id} на {self.rank} месте'
+
+
+class SuggestedAuthor(DefaultModel):
+    """Модель автора, рекомендованного пользователю.
+
+    Таблицу пересчитывает команда ``compute_suggestions``.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name='пользователь',
+        related_name='suggested_authors',
+        on_delete=models.CASCADE,
+    )
+    author = models.ForeignKey(
+        User,
+        verbose_name='автор',
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name='место')
+    score = models.FloatField(verbose_name='рейтинг')
+
+    class Meta:
+        unique_together = ('user', 'author')
+        indexes = (
+            models.Index(
+                fields=('user', 'rank'),
+                name='suggestion_user_rank_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.author} для {self.user}'
+
+
+class RelatedPost(DefaultModel):
+    """Модель поста, похожего на данный.
+
+    Таблицу пополняет команда ``compute_related``.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        verbose_name='пост',
+        related_name='related_links',
+        on_delete=models.CASCADE,
+    )
+    related = models.ForeignKey(
+        Post,
+        verbose_name='похожий пост',
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name='место')
+    score = models.FloatField(verbose_name='сходство')
+    computed = models.DateTimeField(verbose_name='дата расчёта')
+
+    class Meta:
+        unique_together = ('post', 'related')
+        indexes = (
+            models.Index(
+                fields=('post', 'rank'),
+                name='related_post_rank_idx',
+            ),
+            models.Index(fields=('computed',), name='related_computed_idx'),
+        )
+
+    def __str__(self) -> str:
+        return f'пост {self.related_id} для поста {self.post_id}'
+
+
+class TextFingerprint(DefaultModel):
+    """Модель отпечатка SimHash текста поста или комментария.
+
+    64-битный отпечаток дополнительно хранится четырьмя 16-битными
+    полосами с отдельными индексами для поиска похожих текстов.
+    """
+
+    POST = 'post'
+    COMMENT = 'comment'
+    KINDS = (
+        (POST, 'пост'),
+        (COMMENT, 'комментарий'),
+    )
+
+    kind = models.CharField(max_length=10, choices=KINDS, verbose_name='тип')
+    object_id = models.PositiveIntegerField(verbose_name='id записи')
+    simhash = models.BigIntegerField(verbose_name='отпечаток')
+    band_0 = models.PositiveIntegerField(db_index=True)
+    band_1 = models.PositiveIntegerField(db_index=True)
+    band_2 = models.PositiveIntegerField(db_index=True)
+    band_3 = models.PositiveIntegerField(db_index=True)
+    created = models.DateTimeField(verbose_name='дата публикации')
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self) -> str:
+        return f'отпечаток {self.kind} {self.object_id}'
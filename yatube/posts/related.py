@@ -0,0 +1,234 @@
+import collections
+import heapq
+import math
+import multiprocessing
+import re
+import typing
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from posts import invalidation
+from posts.models import Post, RelatedPost
+
+TOKEN = re.compile(r'[^\W\d_]{3,}')
+
+# Разреженный вектор: номер термина -> вес.
+Vector = typing.Dict[int, float]
+
+Neighbours = typing.List[typing.Tuple[float, int]]
+
+
+class Index(typing.NamedTuple):
+    """TF-IDF векторы постов и обратный индекс по терминам.
+
+    Векторы — строки разреженной матрицы постов, ``postings`` — её
+    столбцы. Произведение блока строк на матрицу, то есть сходство
+    постов блока со всеми постами, считается обходом только тех
+    столбцов, где у строк есть ненулевые веса.
+    """
+
+    ids: typing.List[int]
+    vectors: typing.List[Vector]
+    postings: typing.Dict[int, typing.List[typing.Tuple[int, float]]]
+
+    def rows(self, post_ids: typing.Iterable[int]) -> typing.List[int]:
+        positions = {pk: row for row, pk in enumerate(self.ids)}
+        return sorted(positions[pk] for pk in post_ids if pk in positions)
+
+
+def tokens(text: str) -> typing.List[str]:
+    return TOKEN.findall(text.lower())
+
+
+def build_index() -> Index:
+    """Строит TF-IDF векторы всех постов.
+
+    Вес термина — ``(1 + ln tf) * ln(N / df)``. Термины одного поста
+    и слишком частые термины не связывают посты и отбрасываются; у поста
+    остаются ``RELATED_TERMS`` самых весомых терминов. Векторы
+    нормируются, поэтому скалярное произведение — косинусное сходство.
+
+    Returns:
+        Индекс постов.
+    """
+    vocabulary: typing.Dict[str, int] = {}
+    ids = []
+    counts = []
+    frequency: typing.Counter[int] = collections.Counter()
+    for pk, text in Post.objects.order_by('pk').values_list('pk', 'text'):
+        terms = collections.Counter(
+            vocabulary.setdefault(token, len(vocabulary))
+            for token in tokens(text)
+        )
+        ids.append(pk)
+        counts.append(terms)
+        frequency.update(terms.keys())
+    total = len(ids)
+    max_frequency = settings.RELATED_MAX_DF * total
+    vectors = []
+    postings = collections.defaultdict(list)
+    for row, terms in enumerate(counts):
+        weights = heapq.nlargest(
+            settings.RELATED_TERMS,
+            (
+                (
+                    (1 + math.log(count)) * math.log(total / frequency[term]),
+                    term,
+                )
+                for term, count in terms.items()
+                if 1 < frequency[term] <= max_frequency
+            ),
+        )
+        norm = math.sqrt(sum(weight**2 for weight, _ in weights))
+        vector = {term: weight / norm for weight, term in weights if norm}
+        vectors.append(vector)
+        for term, weight in vector.items():
+            postings[term].append((row, weight))
+    return Index(ids, vectors, dict(postings))
+
+
+# Индекс для процессов пула: наследуется при fork, а не передаётся.
+_index: typing.Optional[Index] = None
+
+
+def neighbours(
+    rows: typing.List[int],
+) -> typing.List[typing.Tuple[int, Neighbours]]:
+    """Находит ближайшие посты для блока строк индекса.
+
+    Args:
+        rows: Строки индекса.
+
+    Returns:
+        Пары id поста и его ближайших постов с их сходством.
+    """
+    index = _index
+    limit = settings.RELATED_SIZE
+    threshold = settings.RELATED_MIN_SCORE
+    result = []
+    for row in rows:
+        scores: typing.DefaultDict[int, float] = collections.defaultdict(
+            float,
+        )
+        for term, weight in index.vectors[row].items():
+            for other, other_weight in index.postings[term]:
+                scores[other] += weight * other_weight
+        scores.pop(row, None)
+        result.append(
+            (
+                index.ids[row],
+                heapq.nlargest(
+                    limit,
+                    (
+                        (score, index.ids[other])
+                        for other, score in scores.items()
+                        if score >= threshold
+                    ),
+                ),
+            ),
+        )
+    return result
+
+
+def _blocks(rows: typing.List[int]) -> typing.List[typing.List[int]]:
+    size = settings.RELATED_BLOCK_SIZE
+    blocks = []
+    for start in range(0, len(rows), size):
+        end = start + size
+        blocks.append(rows[start:end])
+    return blocks
+
+
+def _map(
+    blocks: typing.List[typing.List[int]],
+) -> typing.Iterator[typing.List[typing.Tuple[int, Neighbours]]]:
+    processes = settings.RELATED_PROCESSES
+    if processes <= 1 or len(blocks) <= 1:
+        yield from map(neighbours, blocks)
+        return
+    # Соединения с базой не должны достаться дочерним процессам.
+    connections.close_all()
+    with multiprocessing.get_context('fork').Pool(processes) as pool:
+        yield from pool.imap(neighbours, blocks)
+
+
+def _save(
+    results: typing.List[typing.Tuple[int, Neighbours]],
+    computed: typing.Any,
+) -> None:
+    with transaction.atomic():
+        RelatedPost.objects.filter(
+            post_id__in=[pk for pk, _ in results],
+        ).delete()
+        RelatedPost.objects.bulk_create(
+            RelatedPost(
+                post_id=pk,
+                related_id=related_id,
+                rank=rank,
+                score=score,
+                computed=computed,
+            )
+            for pk, found in results
+            for rank, (score, related_id) in enumerate(found, start=1)
+        )
+
+
+def compute(full: bool = False) -> int:
+    """Обновляет похожие посты.
+
+    Без ``full`` пересчитываются только посты, созданные или изменённые
+    после прошлого расчёта, посты, у которых они были в похожих, и их
+    новые соседи. Блоки постов обрабатываются в ``RELATED_PROCESSES``
+    процессах.
+
+    Args:
+        full: Пересчитать все посты.
+
+    Returns:
+        Количество пересчитанных постов.
+    """
+    global _index
+    started = timezone.now()
+    since = (
+        None
+        if full
+        else RelatedPost.objects.aggregate(last=Max('computed'))['last']
+    )
+    _index = index = build_index()
+    if since is None:
+        pending = set(index.ids)
+    else:
+        changed = Post.objects.filter(
+            Q(created__gte=since) | Q(modified__gte=since),
+        ).values('pk')
+        pending = set(changed.values_list('pk', flat=True)) | set(
+            RelatedPost.objects.filter(related__in=changed).values_list(
+                'post_id',
+                flat=True,
+            ),
+        )
+    done: typing.Set[int] = set()
+    first_pass = since is not None
+    try:
+        while pending:
+            rows = index.rows(pending)
+            done |= pending
+            pending = set()
+            for results in _map(_blocks(rows)):
+                _save(results, started)
+                invalidation.related_changed(pk for pk, _ in results)
+                if first_pass:
+                    # Изменённый пост может войти в похожие у своих соседей.
+                    pending.update(
+                        related_id
+                        for _, found in results
+                        for _, related_id in found
+                    )
+            pending -= done
+            first_pass = False
+    finally:
+        _index = None
+    return len(done)
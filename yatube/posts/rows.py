@@ -0,0 +1,174 @@
+import datetime
+import typing
+
+from django.db.models.query import QuerySet, ValuesListIterable
+
+
+class AuthorRow:
+    """Автор поста в ленте: только поля, которые выводит карточка."""
+
+    __slots__ = ('id', 'username', 'first_name', 'last_name')
+
+    def __init__(
+        self,
+        id: int,
+        username: str,
+        first_name: str,
+        last_name: str,
+    ) -> None:
+        self.id = id
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    def get_full_name(self) -> str:
+        return f'{self.first_name} {self.last_name}'.strip()
+
+    def __str__(self) -> str:
+        return self.username
+
+
+class PostRow:
+    """Пост в ленте без экземпляров моделей.
+
+    Повторяет атрибуты ``Post``, которые читают карточка ``post.html``,
+    ключи кэша карточек и курсорная пагинация.
+    """
+
+    __slots__ = (
+        'id',
+        'text',
+        'created',
+        'modified',
+        'image',
+        'comment_count',
+        'view_count',
+        'group_id',
+        'author',
+    )
+
+    COLUMNS = (
+        'id',
+        'text',
+        'created',
+        'modified',
+        'image',
+        'comment_count',
+        'view_count',
+        'group_id',
+        'author_id',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+    )
+
+    def __init__(
+        self,
+        id: int,
+        text: str,
+        created: datetime.datetime,
+        modified: typing.Optional[datetime.datetime],
+        image: str,
+        comment_count: int,
+        view_count: int,
+        group_id: typing.Optional[int],
+        author_id: int,
+        username: str,
+        first_name: str,
+        last_name: str,
+    ) -> None:
+        self.id = id
+        self.text = text
+        self.created = created
+        self.modified = modified
+        self.image = image
+        self.comment_count = comment_count
+        self.view_count = view_count
+        self.group_id = group_id
+        self.author = AuthorRow(author_id, username, first_name, last_name)
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    @property
+    def author_id(self) -> int:
+        return self.author.id
+
+
+class PostRowIterable(ValuesListIterable):
+    def __iter__(self) -> typing.Iterator[PostRow]:
+        for row in super().__iter__():
+            yield PostRow(*row)
+
+
+def post_rows(queryset: QuerySet) -> QuerySet:
+    """Превращает выборку постов в выборку ``PostRow``.
+
+    Из базы читаются только столбцы ``PostRow.COLUMNS``. Результат
+    остаётся ``QuerySet``, поэтому его можно фильтровать, сортировать
+    и разбивать на страницы как обычную выборку постов.
+
+    Args:
+        queryset: Выборка постов.
+
+    Returns:
+        Выборка, при итерации отдающая ``PostRow``.
+    """
+    rows = queryset.values_list(*PostRow.COLUMNS)
+    rows._iterable_class = PostRowIterable
+    return rows
+
+
+class TimelineRow:
+    """Запись ленты подписок с постом в виде ``PostRow``.
+
+    Курсор ленты строится по полям самой записи, поэтому страница
+    читается диапазоном индекса ``(user, created, id)`` ленты.
+    """
+
+    __slots__ = ('id', 'created', 'post')
+
+    COLUMNS = (
+        'id',
+        'created',
+        *(f'post__{column}' for column in PostRow.COLUMNS),
+    )
+
+    def __init__(
+        self,
+        id: int,
+        created: datetime.datetime,
+        *post: typing.Any,
+    ) -> None:
+        self.id = id
+        self.created = created
+        self.post = PostRow(*post)
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+
+class TimelineRowIterable(ValuesListIterable):
+    def __iter__(self) -> typing.Iterator[TimelineRow]:
+        for row in super().__iter__():
+            yield TimelineRow(*row)
+
+
+def timeline_rows(queryset: QuerySet) -> QuerySet:
+    """Превращает выборку записей ленты в выборку ``TimelineRow``.
+
+    Args:
+        queryset: Выборка записей ``TimelineEntry``.
+
+    Returns:
+        Выборка, при итерации отдающая ``TimelineRow``.
+    """
+    rows = queryset.values_list(*TimelineRow.COLUMNS)
+    rows._iterable_class = TimelineRowIterable
+    return rows
@@ -0,0 +1,7 @@
+from core.search import FullTextIndex
+from posts.models import Comment, Post
+
+POSTS = FullTextIndex(Post)
+COMMENTS = FullTextIndex(Comment)
+
+INDEXES = (POSTS, COMMENTS)
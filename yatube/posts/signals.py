@@ -0,0 +1,194 @@
+import threading
+import typing
+
+from django.apps import AppConfig
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from core.tiered_cache import tiered_cache
+from posts import (
+    counters,
+    duplicates,
+    invalidation,
+    search,
+    suggestions,
+    tasks,
+    thumbnails,
+    timeline,
+    view_counts,
+)
+from posts.models import Comment, Follow, Group, Post, TextFingerprint, User
+
+# Посты, удаляемые в текущем потоке: их комментарии удаляются каскадом,
+# и всё производное от комментариев убирается вместе с постом.
+_deleting = threading.local()
+
+
+def _deleting_posts() -> typing.Set[int]:
+    if not hasattr(_deleting, 'posts'):
+        _deleting.posts = set()
+    return _deleting.posts
+
+
+@receiver(post_save, sender=User)
+def user_created(
+    sender: type,
+    instance: User,
+    created: bool,
+    update_fields: typing.Optional[typing.FrozenSet[str]],
+    **kwargs,
+) -> None:
+    if created:
+        counters.user_created(instance)
+    elif update_fields != {'last_login'}:
+        # Вход пользователя сохраняет только время входа, а оно
+        # на страницах не показывается.
+        invalidation.user_changed(instance)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender: type, instance: Post, **kwargs) -> None:
+    instance._previous_group_id = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('group_id', flat=True)
+        .first()
+        if instance.pk is not None
+        else None
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(
+    sender: type,
+    instance: Post,
+    created: bool,
+    **kwargs,
+) -> None:
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if created:
+        tasks.fan_out(instance)
+        counters.post_created(instance)
+    else:
+        counters.post_moved(instance, previous_group_id)
+    duplicates.index(TextFingerprint.POST, instance)
+    invalidation.post_changed(instance, previous_group_id)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender: type, instance: Post, **kwargs) -> None:
+    _deleting_posts().add(instance.pk)
+    duplicates.unindex_comments(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender: type, instance: Post, **kwargs) -> None:
+    _deleting_posts().discard(instance.pk)
+    counters.post_deleted(instance)
+    duplicates.unindex(TextFingerprint.POST, instance)
+    invalidation.post_changed(instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(
+    sender: type,
+    instance: Comment,
+    created: bool,
+    **kwargs,
+) -> None:
+    if created:
+        counters.comment_created(instance)
+    duplicates.index(TextFingerprint.COMMENT, instance)
+    invalidation.comment_changed(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender: type, instance: Comment, **kwargs) -> None:
+    if instance.post_id in _deleting_posts():
+        return
+    counters.comment_deleted(instance)
+    duplicates.unindex(TextFingerprint.COMMENT, instance)
+    invalidation.comment_changed(instance)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(
+    sender: type,
+    instance: Follow,
+    created: bool,
+    **kwargs,
+) -> None:
+    if created:
+        tasks.backfill(instance)
+        counters.follow_created(instance)
+        suggestions.followed(instance)
+    invalidation.follow_changed(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender: type, instance: Follow, **kwargs) -> None:
+    timeline.trim(instance)
+    counters.follow_deleted(instance)
+    invalidation.follow_changed(instance)
+
+
+@receiver(pre_save, sender=Group)
+def group_saving(sender: type, instance: Group, **kwargs) -> None:
+    invalidation.group_slug_changing(instance)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender: type, instance: Group, **kwargs) -> None:
+    invalidation.group_changed(instance)
+
+
+@receiver(connection_created)
+def database_functions_installed(
+    sender: type,
+    connection: BaseDatabaseWrapper,
+    **kwargs,
+) -> None:
+    duplicates.install(connection)
+
+
+@receiver(post_migrate)
+def search_indexes_installed(
+    sender: AppConfig,
+    using: str,
+    **kwargs,
+) -> None:
+    if sender.name == 'posts':
+        for index in search.INDEXES:
+            index.install(connections[using])
+
+
+@receiver(post_migrate)
+def cache_cleared(sender: AppConfig, **kwargs) -> None:
+    # Кэш хранится вне процесса и переживает пересоздание базы, в том
+    # числе тестовой: записи о прежних строках нужно сбросить.
+    if sender.name == 'posts':
+        cache.clear()
+        tiered_cache.clear_local()
+
+
+@receiver(request_started)
+def request_started_handler(sender: type, **kwargs) -> None:
+    thumbnails.start_request()
+
+
+@receiver(request_finished)
+def request_finished_handler(sender: type, **kwargs) -> None:
+    for name in thumbnails.finish_request():
+        tasks.generate_thumbnails.enqueue(name)
+    view_counts.flush_due()
@@ -0,0 +1,323 @@
+import datetime
+import hashlib
+import json
+import os
+import typing
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.db.models import Count, Max, Q
+from django.db.models.query import QuerySet
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+INDEX_NAME = 'sitemap.xml'
+
+MANIFEST_NAME = 'manifest.json'
+
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+
+URLSET_CLOSE = '</urlset>\n'
+
+INDEX_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+
+INDEX_CLOSE = '</sitemapindex>\n'
+
+# Строка выборки раздела: ключ, аргумент адреса, даты создания и правки.
+Row = typing.Tuple[
+    int,
+    typing.Any,
+    typing.Optional[datetime.datetime],
+    typing.Optional[datetime.datetime],
+]
+
+
+class Section(typing.NamedTuple):
+    """Раздел карты сайта, разбитый на части по диапазонам ключей."""
+
+    name: str
+    model: typing.Type
+    url_name: str
+    rows: typing.Callable[[], QuerySet]
+    fingerprint: typing.Callable[[Q], typing.Dict[str, typing.Any]]
+
+
+def _post_rows() -> QuerySet:
+    return Post.objects.values_list('pk', 'pk', 'created', 'modified')
+
+
+def _post_fingerprint(keys: Q) -> typing.Dict[str, typing.Any]:
+    return Post.objects.filter(keys).aggregate(
+        count=Count('pk'),
+        created=Max('created'),
+        modified=Max('modified'),
+    )
+
+
+def _url_digest(rows: QuerySet) -> str:
+    """Хеш ключей и адресных полей части.
+
+    Переименование пользователя или группы меняет адреса части, не
+    трогая ни числа строк, ни дат постов, поэтому попадает в отпечаток
+    только через этот хеш.
+    """
+    digest = hashlib.md5()
+    for pk, value in rows.order_by('pk').iterator():
+        digest.update(f'{pk}:{value}\n'.encode())
+    return digest.hexdigest()
+
+
+def _profile_rows() -> QuerySet:
+    return (
+        User.objects.annotate(
+            created=Max('posts__created'),
+            modified=Max('posts__modified'),
+        )
+        .filter(created__isnull=False)
+        .values_list('pk', 'username', 'created', 'modified')
+    )
+
+
+def _profile_fingerprint(keys: Q) -> typing.Dict[str, typing.Any]:
+    return {
+        'users': _url_digest(
+            User.objects.filter(keys).values_list('pk', 'username'),
+        ),
+        **Post.objects.filter(
+            author__in=User.objects.filter(keys).values('pk'),
+        ).aggregate(
+            count=Count('pk'),
+            created=Max('created'),
+            modified=Max('modified'),
+        ),
+    }
+
+
+def _group_rows() -> QuerySet:
+    return (
+        Group.objects.annotate(
+            created=Max('posts__created'),
+            modified=Max('posts__modified'),
+        )
+        .filter(created__isnull=False)
+        .values_list('pk', 'slug', 'created', 'modified')
+    )
+
+
+def _group_fingerprint(keys: Q) -> typing.Dict[str, typing.Any]:
+    return {
+        'groups': _url_digest(
+            Group.objects.filter(keys).values_list('pk', 'slug'),
+        ),
+        **Post.objects.filter(
+            group__in=Group.objects.filter(keys).values('pk'),
+        ).aggregate(
+            count=Count('pk'),
+            created=Max('created'),
+            modified=Max('modified'),
+        ),
+    }
+
+
+SECTIONS = (
+    Section(
+        'posts',
+        Post,
+        'posts:post_detail',
+        _post_rows,
+        _post_fingerprint,
+    ),
+    Section(
+        'profiles',
+        User,
+        'posts:profile',
+        _profile_rows,
+        _profile_fingerprint,
+    ),
+    Section(
+        'groups',
+        Group,
+        'posts:group_list',
+        _group_rows,
+        _group_fingerprint,
+    ),
+)
+
+
+def chunk_name(section: str, number: int) -> str:
+    return f'sitemap-{section}-{number}.xml'
+
+
+def _keys(number: int, chunk_size: int) -> Q:
+    """Диапазон ключей части: у части постоянные границы, поэтому
+    добавление и удаление записей затрагивает только её."""
+    return Q(
+        pk__gt=number * chunk_size,
+        pk__lte=(number + 1) * chunk_size,
+    )
+
+
+def _iterate(
+    rows: QuerySet,
+    keys: Q,
+    batch_size: int,
+) -> typing.Iterator[Row]:
+    """Перебирает строки части пачками по ключу, без OFFSET."""
+    last = 0
+    while True:
+        batch = list(
+            rows.filter(keys, pk__gt=last).order_by('pk')[:batch_size],
+        )
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        last = batch[-1][0]
+
+
+def _lastmod(row: Row) -> typing.Optional[datetime.datetime]:
+    dates = [date for date in row[2:] if date is not None]
+    return max(dates) if dates else None
+
+
+def _write_atomic(path: Path, chunks: typing.Iterable[str]) -> None:
+    temporary = path.with_name(f'.{path.name}.tmp')
+    with temporary.open('w', encoding='utf-8') as file:
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(temporary, path)
+
+
+def _url(loc: str, lastmod: typing.Optional[datetime.datetime]) -> str:
+    if lastmod is None:
+        return f'<url><loc>{escape(loc)}</loc></url>\n'
+    return (
+        f'<url><loc>{escape(loc)}</loc>'
+        f'<lastmod>{lastmod.date().isoformat()}</lastmod></url>\n'
+    )
+
+
+def _write_chunk(
+    path: Path,
+    section: Section,
+    keys: Q,
+    base_url: str,
+    batch_size: int,
+) -> typing.Tuple[int, typing.Optional[datetime.datetime]]:
+    """Пишет часть раздела и возвращает число адресов и последнюю правку."""
+    count = 0
+    latest = None
+
+    def lines() -> typing.Iterator[str]:
+        nonlocal count, latest
+        yield URLSET_OPEN
+        for row in _iterate(section.rows(), keys, batch_size):
+            lastmod = _lastmod(row)
+            if lastmod is not None and (latest is None or lastmod > latest):
+                latest = lastmod
+            count += 1
+            yield _url(
+                base_url + reverse(section.url_name, args=(row[1],)),
+                lastmod,
+            )
+        yield URLSET_CLOSE
+
+    _write_atomic(path, lines())
+    return count, latest
+
+
+def build(
+    root: Path,
+    base_url: str,
+    chunk_size: int,
+    batch_size: int,
+    full: bool = False,
+) -> typing.Dict[str, int]:
+    """Обновляет файлы карты сайта в каталоге ``root``.
+
+    Каждая часть раздела покрывает постоянный диапазон ключей размером
+    ``chunk_size``. Для части считается отпечаток (число строк, даты
+    последних изменений и хеш адресов профилей и групп); часть
+    перезаписывается, только если отпечаток
+    отличается от сохранённого в ``manifest.json``. Индекс пишется
+    заново всегда.
+
+    Args:
+        root: Каталог файлов карты сайта.
+        base_url: Схема и домен сайта для абсолютных адресов.
+        chunk_size: Наибольшее число адресов в части.
+        batch_size: Сколько строк читать из базы за один запрос.
+        full: Перезаписать все части независимо от отпечатков.
+
+    Returns:
+        Количество перезаписанных, неизменных и удалённых частей.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / MANIFEST_NAME
+    manifest = (
+        {}
+        if full or not manifest_path.exists()
+        else json.loads(manifest_path.read_text())
+    )
+    updated = {}
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for section in SECTIONS:
+        last_pk = section.model.objects.aggregate(last=Max('pk'))['last'] or 0
+        for number in range((last_pk + chunk_size - 1) // chunk_size):
+            name = chunk_name(section.name, number)
+            keys = _keys(number, chunk_size)
+            fingerprint = json.loads(
+                json.dumps(section.fingerprint(keys), default=str),
+            )
+            previous = manifest.get(name)
+            if (
+                previous is not None
+                and previous['fingerprint'] == fingerprint
+                and (root / name).exists()
+            ):
+                updated[name] = previous
+                stats['unchanged'] += 1
+                continue
+            count, latest = _write_chunk(
+                root / name,
+                section,
+                keys,
+                base_url,
+                batch_size,
+            )
+            stats['written'] += 1
+            if not count:
+                (root / name).unlink()
+                continue
+            updated[name] = {
+                'fingerprint': fingerprint,
+                'lastmod': latest.date().isoformat() if latest else None,
+            }
+    for name in set(manifest) - set(updated):
+        if (root / name).exists():
+            (root / name).unlink()
+        stats['removed'] += 1
+
+    def index() -> typing.Iterator[str]:
+        yield INDEX_OPEN
+        for name, chunk in updated.items():
+            lastmod = (
+                f'<lastmod>{chunk["lastmod"]}</lastmod>'
+                if chunk['lastmod']
+                else ''
+            )
+            yield (
+                f'<sitemap><loc>{escape(f"{base_url}/{name}")}</loc>'
+                f'{lastmod}</sitemap>\n'
+            )
+        yield INDEX_CLOSE
+
+    _write_atomic(root / INDEX_NAME, index())
+    _write_atomic(manifest_path, [json.dumps(updated, indent=2)])
+    return stats
@@ -0,0 +1,190 @@
+import bisect
+import collections
+import datetime
+import heapq
+import math
+import typing
+from array import array
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from posts import invalidation
+from posts.models import Follow, Post, SuggestedAuthor, User
+
+
+class FollowGraph(typing.NamedTuple):
+    """Граф подписок в сжатом построчном формате (CSR).
+
+    Вершины — пользователи в порядке ``users``. Авторы, на которых
+    подписана вершина ``i``, лежат в ``indices[indptr[i]:indptr[i + 1]]``.
+    Массивы ``array`` хранят числа без отдельных объектов, поэтому граф
+    из миллионов подписок занимает десятки мегабайт.
+    """
+
+    users: array
+    indptr: array
+    indices: array
+
+    def vertex(self, user_id: int) -> typing.Optional[int]:
+        """Номер вершины пользователя или ``None``, если его нет в графе."""
+        vertex = bisect.bisect_left(self.users, user_id)
+        if vertex < len(self.users) and self.users[vertex] == user_id:
+            return vertex
+        return None
+
+    def following(self, vertex: int) -> array:
+        start, end = self.indptr[vertex], self.indptr[vertex + 1]
+        return self.indices[start:end]
+
+
+def load_graph() -> FollowGraph:
+    """Читает все подписки в граф за один проход по таблице.
+
+    Пользователи и подписки читаются разными запросами. Подписки
+    пользователей, зарегистрированных или удалённых между ними,
+    пропускаются, чтобы не сдвинуть рёбра на чужие вершины.
+    """
+    users = array(
+        'q',
+        User.objects.order_by('pk').values_list('pk', flat=True).iterator(),
+    )
+    indptr = array('q', [0]) * (len(users) + 1)
+    indices = array('q')
+    graph = FollowGraph(users, indptr, indices)
+    for user_id, author_id in (
+        Follow.objects.order_by('user_id', 'author_id')
+        .values_list('user_id', 'author_id')
+        .iterator()
+    ):
+        user, author = graph.vertex(user_id), graph.vertex(author_id)
+        if user is None or author is None:
+            continue
+        indices.append(author)
+        indptr[user + 1] += 1
+    for vertex in range(len(users)):
+        indptr[vertex + 1] += indptr[vertex]
+    return graph
+
+
+def load_activity(graph: FollowGraph) -> array:
+    """Вес автора: растёт логарифмически с числом недавних постов."""
+    since = timezone.now() - datetime.timedelta(
+        days=settings.SUGGESTIONS_ACTIVITY_DAYS,
+    )
+    activity = array('d', [1.0]) * len(graph.users)
+    for author_id, posts in (
+        Post.objects.filter(created__gte=since)
+        .order_by()
+        .values('author')
+        .annotate(posts=Count('pk'))
+        .values_list('author', 'posts')
+        .iterator()
+    ):
+        vertex = graph.vertex(author_id)
+        if vertex is not None:
+            activity[vertex] += math.log1p(posts)
+    return activity
+
+
+def suggest(
+    graph: FollowGraph,
+    activity: array,
+    vertex: int,
+    limit: int,
+) -> typing.List[typing.Tuple[float, int]]:
+    """Ранжирует авторов, на которых подписаны авторы пользователя.
+
+    Args:
+        graph: Граф подписок.
+        activity: Веса авторов.
+        vertex: Вершина пользователя.
+        limit: Сколько авторов вернуть.
+
+    Returns:
+        Пары рейтинга и вершины автора по убыванию рейтинга.
+    """
+    followed = set(graph.following(vertex))
+    paths: typing.Counter[int] = collections.Counter()
+    for author in followed:
+        paths.update(graph.following(author))
+    for known in followed | {vertex}:
+        paths.pop(known, None)
+    return heapq.nlargest(
+        limit,
+        (
+            (count * activity[author], author)
+            for author, count in paths.items()
+        ),
+    )
+
+
+def compute() -> int:
+    """Пересчитывает рекомендации авторов для всех пользователей.
+
+    Рекомендации пишутся пачками по ``SUGGESTIONS_BATCH_SIZE``
+    пользователей: каждая пачка заменяется в своей транзакции. Граф и
+    активность читаются в одной транзакции, чтобы видеть один снимок.
+
+    Returns:
+        Количество сохранённых рекомендаций.
+    """
+    with transaction.atomic():
+        graph = load_graph()
+        activity = load_activity(graph)
+    batch_size = settings.SUGGESTIONS_BATCH_SIZE
+    total = 0
+    for start in range(0, len(graph.users), batch_size):
+        end = min(start + batch_size, len(graph.users))
+        suggestions = [
+            SuggestedAuthor(
+                user_id=graph.users[vertex],
+                author_id=graph.users[author],
+                rank=rank,
+                score=score,
+            )
+            for vertex in range(start, end)
+            for rank, (score, author) in enumerate(
+                suggest(graph, activity, vertex, settings.SUGGESTIONS_SIZE),
+                start=1,
+            )
+        ]
+        with transaction.atomic():
+            SuggestedAuthor.objects.filter(
+                user_id__gte=graph.users[start],
+                user_id__lte=graph.users[end - 1],
+            ).delete()
+            SuggestedAuthor.objects.bulk_create(suggestions)
+        invalidation.suggestions_changed(graph.users[start:end])
+        total += len(suggestions)
+    return total
+
+
+def followed(follow: Follow) -> None:
+    """Убирает автора из рекомендаций, как только на него подписались."""
+    SuggestedAuthor.objects.filter(
+        user_id=follow.user_id,
+        author_id=follow.author_id,
+    ).delete()
+
+
+def for_user(user: User) -> typing.List[User]:
+    """Читает сохранённые рекомендации пользователя.
+
+    Args:
+        user: Текущий пользователь.
+
+    Returns:
+        Рекомендованные авторы в порядке рейтинга.
+    """
+    if not user.is_authenticated:
+        return []
+    limit = settings.SUGGESTIONS_SHOWN
+    return [
+        suggestion.author
+        for suggestion in SuggestedAuthor.objects.filter(user=user)
+        .select_related('author')
+        .order_by('rank')[:limit]
+    ]
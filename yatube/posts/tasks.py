@@ -0,0 +1,76 @@
+import typing
+
+from django.conf import settings
+
+from outbox.queue import task
+from posts import invalidation, thumbnails, timeline
+from posts.models import Follow, Post
+
+
+@task(priority=10, unique=True)
+def generate_thumbnails(name: str) -> None:
+    """Создаёт миниатюры изображения и сбрасывает кэш его постов.
+
+    Задача всегда ставится только с именем файла, поэтому задачи из
+    формы и из отложенного рендера одного изображения совпадают и не
+    дублируются в очереди.
+
+    Args:
+        name: Имя файла изображения в хранилище.
+    """
+    thumbnails.generate(name)
+    for post in Post.objects.filter(image=name).select_related('author'):
+        invalidation.post_changed(post)
+
+
+@task(priority=5)
+def fan_out_post(post_id: int) -> None:
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        timeline.fan_out(post)
+        invalidation.author_posts_changed(post.author_id)
+
+
+@task(priority=5)
+def backfill_follow(follow_id: int) -> None:
+    follow = Follow.objects.filter(pk=follow_id).first()
+    if follow is not None:
+        timeline.backfill(follow)
+        invalidation.follow_feed_changed(follow.user_id)
+
+
+def _exceeds(queryset: typing.Any, limit: int) -> bool:
+    return queryset[: limit + 1].count() > limit
+
+
+def fan_out(post: Post) -> None:
+    """Добавляет пост в ленты подписчиков сразу или в фоне.
+
+    Рассылка автору с большим числом подписчиков откладывается
+    в очередь, чтобы не задерживать публикацию.
+
+    Args:
+        post: Созданный пост.
+    """
+    if _exceeds(
+        Follow.objects.filter(author_id=post.author_id),
+        settings.TIMELINE_SYNC_LIMIT,
+    ):
+        fan_out_post.enqueue(post.pk)
+    else:
+        timeline.fan_out(post)
+
+
+def backfill(follow: Follow) -> None:
+    """Заполняет ленту нового подписчика сразу или в фоне.
+
+    Args:
+        follow: Созданная подписка.
+    """
+    if _exceeds(
+        Post.objects.filter(author_id=follow.author_id),
+        settings.TIMELINE_SYNC_LIMIT,
+    ):
+        backfill_follow.enqueue(follow.pk)
+    else:
+        timeline.backfill(follow)
@@ -0,0 +1,44 @@
+import typing
+
+from django import template
+from django.template.context import RequestContext
+from django.utils.safestring import SafeText
+
+from posts import cards, suggestions
+from posts.forms import CommentForm
+from posts.models import Follow, Post, User
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def is_following(context: RequestContext, username: str) -> bool:
+    """Проверяет, подписан ли текущий пользователь на автора."""
+    user = context.get('user')
+    return bool(
+        user
+        and user.is_authenticated
+        and Follow.objects.filter(
+            user=user,
+            author__username=username,
+        ).exists(),
+    )
+
+
+@register.simple_tag
+def comment_form() -> CommentForm:
+    """Возвращает пустую форму комментария."""
+    return CommentForm()
+
+
+@register.simple_tag
+def post_cards(posts: typing.Iterable[Post]) -> typing.List[SafeText]:
+    """Возвращает закэшированные карточки постов страницы."""
+    return cards.render_cards(posts)
+
+
+@register.simple_tag(takes_context=True)
+def suggested_authors(context: RequestContext) -> typing.List[User]:
+    """Возвращает заранее рассчитанные рекомендации текущему пользователю."""
+    user = context.get('user')
+    return suggestions.for_user(user) if user else []
@@ -1,6 +1,9 @@
+import shutil
+import tempfile
 from io import BytesIO
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from PIL import Image
 
 
@@ -14,3 +17,29 @@ def image(name: str = 'test.png') -> SimpleUploadedFile:
         content=file.read(),
         content_type='image/png',
     )
+
+
+class TempMediaTestCase(TestCase):
+    """TestCase, который пишет загрузки и миниатюры во временный каталог.
+
+    ``MEDIA_ROOT`` подменяется до ``setUpTestData``, поэтому картинки
+    постов из фабрик тоже не попадают в дерево проекта.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_settings.enable()
+        try:
+            super().setUpClass()
+        except Exception:
+            cls.media_settings.disable()
+            shutil.rmtree(cls.media_root, ignore_errors=True)
+            raise
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        cls.media_settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
@@ -0,0 +1,77 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from mixer.backend.django import mixer
+
+from posts import benchmark
+from posts.models import Follow, Group, Post
+
+User = get_user_model()
+
+
+class BenchmarkTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.results_dir = Path(tempfile.mkdtemp(dir=settings.BASE_DIR))
+        user, author = mixer.cycle(2).blend(User)
+        mixer.cycle(3).blend(
+            Post,
+            author=author,
+            group=mixer.blend(Group),
+            image='',
+        )
+        Follow.objects.create(user=user, author=author)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(cls.results_dir, ignore_errors=True)
+
+    def test_results_are_saved_and_compared(self) -> None:
+        """Результаты всех сценариев сохраняются и сравниваются."""
+        first = self.results_dir / 'first.json'
+        options = {'requests': 2, 'warmup': 0, 'memory_requests': 1}
+        call_command(
+            'benchmark_views',
+            output=first,
+            stdout=StringIO(),
+            **options,
+        )
+        results = json.loads(first.read_text())['results']
+        self.assertEqual(set(results), set(benchmark.SCENARIOS))
+        self.assertEqual(
+            set(results['index']),
+            {
+                'p50_ms',
+                'p95_ms',
+                'p99_ms',
+                'mean_ms',
+                'queries',
+                'peak_memory_kb',
+            },
+        )
+        stdout = StringIO()
+        call_command(
+            'benchmark_views',
+            'index',
+            output=self.results_dir / 'second.json',
+            compare=first,
+            stdout=stdout,
+            **options,
+        )
+        self.assertIn('index.p95_ms:', stdout.getvalue())
+
+    def test_read_paths_compared(self) -> None:
+        """Оба способа чтения ленты замеряются."""
+        stdout = StringIO()
+        call_command('benchmark_feed_rows', limit=3, repeats=1, stdout=stdout)
+        for name in benchmark.READ_PATHS:
+            self.assertIn(f'{name}: fetch_ms=', stdout.getvalue())
@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.tiered_cache import tiered_cache
+from posts import cards
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PostCardsTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = mixer.blend(User)
+        cls.posts = mixer.cycle(3).blend(Post, author=cls.user, image='')
+
+    def setUp(self) -> None:
+        cache.clear()
+        tiered_cache.clear_local()
+
+    def test_cards_rendered_once(self) -> None:
+        """Повторная лента берёт все карточки из кэша."""
+        first = cards.render_cards(self.posts)
+        with mock.patch('posts.cards.render_to_string') as render:
+            self.assertEqual(cards.render_cards(self.posts), first)
+        render.assert_not_called()
+
+    def test_edit_invalidates_only_its_card(self) -> None:
+        """Редактирование поста меняет ключ только его карточки."""
+        before = cards.card_keys(self.posts)
+        client = Client()
+        client.force_login(self.user)
+        client.post(
+            reverse('posts:post_edit', args=(self.posts[0].pk,)),
+            {'text': 'Новый текст'},
+        )
+        after = cards.card_keys(
+            [Post.objects.get(pk=post.pk) for post in self.posts],
+        )
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1:], before[1:])
+        self.assertIn(
+            'Новый текст',
+            client.get(reverse('posts:index')).content.decode(),
+        )
@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from mixer.backend.django import mixer
+
+from posts.models import Comment, Follow, Group, Post, UserStats
+from posts.tests.common import TempMediaTestCase
+
+User = get_user_model()
+
+
+class CountersTests(TempMediaTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user, cls.author = mixer.cycle(2).blend(User)
+        cls.group, cls.other_group = mixer.cycle(2).blend(Group)
+
+    def test_drifted_counter_does_not_go_negative(self) -> None:
+        """Удаление при нулевом счётчике оставляет его нулём."""
+        post = mixer.blend(Post, author=self.author)
+        comment = mixer.blend(Comment, post=post, author=self.user)
+        Post.objects.filter(pk=post.pk).update(comment_count=0)
+        comment.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+
+    def test_write_paths_update_counters(self) -> None:
+        """Создание и удаление записей меняет счётчики."""
+        post = mixer.blend(Post, author=self.author, group=self.group)
+        comment = mixer.blend(Comment, post=post, author=self.user)
+        follow = Follow.objects.create(user=self.user, author=self.author)
+        post.refresh_from_db()
+        self.group.refresh_from_db()
+        author_stats = UserStats.objects.get(user=self.author)
+        self.assertEqual(author_stats.post_count, 1)
+        self.assertEqual(author_stats.follower_count, 1)
+        self.assertEqual(
+            UserStats.objects.get(user=self.user).following_count,
+            1,
+        )
+        self.assertEqual(self.group.post_count, 1)
+        self.assertEqual(post.comment_count, 1)
+        comment.delete()
+        follow.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+        self.assertEqual(
+            UserStats.objects.get(user=self.author).follower_count,
+            0,
+        )
+
+    def test_post_group_change_moves_counter(self) -> None:
+        """Смена группы поста переносит его между счётчиками групп."""
+        post = mixer.blend(Post, author=self.author, group=self.group)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(
+            list(
+                Group.objects.filter(
+                    pk__in=(self.group.pk, self.other_group.pk),
+                )
+                .order_by('pk')
+                .values_list('post_count', flat=True),
+            ),
+            [0, 1],
+        )
+
+    def test_reconcile_command_fixes_drift(self) -> None:
+        """Команда reconcile_counters исправляет расхождения."""
+        mixer.cycle(3).blend(Post, author=self.author, group=self.group)
+        UserStats.objects.update(post_count=42)
+        Group.objects.update(post_count=42)
+        call_command('reconcile_counters', batch_size=1, stdout=StringIO())
+        self.assertEqual(
+            UserStats.objects.get(user=self.author).post_count,
+            3,
+        )
+        self.assertEqual(Group.objects.get(pk=self.group.pk).post_count, 3)
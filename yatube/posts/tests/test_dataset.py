@@ -0,0 +1,96 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F, Max, Min
+from django.test import TestCase
+
+from posts import dataset, models
+from posts.models import Comment, Follow, Group, Post, TimelineEntry
+
+User = get_user_model()
+
+
+class DatasetTests(TestCase):
+    def test_command_generates_consistent_dataset(self) -> None:
+        """Команда создаёт записи и пересчитывает производные данные."""
+        call_command(
+            'generate_dataset',
+            users=20,
+            groups=3,
+            posts=50,
+            comments=30,
+            follows=40,
+            chunk_size=16,
+            workers=1,
+            stdout=StringIO(),
+        )
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 50)
+        self.assertEqual(Comment.objects.count(), 30)
+        self.assertTrue(Follow.objects.exists())
+        self.assertFalse(
+            Follow.objects.filter(user_id=F('author_id')).exists(),
+        )
+        author = User.objects.order_by('-stats__post_count').first()
+        self.assertEqual(author.stats.post_count, author.posts.count())
+        self.assertEqual(
+            TimelineEntry.objects.count(),
+            sum(
+                Post.objects.filter(author_id=author_id).count()
+                for author_id in Follow.objects.values_list(
+                    'author_id',
+                    flat=True,
+                )
+            ),
+        )
+
+    def test_command_spreads_created_over_days(self) -> None:
+        """Посты и комментарии получают запланированные даты создания."""
+        call_command(
+            'generate_dataset',
+            users=5,
+            groups=1,
+            posts=30,
+            comments=30,
+            follows=5,
+            days=30,
+            chunk_size=16,
+            workers=1,
+            stdout=StringIO(),
+        )
+        for model in (Post, Comment):
+            with self.subTest(model=model.__name__):
+                spread = model.objects.aggregate(
+                    first=Min('created'),
+                    last=Max('created'),
+                )
+                self.assertGreater(
+                    spread['last'] - spread['first'],
+                    datetime.timedelta(days=20),
+                )
+        self.assertEqual(
+            models.TextFingerprint.objects.count(),
+            Post.objects.count() + Comment.objects.count(),
+        )
+
+    def test_chunks_are_reproducible(self) -> None:
+        """Пачка с тем же зерном и номером всегда одинакова."""
+        plan = dataset.make_plan(
+            seed=7,
+            users=10,
+            groups=2,
+            posts=10,
+            comments=10,
+            follows=10,
+            password='yatube',
+            days=30,
+        )
+        for model, offset, size in dataset.chunks(plan, chunk_size=4):
+            with self.subTest(model=model.__name__, offset=offset):
+                self.assertEqual(
+                    dataset.generate_chunk(plan, model, offset, size),
+                    dataset.generate_chunk(plan, model, offset, size),
+                )
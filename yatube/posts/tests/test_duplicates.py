@@ -0,0 +1,109 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts import duplicates
+from posts.forms import CommentForm, PostForm
+from posts.models import Comment, Post, TextFingerprint
+
+User = get_user_model()
+
+SPAM = (
+    'Только сегодня огромные скидки на часы и сумки, переходите по ссылке '
+    'в профиле и получите подарок каждому новому покупателю нашего '
+    'магазина прямо сейчас'
+)
+
+
+class DuplicatesTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = mixer.blend(User)
+        cls.post = Post.objects.create(author=cls.user, text=SPAM)
+
+    def setUp(self) -> None:
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_near_duplicate_found_in_one_query(self) -> None:
+        """Текст с мелкой правкой находится одним запросом."""
+        with self.assertNumQueries(1):
+            found = duplicates.find(SPAM.replace('сегодня', 'сейчас'))
+        self.assertEqual(found, [(TextFingerprint.POST, self.post.pk)])
+        self.assertEqual(duplicates.find('Совсем другой текст про погоду'), [])
+
+    @override_settings(DUPLICATES_CANDIDATES=2)
+    def test_duplicate_found_among_many_band_matches(self) -> None:
+        """Дубликат находится, даже если полосу делят много записей."""
+        TextFingerprint.objects.all().delete()
+        value = duplicates.simhash(duplicates.tokens(SPAM))
+        # Первая полоса совпадает, остальные биты инвертированы.
+        far = value ^ ((1 << duplicates.BITS) - 1 - duplicates.BAND_MASK)
+        TextFingerprint.objects.bulk_create(
+            TextFingerprint(
+                kind=TextFingerprint.COMMENT,
+                object_id=object_id,
+                simhash=duplicates.to_signed(far),
+                created=self.post.created,
+                **duplicates.bands(far),
+            )
+            for object_id in range(1, 6)
+        )
+        duplicates.index(TextFingerprint.POST, self.post)
+        self.assertEqual(
+            duplicates.find(SPAM),
+            [(TextFingerprint.POST, self.post.pk)],
+        )
+
+    def test_duplicate_post_and_comment_rejected(self) -> None:
+        """Формы поста и комментария отклоняют скопированный текст."""
+        self.assertFalse(PostForm(data={'text': SPAM + '!!!'}).is_valid())
+        self.assertFalse(CommentForm(data={'text': SPAM.upper()}).is_valid())
+        self.client.post(
+            reverse('posts:add_comment', args=(self.post.pk,)),
+            {'text': SPAM},
+        )
+        self.assertFalse(Comment.objects.exists())
+
+    def test_duplicate_comment_shows_error(self) -> None:
+        """Отклонённый комментарий возвращает страницу поста с ошибкой."""
+        text = SPAM.replace('сегодня', 'сейчас')
+        response = self.client.post(
+            reverse('posts:add_comment', args=(self.post.pk,)),
+            {'text': text},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(response, 'posts/post_detail.html')
+        self.assertFormError(
+            response,
+            'form',
+            'text',
+            'Почти такой же текст уже недавно публиковали.',
+        )
+        self.assertContains(response, text)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_own_post_can_be_edited(self) -> None:
+        """Пост не считается дубликатом самого себя."""
+        form = PostForm(data={'text': SPAM}, instance=self.post)
+        self.assertTrue(form.is_valid())
+
+    def test_short_texts_not_checked(self) -> None:
+        """Короткие одинаковые ответы не считаются спамом."""
+        mixer.blend(Comment, post=self.post, text='Спасибо, отличный пост!')
+        form = CommentForm(data={'text': 'Спасибо, отличный пост!'})
+        self.assertTrue(form.is_valid())
+
+    def test_build_command_indexes_existing_rows(self) -> None:
+        """Команда пересобирает отпечатки всех записей."""
+        TextFingerprint.objects.all().delete()
+        mixer.blend(Comment, post=self.post)
+        call_command('build_duplicates_index', stdout=StringIO())
+        self.assertEqual(TextFingerprint.objects.count(), 2)
+        self.assertTrue(duplicates.find(SPAM))
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = mixer.blend(User)
+        self.group = mixer.blend(Group)
+        self.post = mixer.blend(
+            Post,
+            author=self.author,
+            group=self.group,
+            text='Пост в группе',
+            image='',
+        )
+        self.other = mixer.blend(Post, text='Пост без группы', image='')
+
+    def read(self, url: str) -> str:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        if response.streaming:
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def test_feeds_contain_their_posts(self) -> None:
+        """Ленты сайта, группы и автора содержат только свои посты."""
+        feeds = {
+            reverse('posts:index_feed', args=('atom',)): {
+                self.post.text,
+                self.other.text,
+            },
+            reverse('posts:group_feed', args=(self.group.slug, 'rss')): {
+                self.post.text,
+            },
+            reverse(
+                'posts:profile_feed',
+                args=(self.author.username, 'atom'),
+            ): {self.post.text},
+        }
+        for url, texts in feeds.items():
+            with self.subTest(url=url):
+                content = self.read(url)
+                ElementTree.fromstring(content)
+                for post in (self.post, self.other):
+                    self.assertEqual(post.text in content, post.text in texts)
+
+    def test_feed_streamed_then_cached(self) -> None:
+        """Первый ответ передаётся потоком, повторный берётся из кэша."""
+        url = reverse('posts:index_feed', args=('rss',))
+        first = self.client.get(url)
+        self.assertTrue(first.streaming)
+        self.assertEqual(
+            first['Content-Type'], 'application/rss+xml; charset=utf-8'
+        )
+        content = b''.join(first.streaming_content)
+        second = self.client.get(url)
+        self.assertFalse(second.streaming)
+        self.assertEqual(second.content, content)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code,
+            HTTPStatus.NOT_MODIFIED,
+        )
+
+    def test_query_string_does_not_bypass_cache(self) -> None:
+        """Параметры запроса не создают новую запись кэша ленты."""
+        url = reverse('posts:index_feed', args=('atom',))
+        b''.join(self.client.get(url).streaming_content)
+        self.assertFalse(self.client.get(url, {'utm_source': 'x'}).streaming)
+
+    def test_new_post_invalidates_feed(self) -> None:
+        """Новый пост сразу появляется в закэшированной ленте."""
+        url = reverse('posts:group_feed', args=(self.group.slug, 'atom'))
+        self.read(url)
+        mixer.blend(Post, group=self.group, text='Свежий пост', image='')
+        self.assertIn('Свежий пост', self.read(url))
+
+    def test_unknown_format(self) -> None:
+        """Неизвестный формат ленты даёт 404."""
+        self.assertEqual(
+            self.client.get(
+                reverse('posts:index_feed', args=('json',)),
+            ).status_code,
+            HTTPStatus.NOT_FOUND,
+        )
@@ -1,23 +1,16 @@
-import shutil
-import tempfile
-
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.views import redirect_to_login
-from django.test import Client, TestCase, override_settings
+from django.test import Client
 from django.urls import reverse
 from mixer.backend.django import mixer
 
 from posts.models import Comment, Follow, Group, Post
-from posts.tests.common import image
+from posts.tests.common import TempMediaTestCase, image
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
-class PostFormTests(TestCase):
+class PostFormTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -27,11 +20,6 @@ class PostFormTests(TestCase):
 
         cls.auth.force_login(cls.user)
 
-    @classmethod
-    def tearDownClass(cls) -> None:
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
     def test_create_post(self) -> None:
         """Валидная форма создает ноый пост."""
         group = mixer.blend(Group)
@@ -136,7 +124,7 @@ class PostFormTests(TestCase):
         self.assertEqual(post.text, 'Тестовый текст')
 
 
-class CommentFormTests(TestCase):
+class CommentFormTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -189,7 +177,7 @@ class CommentFormTests(TestCase):
         self.assertEqual(Comment.objects.count(), 0)
 
 
-class FollowFormTests(TestCase):
+class FollowFormTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
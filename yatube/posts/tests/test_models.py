@@ -1,14 +1,14 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from mixer.backend.django import mixer
 
 from posts.models import Group, Post
+from posts.tests.common import TempMediaTestCase
 
 User = get_user_model()
 
 
-class PostModelTest(TestCase):
+class PostModelTest(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -24,7 +24,7 @@ class PostModelTest(TestCase):
         # fmt: on
 
 
-class GroupModelTest(TestCase):
+class GroupModelTest(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -0,0 +1,95 @@
+import typing
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+PLAN_PROBLEMS = ('USE TEMP B-TREE',)
+
+
+def query_plan(sql: str) -> typing.List[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan: typing.Iterable[str]) -> typing.List[str]:
+    """Находит в плане запроса полный просмотр таблицы и сортировку."""
+    return [
+        step
+        for step in plan
+        if any(problem in step for problem in PLAN_PROBLEMS)
+        or (step.startswith('SCAN ') and ' USING ' not in step)
+    ]
+
+
+class FeedQueryPlanTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user, cls.author = mixer.cycle(2).blend(User)
+        cls.group = mixer.blend(Group)
+        cls.posts = mixer.cycle(15).blend(
+            Post,
+            author=cls.author,
+            group=cls.group,
+            image='',
+        )
+        mixer.cycle(25).blend(Comment, post=cls.posts[0], author=cls.user)
+        Follow.objects.create(user=cls.user, author=cls.author)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def feed_urls(self) -> typing.Dict[str, str]:
+        return {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:group_list', args=(self.group.slug,)),
+            'profile': reverse('posts:profile', args=(self.author.username,)),
+            'post': reverse('posts:post_detail', args=(self.posts[0].pk,)),
+            'comments': reverse(
+                'posts:post_comments', args=(self.posts[0].pk,)
+            ),
+            'follow': reverse('posts:follow_index'),
+        }
+
+    def assertQueriesIndexed(self, url: str) -> HttpResponse:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        for query in queries.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            plan = query_plan(query['sql'])
+            self.assertEqual(
+                plan_problems(plan),
+                [],
+                '\n'.join((query['sql'], *plan)),
+            )
+        return response
+
+    def test_feed_queries_use_indexes(self) -> None:
+        """Запросы лент не просматривают таблицы целиком и не сортируют."""
+        for name, url in self.feed_urls().items():
+            with self.subTest(page=name):
+                page_obj = self.assertQueriesIndexed(url).context['page_obj']
+                if getattr(page_obj, 'next_cursor', None):
+                    page_obj = self.assertQueriesIndexed(
+                        f'{url}?cursor={page_obj.next_cursor}',
+                    ).context['page_obj']
+                    self.assertQueriesIndexed(
+                        f'{url}?cursor={page_obj.previous_cursor}',
+                    )
+                self.assertQueriesIndexed(f'{url}?page=2')
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.cache_tags import invalidate
+from core.tiered_cache import tiered_cache
+from posts import invalidation, related
+from posts.models import Post, RelatedPost
+
+User = get_user_model()
+
+TEXTS = (
+    'Кошки любят молоко и свежую рыбу',
+    'Наши кошки пьют молоко каждое утро',
+    'Автомобили едут по мокрой дороге',
+    'Автомобили стоят на мокрой дороге',
+    'Сегодня прошёл тихий вечер',
+)
+
+
+class RelatedPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        author = mixer.blend(User)
+        cls.posts = [
+            Post.objects.create(author=author, text=text) for text in TEXTS
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        tiered_cache.clear_local()
+
+    def related(self, post: Post) -> list:
+        return list(
+            RelatedPost.objects.filter(post=post)
+            .order_by('rank')
+            .values_list('related_id', flat=True),
+        )
+
+    def test_similar_texts_are_related(self) -> None:
+        """Похожими считаются посты с общими редкими словами."""
+        call_command('compute_related', stdout=StringIO())
+        cats, milk, cars, roads, evening = self.posts
+        self.assertEqual(self.related(cats), [milk.pk])
+        self.assertEqual(self.related(roads), [cars.pk])
+        self.assertEqual(self.related(evening), [])
+
+    def test_only_changed_posts_recomputed(self) -> None:
+        """Повторный расчёт затрагивает изменённый пост и его соседей."""
+        self.assertEqual(related.compute(), len(self.posts))
+        self.assertEqual(related.compute(), 0)
+        cats, milk, cars, roads, evening = self.posts
+        cars.text = 'Кошки пьют молоко на дороге'
+        cars.save()
+        self.assertLess(related.compute(), len(self.posts))
+        self.assertIn(cars.pk, self.related(milk))
+        self.assertIn(milk.pk, self.related(cars))
+
+    @override_settings(RELATED_PROCESSES=2, RELATED_BLOCK_SIZE=2)
+    def test_processes_give_same_result(self) -> None:
+        """Расчёт в нескольких процессах совпадает с расчётом в одном."""
+        related.compute()
+        parallel = list(RelatedPost.objects.values_list('post', 'related'))
+        with self.settings(RELATED_PROCESSES=1):
+            related.compute(full=True)
+        self.assertCountEqual(
+            RelatedPost.objects.values_list('post', 'related'),
+            parallel,
+        )
+
+    def test_post_page_shows_related(self) -> None:
+        """Страница поста выводит похожие записи."""
+        related.compute()
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.posts[0].pk,)),
+        )
+        self.assertEqual(
+            [link.related for link in response.context['related']],
+            [self.posts[1]],
+        )
+        self.assertContains(response, 'Похожие записи')
+
+    def test_related_fragment_reused_until_recomputed(self) -> None:
+        """Список похожих записей не читается заново при смене поста."""
+        related.compute()
+        post = self.posts[0]
+        page = reverse('posts:post_detail', args=(post.pk,))
+        self.client.get(page)
+        invalidate(invalidation.post_tag(post.pk))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get(page), self.posts[1].text)
+        table = RelatedPost._meta.db_table
+        self.assertFalse(
+            any(table in query['sql'] for query in queries.captured_queries),
+        )
+        RelatedPost.objects.filter(post=post).delete()
+        invalidation.related_changed([post.pk])
+        self.assertNotContains(self.client.get(page), 'Похожие записи')
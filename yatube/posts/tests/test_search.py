@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.models import Comment, Post
+from posts.tests.common import TempMediaTestCase
+
+User = get_user_model()
+
+
+class SearchTests(TempMediaTestCase):
+    def setUp(self) -> None:
+        self.post = mixer.blend(Post, text='Кот спит на диване <b>')
+        self.other = mixer.blend(Post, text='Собака и кот, кот и собака')
+        mixer.blend(Post, text='Про погоду')
+
+    def search(self, query: str) -> list:
+        response = self.client.get(reverse('posts:search'), {'q': query})
+        return list(response.context['page_obj'])
+
+    def test_search_ranks_and_highlights_posts(self) -> None:
+        """Поиск находит посты, ранжирует их и подсвечивает слова."""
+        results = self.search('кот')
+        self.assertEqual(
+            [post.pk for post in results],
+            [self.other.pk, self.post.pk],
+        )
+        self.assertIn('<mark>кот</mark>', results[0].snippet)
+        self.assertIn('&lt;b&gt;', results[1].snippet)
+
+    def test_index_follows_post_changes(self) -> None:
+        """Индекс обновляется при изменении и удалении постов."""
+        self.post.text = 'Лиса спит на диване'
+        self.post.save()
+        self.assertEqual(
+            [post.pk for post in self.search('кот')],
+            [self.other.pk],
+        )
+        self.assertEqual(
+            [post.pk for post in self.search('лиса')],
+            [self.post.pk],
+        )
+        self.post.delete()
+        self.assertEqual(self.search('лиса'), [])
+
+    def test_search_ignores_query_syntax(self) -> None:
+        """Операторы FTS5 в запросе не ломают поиск."""
+        self.assertEqual(self.search('"кот AND ('), [])
+        self.assertEqual(self.search(''), [])
+
+    def test_admin_uses_full_text_index(self) -> None:
+        """Админка ищет посты и комментарии по индексу."""
+        admin = User.objects.create_superuser('admin', 'a@a.ru', 'pass')
+        mixer.blend(Comment, post=self.post, text='Какой кот!')
+        client = Client()
+        client.force_login(admin)
+        for name, expected in (('post', 2), ('comment', 1)):
+            with self.subTest(model=name):
+                response = client.get(
+                    reverse(f'admin:posts_{name}_changelist'),
+                    {'q': 'кот'},
+                )
+                self.assertEqual(response.context['cl'].result_count, expected)
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts import sitemaps
+from posts.models import Group, Post
+
+User = get_user_model()
+
+NAMESPACE = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.root = Path(tempfile.mkdtemp(dir=settings.BASE_DIR))
+        cls.author = mixer.blend(User)
+        cls.group = mixer.blend(Group)
+        cls.posts = mixer.cycle(5).blend(
+            Post,
+            author=cls.author,
+            group=cls.group,
+            image='',
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def build(self, **kwargs) -> dict:
+        return sitemaps.build(
+            self.root,
+            'http://testserver',
+            chunk_size=2,
+            batch_size=1,
+            **kwargs,
+        )
+
+    def locations(self, name: str) -> list:
+        tree = ElementTree.parse(self.root / name)
+        return [loc.text for loc in tree.iter(f'{NAMESPACE}loc')]
+
+    def test_all_pages_listed_in_chunks(self) -> None:
+        """Каждый пост, профиль и группа попадают в свою часть."""
+        self.build()
+        chunks = self.locations(sitemaps.INDEX_NAME)
+        urls = [
+            url
+            for chunk in chunks
+            for url in self.locations(chunk.rsplit('/', 1)[1])
+        ]
+        expected = [
+            reverse('posts:post_detail', args=(post.pk,))
+            for post in self.posts
+        ]
+        expected += [
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:group_list', args=(self.group.slug,)),
+        ]
+        self.assertCountEqual(
+            urls,
+            [f'http://testserver{url}' for url in expected],
+        )
+
+    def test_only_changed_chunks_rewritten(self) -> None:
+        """Правка поста перезаписывает только его часть и зависимые."""
+        self.build()
+        self.assertEqual(self.build()['written'], 0)
+        post = self.posts[-1]
+        post.text = 'Новый текст'
+        post.save()
+        stats = self.build()
+        # Часть постов, часть профилей автора и часть групп.
+        self.assertEqual(stats['written'], 3)
+        self.assertEqual(self.build(full=True)['unchanged'], 0)
+
+    def test_renamed_group_rewrites_chunk(self) -> None:
+        """Смена адресного поля перезаписывает часть с новым адресом."""
+        self.build()
+        self.group.slug = 'new_slug'
+        self.group.save()
+        self.assertEqual(self.build()['written'], 1)
+        name = sitemaps.chunk_name('groups', (self.group.pk - 1) // 2)
+        url = reverse('posts:group_list', args=('new_slug',))
+        self.assertEqual(self.locations(name), [f'http://testserver{url}'])
+
+    def test_removed_rows_drop_chunk(self) -> None:
+        """Опустевшая часть удаляется из индекса и с диска."""
+        self.build()
+        first = self.posts[0]
+        name = sitemaps.chunk_name('posts', (first.pk - 1) // 2)
+        Post.objects.filter(
+            pk__in=[
+                post.pk
+                for post in self.posts
+                if (post.pk - 1) // 2 == (first.pk - 1) // 2
+            ],
+        ).delete()
+        self.build()
+        self.assertFalse((self.root / name).exists())
+        self.assertNotIn(
+            f'http://testserver/{name}',
+            self.locations(sitemaps.INDEX_NAME),
+        )
+
+    def test_files_served(self) -> None:
+        """Индекс и части отдаются по своим адресам."""
+        with override_settings(SITEMAP_ROOT=self.root):
+            self.assertEqual(self.client.get('/sitemap.xml').status_code, 404)
+            self.build()
+            self.assertEqual(self.client.get('/sitemap.xml').status_code, 200)
+            name = self.locations(sitemaps.INDEX_NAME)[0].rsplit('/', 1)[1]
+            self.assertEqual(self.client.get(f'/{name}').status_code, 200)
+            self.assertEqual(
+                self.client.get('/sitemap-secret-0.xml').status_code,
+                404,
+            )
@@ -0,0 +1,92 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.tiered_cache import tiered_cache
+from posts import suggestions
+from posts.models import Follow, Post, SuggestedAuthor
+
+User = get_user_model()
+
+
+class SuggestionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user, cls.first, cls.second = mixer.cycle(3).blend(User)
+        cls.popular, cls.active, cls.quiet = mixer.cycle(3).blend(User)
+        for user, author in (
+            (cls.user, cls.first),
+            (cls.user, cls.second),
+            (cls.first, cls.popular),
+            (cls.second, cls.popular),
+            (cls.first, cls.active),
+            (cls.second, cls.quiet),
+            (cls.first, cls.user),
+        ):
+            Follow.objects.create(user=user, author=author)
+        mixer.cycle(3).blend(Post, author=cls.active, image='')
+        mixer.blend(Post, author=cls.popular, image='')
+
+    def setUp(self) -> None:
+        cache.clear()
+        tiered_cache.clear_local()
+
+    def suggested(self) -> list:
+        return list(
+            SuggestedAuthor.objects.filter(user=self.user)
+            .order_by('rank')
+            .values_list('author', flat=True),
+        )
+
+    def test_friends_of_friends_ranked_by_paths_and_activity(self) -> None:
+        """Чем больше путей и постов у автора, тем он выше."""
+        call_command('compute_suggestions', stdout=StringIO())
+        self.assertEqual(
+            self.suggested(),
+            [self.popular.pk, self.active.pk, self.quiet.pk],
+        )
+
+    def test_graph_skips_users_added_between_reads(self) -> None:
+        """Подписки пользователя, которого нет среди вершин, пропускаются."""
+        users = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        newcomer = mixer.blend(User)
+        Follow.objects.create(user=newcomer, author=self.popular)
+        Follow.objects.create(user=self.user, author=newcomer)
+        mixer.blend(Post, author=newcomer, image='')
+        with mock.patch.object(User.objects, 'order_by') as order_by:
+            order_by().values_list().iterator.return_value = iter(users)
+            graph = suggestions.load_graph()
+        activity = suggestions.load_activity(graph)
+        self.assertNotIn(newcomer.pk, graph.users)
+        following = graph.following(graph.vertex(self.user.pk))
+        self.assertEqual(
+            sorted(graph.users[author] for author in following),
+            [self.first.pk, self.second.pk],
+        )
+        self.assertEqual(len(activity), len(users))
+
+    def test_follow_removes_suggestion(self) -> None:
+        """Подписка убирает автора из рекомендаций."""
+        suggestions.compute()
+        Follow.objects.create(user=self.user, author=self.active)
+        self.assertNotIn(self.active.pk, self.suggested())
+
+    def test_page_reads_stored_suggestions(self) -> None:
+        """Страница выводит рекомендации без обхода графа."""
+        suggestions.compute()
+        self.client.force_login(self.user)
+        with mock.patch.object(suggestions, 'suggest') as suggest:
+            response = self.client.get(reverse('posts:follow_index'))
+        suggest.assert_not_called()
+        self.assertContains(response, 'Рекомендуемые авторы')
+        self.assertContains(
+            response,
+            reverse('posts:profile', args=(self.popular.username,)),
+        )
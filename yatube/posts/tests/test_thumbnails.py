@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from mixer.backend.django import mixer
+from sorl.thumbnail import get_thumbnail
+
+from outbox import worker
+from outbox.models import Task
+from posts import thumbnails
+from posts.forms import PostForm
+from posts.models import Post
+from posts.tests.common import TempMediaTestCase, image
+
+User = get_user_model()
+
+
+class ThumbnailsTests(TempMediaTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = mixer.blend(User)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Пост с картинкой',
+            image=image(),
+        )
+
+    def test_missing_thumbnail_is_deferred(self) -> None:
+        """Недостающая миниатюра ставится в очередь, а не создаётся."""
+        with mock.patch.object(thumbnails, 'schedule') as schedule:
+            response = Client().get(
+                reverse('posts:post_detail', args=(self.post.pk,)),
+            )
+        self.assertEqual(schedule.call_args[0][0], self.post.image.name)
+        self.assertContains(response, 'Изображение обрабатывается')
+
+    def test_generated_thumbnail_is_shown(self) -> None:
+        """Созданная заранее миниатюра выводится без повторной постановки."""
+        thumbnails.generate(self.post.image.name)
+        with mock.patch.object(thumbnails, 'schedule') as schedule:
+            thumbnail = get_thumbnail(
+                self.post.image,
+                '960x339',
+                crop='center',
+                upscale=True,
+            )
+        schedule.assert_not_called()
+        self.assertTrue(thumbnail.exists())
+
+    def test_deferred_thumbnail_is_generated_after_response(self) -> None:
+        """Фоновая задача создаёт миниатюру и сбрасывает кэш страницы."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        client = Client()
+        self.assertContains(client.get(url), 'Изображение обрабатывается')
+        self.assertEqual(worker.run(once=True), {'done': 1, 'failed': 0})
+        response = client.get(url)
+        self.assertNotContains(response, 'Изображение обрабатывается')
+        self.assertContains(response, 'class="card-img my-2" src=')
+
+    def test_form_generates_thumbnails(self) -> None:
+        """Сохранение формы с изображением ставит миниатюры в очередь."""
+        form = PostForm(
+            data={'text': 'Новый пост'},
+            files={'image': image(name='form.png')},
+        )
+        self.assertTrue(form.is_valid())
+        form.instance.author = self.user
+        with mock.patch.object(
+            thumbnails,
+            'generate',
+            wraps=thumbnails.generate,
+        ) as generate:
+            post = form.save()
+            generate.assert_not_called()
+            worker.run(once=True)
+        generate.assert_called_once_with(post.image.name)
+
+    def test_form_and_render_share_one_task(self) -> None:
+        """Форма и рендер страницы ставят одну и ту же задачу."""
+        form = PostForm(
+            data={'text': 'Новый пост'},
+            files={'image': image(name='form.png')},
+        )
+        self.assertTrue(form.is_valid())
+        form.instance.author = self.user
+        post = form.save()
+        Client().get(reverse('posts:post_detail', args=(post.pk,)))
+        self.assertEqual(
+            Task.objects.filter(payload__contains=post.image.name).count(),
+            1,
+        )
@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from outbox import worker
+from posts.models import Follow, Post, TimelineEntry
+from posts.tests.common import TempMediaTestCase
+
+User = get_user_model()
+
+
+class TimelineTests(TempMediaTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user, cls.author = mixer.cycle(2).blend(User)
+
+    def timeline(self) -> list:
+        return list(self.user.timeline.values_list('post_id', flat=True))
+
+    def test_new_post_is_fanned_out_to_followers(self) -> None:
+        """Новый пост попадает в ленты подписчиков автора."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = mixer.blend(Post, author=self.author)
+        self.assertEqual(self.timeline(), [post.pk])
+
+    def test_follow_backfills_and_unfollow_trims(self) -> None:
+        """Подписка дополняет ленту, отписка очищает её."""
+        posts = mixer.cycle(3).blend(Post, author=self.author)
+        follow = Follow.objects.create(user=self.user, author=self.author)
+        self.assertCountEqual(self.timeline(), [post.pk for post in posts])
+        follow.delete()
+        self.assertEqual(self.timeline(), [])
+
+    @override_settings(TIMELINE_SYNC_LIMIT=0)
+    def test_large_fan_out_is_deferred(self) -> None:
+        """Рассылка и заполнение ленты сверх порога уходят в очередь."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = mixer.blend(Post, author=self.author)
+        self.assertEqual(self.timeline(), [])
+        worker.run(once=True)
+        self.assertEqual(self.timeline(), [post.pk])
+
+    def test_rebuild_command_restores_timelines(self) -> None:
+        """Команда rebuild_timelines пересобирает ленты."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = mixer.blend(Post, author=self.author)
+        TimelineEntry.objects.all().delete()
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(self.timeline(), [post.pk])
+
+    def test_follow_feed_pages_by_timeline_cursor(self) -> None:
+        """Лента подписок читается по курсору записей ленты, без COUNT."""
+        cache.clear()
+        Follow.objects.create(user=self.user, author=self.author)
+        posts = mixer.cycle(12).blend(Post, author=self.author, image='')
+        self.client.force_login(self.user)
+        url = reverse('posts:follow_index')
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(url).context['page_obj']
+        second = self.client.get(
+            f'{url}?cursor={first.next_cursor}',
+        ).context['page_obj']
+        self.assertFalse(
+            [query for query in queries if 'COUNT(' in query['sql']],
+        )
+        self.assertEqual(
+            [post.pk for post in (*first, *second)],
+            [post.pk for post in reversed(posts)],
+        )
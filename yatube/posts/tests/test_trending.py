@@ -0,0 +1,70 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from core.tiered_cache import tiered_cache
+from posts import trending
+from posts.models import Follow, Post, TrendingPost
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.author, cls.reader = mixer.cycle(2).blend(User)
+        cls.quiet, cls.discussed, cls.old = mixer.cycle(3).blend(
+            Post,
+            author=cls.author,
+            image='',
+        )
+        Post.objects.filter(pk=cls.discussed.pk).update(comment_count=5)
+        Post.objects.filter(pk=cls.old.pk).update(
+            comment_count=5,
+            created=timezone.now() - datetime.timedelta(days=2),
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        tiered_cache.clear_local()
+
+    def ranked(self) -> list:
+        return list(
+            TrendingPost.objects.order_by('rank').values_list(
+                'post_id',
+                flat=True,
+            ),
+        )
+
+    def test_fresh_engagement_ranks_first(self) -> None:
+        """Свежий обсуждаемый пост выше старого, пост без реакций скрыт."""
+        call_command('compute_trending', stdout=StringIO())
+        self.assertEqual(self.ranked(), [self.discussed.pk, self.old.pk])
+
+    def test_follows_after_post_count(self) -> None:
+        """Подписки на автора после публикации поднимают его пост."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        trending.compute()
+        self.assertIn(self.quiet.pk, self.ranked())
+
+    def test_page_reads_precomputed_ranks(self) -> None:
+        """Страница только читает места, не вычисляя рейтинг."""
+        url = reverse('posts:trending')
+        self.assertContains(self.client.get(url), 'ещё не подсчитаны')
+        trending.compute()
+        with mock.patch.object(trending, 'score') as score:
+            response = self.client.get(url)
+        score.assert_not_called()
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']],
+            [self.discussed.pk, self.old.pk],
+        )
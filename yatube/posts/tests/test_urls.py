@@ -3,16 +3,17 @@ from http import HTTPStatus
 from django.contrib.auth import get_user_model
 from django.contrib.auth.views import redirect_to_login
 from django.core.cache import cache
-from django.test import Client, TestCase
+from django.test import Client
 from django.urls import reverse
 from mixer.backend.django import mixer
 
 from posts.models import Group, Post
+from posts.tests.common import TempMediaTestCase
 
 User = get_user_model()
 
 
-class PostURLTests(TestCase):
+class PostURLTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
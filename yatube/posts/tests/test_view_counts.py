@@ -0,0 +1,78 @@
+import collections
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.tiered_cache import tiered_cache
+from posts import view_counts
+from posts.models import Post
+
+User = get_user_model()
+
+
+class ViewCountsTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.posts = mixer.cycle(2).blend(
+            Post,
+            author=mixer.blend(User),
+            image='',
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        tiered_cache.clear_local()
+        # Просмотры из других тестов не должны попасть в базу этого.
+        patcher = mock.patch.object(
+            view_counts,
+            '_pending',
+            collections.Counter(),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def view_count(self, post: Post) -> int:
+        return Post.objects.values_list('view_count', flat=True).get(
+            pk=post.pk,
+        )
+
+    def test_views_buffered_then_flushed_in_one_query(self) -> None:
+        """Просмотры копятся в буфере и пишутся одним запросом."""
+        first, second = self.posts
+        for post in (first, first, second):
+            self.client.get(reverse('posts:post_detail', args=(post.pk,)))
+        self.assertEqual(self.view_count(first), 0)
+        self.assertEqual(view_counts.pending(first.pk), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(view_counts.flush(), 2)
+        self.assertEqual(self.view_count(first), 2)
+        self.assertEqual(self.view_count(second), 1)
+
+    @override_settings(VIEW_COUNTS_FLUSH_INTERVAL=0)
+    def test_flushed_after_request_and_shown_on_card(self) -> None:
+        """Просмотры записываются после запроса и видны в карточке."""
+        post = self.posts[0]
+        self.client.get(reverse('posts:post_detail', args=(post.pk,)))
+        self.assertEqual(self.view_count(post), 1)
+        self.assertContains(
+            self.client.get(reverse('posts:profile', args=(post.author,))),
+            'Просмотров: 1',
+        )
+
+    def test_flush_keeps_cached_pages(self) -> None:
+        """Сброс буфера не сбрасывает закэшированные страницы."""
+        page = reverse('posts:index')
+        etag = self.client.get(page)['ETag']
+        view_counts.record(self.posts[0].pk)
+        view_counts.flush()
+        self.assertEqual(self.client.get(page)['ETag'], etag)
+
+    def test_missing_post_not_counted(self) -> None:
+        """Ответ 404 не считается просмотром."""
+        self.client.get(reverse('posts:post_detail', args=(0,)))
+        self.assertEqual(view_counts.pending(0), 0)
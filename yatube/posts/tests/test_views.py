@@ -1,14 +1,22 @@
 import typing
+from http import HTTPStatus
+from io import StringIO
 
 from django import forms
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db import models
-from django.test import Client, TestCase
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from mixer.backend.django import mixer
 
+from outbox import worker
+from posts import thumbnails
 from posts.models import Comment, Follow, Group, Post
+from posts.rows import PostRow
+from posts.tests.common import TempMediaTestCase
 from yatube import settings
 
 User = get_user_model()
@@ -25,7 +33,7 @@ def check_types_in_dict(
             self.assertIsInstance(form_field, expected)
 
 
-class PostPagesTests(TestCase):
+class PostPagesTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -52,25 +60,19 @@ class PostPagesTests(TestCase):
             reverse('posts:group_list', kwargs={'slug': 'test_slug'}),
             reverse('posts:profile', kwargs={'username': 'auth'}),
         ]
-        post_fields = {
-            'text': models.TextField,
-            'created': models.DateTimeField,
-            'image': models.ImageField,
-        }
-        group_fields = {
-            'slug': models.SlugField,
-            'description': models.TextField,
-            'title': models.CharField,
-        }
         for page in page_names:
             with self.subTest(page=page):
                 response = self.authorized_client.get(page)
                 for post in response.context.get('page_obj'):
-                    check_types_in_dict(self, post, post_fields)
-                    check_types_in_dict(
-                        self,
-                        post.group,
-                        group_fields,
+                    self.assertIsInstance(post, PostRow)
+                    self.assertEqual(post.pk, self.post.pk)
+                    self.assertEqual(post.text, self.post.text)
+                    self.assertEqual(post.created, self.post.created)
+                    self.assertEqual(post.image, self.post.image.name)
+                    self.assertEqual(post.group_id, self.group.pk)
+                    self.assertEqual(
+                        post.author.get_full_name(),
+                        self.user.get_full_name(),
                     )
 
     def test_post_page_shows_correct_context(self) -> None:
@@ -138,7 +140,7 @@ class PostPagesTests(TestCase):
             )
 
 
-class CommentPagesTests(TestCase):
+class CommentPagesTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -172,8 +174,36 @@ class CommentPagesTests(TestCase):
             'Тестовый текст',
         )
 
+    def test_comments_are_fetched_in_single_query(self) -> None:
+        """Комментарии загружаются вместе с авторами одним запросом."""
+        address = reverse('posts:post_comments', args=(self.post.pk,))
+        cache.clear()
+        with self.assertNumQueries(2):
+            self.client.get(address)
+        mixer.cycle(5).blend(Comment, post=self.post)
+        cache.clear()
+        with self.assertNumQueries(2):
+            self.client.get(address)
+
+    def test_comments_fragment_returns_next_batch(self) -> None:
+        """Фрагмент комментариев отдаёт следующую порцию по курсору."""
+        mixer.cycle(settings.COMMENTS_ON_PAGE).blend(Comment, post=self.post)
+        page = self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        ).context['page_obj']
+        self.assertEqual(len(page), settings.COMMENTS_ON_PAGE)
+        response = self.client.get(
+            reverse('posts:post_comments', args=(self.post.pk,)),
+            {'cursor': page.next_cursor},
+        )
+        self.assertEqual(
+            [comment.text for comment in response.context['page_obj']],
+            ['Тестовый текст'],
+        )
+        self.assertTemplateNotUsed(response, 'base.html')
+
 
-class PaginatorViewsTest(TestCase):
+class PaginatorViewsTest(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -222,8 +252,48 @@ class PaginatorViewsTest(TestCase):
                 13 - settings.OBJECTS_ON_PAGE,
             )
 
+    def test_cursor_pages_contain_value_of_records(self) -> None:
+        """Курсоры ведут на следующую и предыдущую страницы."""
+        page_names = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test_slug'}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+        ]
+        for page in page_names:
+            with self.subTest(page=page):
+                first = self.client.get(page).context['page_obj']
+                self.assertIsNone(first.previous_cursor)
+                second = self.client.get(
+                    page,
+                    {'cursor': first.next_cursor},
+                ).context['page_obj']
+                self.assertEqual(
+                    [post.pk for post in second],
+                    list(range(13 - settings.OBJECTS_ON_PAGE))[::-1],
+                )
+                self.assertIsNone(second.next_cursor)
+                back = self.client.get(
+                    page,
+                    {'cursor': second.previous_cursor},
+                ).context['page_obj']
+                self.assertEqual(
+                    [post.pk for post in back],
+                    [post.pk for post in first],
+                )
+
+    def test_broken_cursor_returns_first_page(self) -> None:
+        """Повреждённый курсор возвращает первую страницу."""
+        response = self.client.get(
+            reverse('posts:index'),
+            {'cursor': 'broken'},
+        )
+        self.assertEqual(
+            len(response.context['page_obj']),
+            settings.OBJECTS_ON_PAGE,
+        )
+
 
-class FollowPagesTests(TestCase):
+class FollowPagesTests(TempMediaTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
@@ -282,3 +352,199 @@ class FollowPagesTests(TestCase):
             self.non_subscribed.follower.count(),
             0,
         )
+
+
+class IndexCacheTests(TempMediaTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = mixer.blend(User, username='auth')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_cached_index_renders_user_fragments(self) -> None:
+        """Кэш главной страницы не переносит данные между пользователями."""
+        post = mixer.blend(Post, text='Тестовый пост')
+        thumbnails.generate(post.image.name)
+        anonymous = self.client.get(reverse('posts:index'))
+        Post.objects.update(text='Изменённый пост')
+        authorized = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(authorized, 'Тестовый пост')
+        self.assertContains(authorized, 'Пользователь: auth')
+        self.assertContains(authorized, reverse('posts:follow_index'))
+        self.assertNotContains(anonymous, 'Пользователь:')
+        self.assertNotContains(
+            self.client.get(reverse('posts:index')),
+            'Пользователь:',
+        )
+
+
+class CacheInvalidationTests(TempMediaTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user, self.author = mixer.cycle(2).blend(User)
+        self.group = mixer.blend(Group)
+        self.post = mixer.blend(Post, author=self.author, group=self.group)
+        thumbnails.generate(self.post.image.name)
+        Follow.objects.create(user=self.user, author=self.author)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.pages = {
+            'index': (reverse('posts:index'), self.client),
+            'group': (
+                reverse('posts:group_list', args=(self.group.slug,)),
+                self.client,
+            ),
+            'profile': (
+                reverse('posts:profile', args=(self.author.username,)),
+                self.client,
+            ),
+            'post': (
+                reverse('posts:post_detail', args=(self.post.pk,)),
+                self.client,
+            ),
+            'follow': (reverse('posts:follow_index'), self.authorized_client),
+        }
+        for address, client in self.pages.values():
+            client.get(address)
+
+    def assertPagesChanged(self, names: typing.Iterable[str]) -> None:
+        for name, (address, client) in self.pages.items():
+            with self.subTest(page=name):
+                templates = client.get(address).templates
+                self.assertEqual(
+                    'base.html' in [template.name for template in templates],
+                    name in names,
+                )
+
+    def test_post_edit_invalidates_feeds(self) -> None:
+        """Изменение поста сбрасывает все страницы, где он показан."""
+        self.post.text = 'Изменённый пост'
+        self.post.save()
+        self.assertPagesChanged(self.pages)
+
+    def test_comment_invalidates_only_post_page(self) -> None:
+        """Комментарий сбрасывает страницу поста, но не ленты."""
+        mixer.blend(Comment, post=self.post)
+        self.assertPagesChanged(['post'])
+
+    def test_deleting_post_with_comments_does_not_fan_out(self) -> None:
+        """Число запросов удаления поста не зависит от подписчиков
+        и комментариев."""
+        mixer.cycle(5).blend(Comment, post=self.post)
+        for user in mixer.cycle(5).blend(User):
+            Follow.objects.create(user=user, author=self.author)
+        with CaptureQueriesContext(connection) as few:
+            self.post.delete()
+        post = mixer.blend(Post, author=self.author, group=self.group)
+        mixer.cycle(20).blend(Comment, post=post)
+        for user in mixer.cycle(20).blend(User):
+            Follow.objects.create(user=user, author=self.author)
+        with CaptureQueriesContext(connection) as many:
+            post.delete()
+        self.assertEqual(len(many), len(few))
+        self.assertPagesChanged(self.pages)
+
+    @override_settings(TIMELINE_SYNC_LIMIT=0)
+    def test_deferred_fan_out_invalidates_follow_feed(self) -> None:
+        """Лента подписок сбрасывается после отложенной рассылки."""
+        post = mixer.blend(Post, author=self.author, text='Отложенный')
+        address, client = self.pages['follow']
+        self.assertNotContains(client.get(address), post.text)
+        worker.run(once=True)
+        self.assertContains(client.get(address), post.text)
+
+    def test_unfollow_invalidates_follow_feed_and_profile(self) -> None:
+        """Отписка сбрасывает ленту подписок и счётчики в профиле."""
+        Follow.objects.all().delete()
+        self.assertPagesChanged(['follow', 'profile'])
+
+
+class ConditionalGetTests(TempMediaTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = mixer.blend(User)
+        self.post = mixer.blend(
+            Post,
+            author=self.user,
+            group=mixer.blend(Group),
+            image='',
+        )
+        self.pages = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.post.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+
+    def test_not_modified_without_rendering(self) -> None:
+        """Повторный запрос с валидаторами получает 304 без рендера."""
+        for page in self.pages:
+            with self.subTest(page=page):
+                response = self.client.get(page)
+                self.assertTrue(response.has_header('Last-Modified'))
+                repeated = self.client.get(
+                    page,
+                    HTTP_IF_NONE_MATCH=response['ETag'],
+                )
+                self.assertEqual(repeated.status_code, HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(repeated.templates, [])
+                self.assertEqual(
+                    self.client.get(
+                        page,
+                        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+                    ).status_code,
+                    HTTPStatus.NOT_MODIFIED,
+                )
+
+    def test_index_not_modified_without_queries(self) -> None:
+        """Ответ 304 главной страницы не обращается к базе."""
+        etag = self.client.get(reverse('posts:index'))['ETag']
+        with self.assertNumQueries(0):
+            self.client.get(reverse('posts:index'), HTTP_IF_NONE_MATCH=etag)
+
+    def test_post_not_modified_without_queries(self) -> None:
+        """Ответ 304 страницы поста не обращается к базе."""
+        page = reverse('posts:post_detail', args=(self.post.pk,))
+        etag = self.client.get(page)['ETag']
+        with self.assertNumQueries(0):
+            self.client.get(page, HTTP_IF_NONE_MATCH=etag)
+
+    def test_etag_changes_with_personal_fragments(self) -> None:
+        """ETag меняется вместе с кнопкой подписки и рекомендациями."""
+        viewer = mixer.blend(User)
+        client = Client()
+        client.force_login(viewer)
+        page = reverse('posts:profile', args=(self.user.username,))
+        for change in (
+            lambda: Follow.objects.create(user=viewer, author=self.user),
+            lambda: call_command('compute_suggestions', stdout=StringIO()),
+        ):
+            etag = client.get(page)['ETag']
+            change()
+            self.assertEqual(
+                client.get(page, HTTP_IF_NONE_MATCH=etag).status_code,
+                HTTPStatus.OK,
+            )
+
+    def test_new_post_of_author_changes_post_page(self) -> None:
+        """Новый пост автора меняет счётчик на странице его поста."""
+        page = reverse('posts:post_detail', args=(self.post.pk,))
+        etag = self.client.get(page)['ETag']
+        mixer.blend(Post, author=self.user)
+        self.assertEqual(
+            self.client.get(page, HTTP_IF_NONE_MATCH=etag).status_code,
+            HTTPStatus.OK,
+        )
+
+    def test_etag_changes_with_content_and_user(self) -> None:
+        """ETag меняется при новом комментарии и для другого пользователя."""
+        page = reverse('posts:post_detail', args=(self.post.pk,))
+        etag = self.client.get(page)['ETag']
+        client = Client()
+        client.force_login(self.user)
+        self.assertNotEqual(client.get(page)['ETag'], etag)
+        mixer.blend(Comment, post=self.post)
+        self.assertEqual(
+            self.client.get(page, HTTP_IF_NONE_MATCH=etag).status_code,
+            HTTPStatus.OK,
+        )
@@ -0,0 +1,132 @@
+import threading
+import typing
+
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+
+Geometry = typing.Tuple[str, typing.Dict[str, typing.Any]]
+
+# Все размеры миниатюр из шаблонов: фоновая задача создаёт именно их.
+GEOMETRIES: typing.Tuple[Geometry, ...] = (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+)
+
+_local = threading.local()
+
+
+class DeferredThumbnailBackend(ThumbnailBackend):
+    """Бэкенд sorl-thumbnail, не создающий миниатюры во время рендера.
+
+    Готовая миниатюра берётся из хранилища ключей, а недостающая
+    создаётся фоновой задачей. До этого тег ``thumbnail`` выводит
+    блок ``empty``. Вне запроса миниатюры создаются сразу.
+    """
+
+    def get_thumbnail(
+        self,
+        file_: typing.Any,
+        geometry_string: str,
+        **options,
+    ) -> typing.Optional[ImageFile]:
+        if not deferring():
+            return super().get_thumbnail(file_, geometry_string, **options)
+        if not file_:
+            return None
+        source = ImageFile(file_)
+        thumbnail = ImageFile(
+            self._get_thumbnail_filename(
+                source,
+                geometry_string,
+                self._merge_options(source, dict(options)),
+            ),
+            default.storage,
+        )
+        cached = default.kvstore.get(thumbnail)
+        if cached:
+            return cached
+        if source.exists():
+            schedule(source.name, ((geometry_string, options),))
+        return None
+
+    def _merge_options(
+        self,
+        source: ImageFile,
+        options: typing.Dict[str, typing.Any],
+    ) -> typing.Dict[str, typing.Any]:
+        """Дополняет опции так же, как ``ThumbnailBackend.get_thumbnail``.
+
+        От опций зависит имя файла миниатюры, поэтому без них нельзя
+        найти уже созданную миниатюру.
+        """
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        return options
+
+
+def generate(
+    name: str,
+    geometries: typing.Iterable[Geometry] = GEOMETRIES,
+) -> str:
+    """Создаёт миниатюры изображения во всех нужных размерах.
+
+    Args:
+        name: Имя файла изображения в хранилище.
+        geometries: Размеры и опции миниатюр.
+
+    Returns:
+        Имя обработанного изображения.
+    """
+    backend = ThumbnailBackend()
+    for geometry, options in geometries:
+        backend.get_thumbnail(name, geometry, **options)
+    return name
+
+
+def deferring() -> bool:
+    return getattr(_local, 'queue', None) is not None
+
+
+def start_request() -> None:
+    _local.queue = {}
+
+
+def finish_request() -> typing.Dict[str, typing.List[Geometry]]:
+    """Забирает миниатюры, отложенные во время обработки запроса.
+
+    Returns:
+        Размеры миниатюр по именам изображений.
+    """
+    queue, _local.queue = getattr(_local, 'queue', None), None
+    return queue or {}
+
+
+def schedule(
+    name: str,
+    geometries: typing.Iterable[Geometry] = GEOMETRIES,
+) -> None:
+    """Откладывает создание миниатюр до окончания запроса.
+
+    Повторные запросы одного изображения за время запроса объединяются,
+    после ответа миниатюры ставятся в очередь фоновых задач. Вне запроса
+    миниатюры создаются сразу.
+
+    Args:
+        name: Имя файла изображения в хранилище.
+        geometries: Размеры и опции миниатюр.
+    """
+    if not deferring():
+        generate(name, geometries)
+        return
+    queued = _local.queue.setdefault(name, [])
+    queued.extend(
+        geometry for geometry in geometries if geometry not in queued
+    )
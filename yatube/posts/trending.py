@@ -0,0 +1,98 @@
+import datetime
+import heapq
+import typing
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from posts import invalidation
+from posts.models import Follow, Post, TrendingPost
+
+# Строка выборки: id, дата публикации, комментарии, просмотры, подписки.
+Row = typing.Tuple[int, datetime.datetime, int, int, int]
+
+
+def score(row: Row, now: datetime.datetime) -> float:
+    """Рейтинг поста: вовлечённость, затухающая с возрастом поста.
+
+    Args:
+        row: Строка выборки поста.
+        now: Время расчёта.
+
+    Returns:
+        Рейтинг, больший у свежих постов с большей вовлечённостью.
+    """
+    _, created, comments, views, follows = row
+    weights = settings.TRENDING_WEIGHTS
+    engagement = (
+        weights['comments'] * comments
+        + weights['views'] * views
+        + weights['follows'] * follows
+    )
+    age = max((now - created).total_seconds() / 3600, 0)
+    return engagement / (age + 2) ** settings.TRENDING_GRAVITY
+
+
+def _rows(since: datetime.datetime) -> typing.Iterator[Row]:
+    # Подписки на автора, полученные после публикации поста.
+    follows = (
+        Follow.objects.filter(
+            author=OuterRef('author'),
+            created__gte=OuterRef('created'),
+        )
+        .order_by()
+        .values('author')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return (
+        Post.objects.filter(created__gte=since)
+        .annotate(
+            follows=Coalesce(
+                Subquery(follows, output_field=models.IntegerField()),
+                0,
+            ),
+        )
+        .values_list(
+            'pk',
+            'created',
+            'comment_count',
+            'view_count',
+            'follows',
+        )
+        .iterator()
+    )
+
+
+def compute(now: typing.Optional[datetime.datetime] = None) -> int:
+    """Пересчитывает таблицу популярных постов.
+
+    Учитываются посты за последние ``TRENDING_WINDOW_HOURS`` часов: более
+    старые уже не набирают заметного рейтинга. В памяти держатся только
+    ``TRENDING_SIZE`` лучших постов, таблица заменяется в одной
+    транзакции, а закэшированные страницы популярного сбрасываются.
+
+    Args:
+        now: Время расчёта, по умолчанию текущее.
+
+    Returns:
+        Количество постов в популярном.
+    """
+    now = now or timezone.now()
+    since = now - datetime.timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    scored = ((score(row, now), row[0]) for row in _rows(since))
+    best = heapq.nlargest(
+        settings.TRENDING_SIZE,
+        (item for item in scored if item[0] > 0),
+    )
+    with transaction.atomic():
+        TrendingPost.objects.all().delete()
+        TrendingPost.objects.bulk_create(
+            TrendingPost(post_id=post_id, rank=rank, score=value)
+            for rank, (value, post_id) in enumerate(best, start=1)
+        )
+    invalidation.trending_changed()
+    return len(best)
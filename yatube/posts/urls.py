@@ -6,8 +6,14 @@ app_name = '%(app_label)s'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('feeds/<str:kind>/', views.index_feed, name='index_feed'),
     path('create/', views.post_create, name='post_create'),
     path('group/<str:slug>/', views.group_posts, name='group_list'),
+    path(
+        'group/<str:slug>/feeds/<str:kind>/',
+        views.group_feed,
+        name='group_feed',
+    ),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -19,12 +25,30 @@ urlpatterns = [
         name='profile_unfollow',
     ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/feeds/<str:kind>/',
+        views.profile_feed,
+        name='profile_feed',
+    ),
     path(
         'posts/<int:pk>/comment/',
         views.add_comment,
         name='add_comment',
     ),
+    path(
+        'posts/<int:pk>/comments/',
+        views.post_comments,
+        name='post_comments',
+    ),
     path('posts/<int:pk>/edit/', views.post_edit, name='post_edit'),
     path('posts/<int:pk>/', views.post_detail, name='post_detail'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('trending/', views.trending, name='trending'),
+    path('search/', views.post_search, name='search'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path(
+        'sitemap-<str:section>-<int:number>.xml',
+        views.sitemap_chunk,
+        name='sitemap_chunk',
+    ),
 ]
@@ -0,0 +1,105 @@
+import collections
+import functools
+import threading
+import time
+import typing
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+from posts.models import Post
+
+# Просмотры, ещё не записанные в базу: id поста -> прирост. Буфер свой
+# у каждого процесса и сбрасывается после запросов, поэтому при аварийном
+# завершении теряются просмотры не более чем за интервал сброса.
+_pending: typing.Counter[int] = collections.Counter()
+_lock = threading.Lock()
+_flushed_at = time.monotonic()
+
+COUNTED_STATUSES = frozenset((200, 304))
+
+
+def record(post_id: int) -> None:
+    with _lock:
+        _pending[post_id] += 1
+
+
+def pending(post_id: int) -> int:
+    with _lock:
+        return _pending[post_id]
+
+
+def flush() -> int:
+    """Записывает накопленные просмотры в базу.
+
+    Приросты всех постов пачки прибавляются одним ``UPDATE`` с ``CASE``,
+    поэтому запись не зависит от числа просмотров. Если запись не
+    удалась, приросты возвращаются в буфер. Теги страниц не сбрасываются:
+    ключ карточки включает число просмотров, а закэшированные ленты
+    покажут новые числа после сброса их тегов или истечения записи.
+
+    Returns:
+        Количество постов, счётчики которых обновлены.
+    """
+    global _flushed_at
+    with _lock:
+        deltas = dict(_pending)
+        _pending.clear()
+        _flushed_at = time.monotonic()
+    ids = sorted(deltas)
+    batch_size = settings.VIEW_COUNTS_BATCH_SIZE
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        batch = ids[start:end]
+        try:
+            Post.objects.filter(pk__in=batch).update(
+                view_count=F('view_count')
+                + Case(
+                    *(When(pk=pk, then=Value(deltas[pk])) for pk in batch),
+                    output_field=IntegerField(),
+                ),
+            )
+        except Exception:
+            with _lock:
+                _pending.update({pk: deltas[pk] for pk in ids[start:]})
+            raise
+    return len(ids)
+
+
+def flush_due() -> None:
+    """Записывает просмотры, если прошёл интервал или буфер переполнен."""
+    with _lock:
+        due = _pending and (
+            time.monotonic() - _flushed_at
+            >= settings.VIEW_COUNTS_FLUSH_INTERVAL
+            or len(_pending) >= settings.VIEW_COUNTS_MAX_PENDING
+        )
+    if due:
+        flush()
+
+
+def count_views(view: typing.Callable) -> typing.Callable:
+    """Учитывает просмотр поста, в том числе отданного из кэша.
+
+    Декоратор ставится поверх кэширующего, иначе просмотры закэшированной
+    страницы не учитываются.
+    """
+
+    @functools.wraps(view)
+    def wrapper(
+        request: HttpRequest,
+        pk: int,
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> HttpResponseBase:
+        response = view(request, pk, *args, **kwargs)
+        if (
+            request.method == 'GET'
+            and response.status_code in COUNTED_STATUSES
+        ):
+            record(pk)
+        return response
+
+    return wrapper
@@ -1,14 +1,26 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponse
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.urls import reverse
 
+from core.cache_tags import versions
+from core.page_cache import cache_page_shared
 from core.utils import paginate
+from posts import feeds, invalidation, search, sitemaps, view_counts
 from posts.forms import CommentForm, PostForm
-from posts.models import Follow, Group, Post, User
+from posts.models import Follow, Group, Post, TimelineEntry, User
+from posts.rows import post_rows, timeline_rows
 
+FEED_KEYSET = ('created', 'id')
 
-@cache_page(20)
+
+@cache_page_shared(
+    tags=invalidation.index_tags,
+    conditional=True,
+    personal_tags=invalidation.personal_tags,
+)
 def index(request: HttpRequest) -> HttpResponse:
     """Обработка перехода на главную страницу.
 
@@ -24,15 +36,18 @@ def index(request: HttpRequest) -> HttpResponse:
         {
             'page_obj': paginate(
                 request,
-                Post.objects.select_related(
-                    'author',
-                    'group',
-                ),
+                post_rows(Post.objects.all()),
+                keyset=FEED_KEYSET,
             ),
         },
     )
 
 
+@cache_page_shared(
+    tags=invalidation.group_tags,
+    conditional=True,
+    personal_tags=invalidation.personal_tags,
+)
 def group_posts(request: HttpRequest, slug: str) -> HttpResponse:
     """Обработка перехода на страницу определённой группы.
 
@@ -50,13 +65,19 @@ def group_posts(request: HttpRequest, slug: str) -> HttpResponse:
         {
             'page_obj': paginate(
                 request,
-                group.posts.select_related('author'),
+                post_rows(group.posts.all()),
+                keyset=FEED_KEYSET,
             ),
             'group': group,
         },
     )
 
 
+@cache_page_shared(
+    tags=invalidation.profile_tags,
+    conditional=True,
+    personal_tags=invalidation.personal_tags,
+)
 def profile(request: HttpRequest, username: str) -> HttpResponse:
     """Обработка перехода на страницу пользователя.
 
@@ -67,9 +88,9 @@ def profile(request: HttpRequest, username: str) -> HttpResponse:
     Returns:
         Рендер страницы пользователя.
     """
-    author = get_object_or_404(User, username=username)
-    following = request.user.is_authenticated and request.user.follower.filter(
-        author=author,
+    author = get_object_or_404(
+        User.objects.select_related('stats'),
+        username=username,
     )
     return render(
         request,
@@ -77,14 +98,171 @@ def profile(request: HttpRequest, username: str) -> HttpResponse:
         {
             'page_obj': paginate(
                 request,
-                author.posts.select_related('group'),
+                post_rows(author.posts.all()),
+                keyset=FEED_KEYSET,
             ),
             'author': author,
-            'following': following,
         },
     )
 
 
+def _feed_kind(kind: str) -> str:
+    if kind not in feeds.FORMATS:
+        raise Http404(f'Неизвестный формат ленты: {kind}')
+    return kind
+
+
+def index_feed(request: HttpRequest, kind: str) -> HttpResponseBase:
+    """Лента всех постов сайта в формате Atom или RSS.
+
+    Args:
+        request: Передаваемый запрос.
+        kind: Формат ленты: atom или rss.
+
+    Returns:
+        Потоковый или закэшированный документ ленты.
+    """
+    return feeds.feed_response(
+        request,
+        _feed_kind(kind),
+        'Последние обновления на сайте',
+        reverse('posts:index'),
+        Post.objects.all(),
+        invalidation.index_tags(request),
+    )
+
+
+def group_feed(request: HttpRequest, slug: str, kind: str) -> HttpResponseBase:
+    """Лента постов группы в формате Atom или RSS.
+
+    Args:
+        request: Передаваемый запрос.
+        slug: Адрес группы.
+        kind: Формат ленты: atom или rss.
+
+    Returns:
+        Потоковый или закэшированный документ ленты.
+    """
+    group = get_object_or_404(Group, slug=slug)
+    return feeds.feed_response(
+        request,
+        _feed_kind(kind),
+        f'Записи сообщества {group.title}',
+        reverse('posts:group_list', args=(slug,)),
+        group.posts.all(),
+        invalidation.group_tags(request, slug),
+    )
+
+
+def profile_feed(
+    request: HttpRequest,
+    username: str,
+    kind: str,
+) -> HttpResponseBase:
+    """Лента постов автора в формате Atom или RSS.
+
+    Args:
+        request: Передаваемый запрос.
+        username: Логин автора.
+        kind: Формат ленты: atom или rss.
+
+    Returns:
+        Потоковый или закэшированный документ ленты.
+    """
+    author = get_object_or_404(User, username=username)
+    return feeds.feed_response(
+        request,
+        _feed_kind(kind),
+        f'Все посты пользователя {author.get_full_name() or username}',
+        reverse('posts:profile', args=(username,)),
+        author.posts.all(),
+        invalidation.profile_tags(request, username),
+    )
+
+
+def _sitemap_file(name: str) -> FileResponse:
+    path = settings.SITEMAP_ROOT / name
+    if not path.is_file():
+        raise Http404('Карта сайта ещё не построена.')
+    return FileResponse(path.open('rb'), content_type='application/xml')
+
+
+def sitemap_index(request: HttpRequest) -> FileResponse:
+    """Индекс карты сайта, собранный командой ``generate_sitemaps``.
+
+    Args:
+        request: Передаваемый запрос.
+
+    Returns:
+        Файл индекса.
+    """
+    return _sitemap_file(sitemaps.INDEX_NAME)
+
+
+def sitemap_chunk(
+    request: HttpRequest,
+    section: str,
+    number: int,
+) -> FileResponse:
+    """Часть карты сайта с адресами одного раздела.
+
+    Args:
+        request: Передаваемый запрос.
+        section: Раздел: posts, profiles или groups.
+        number: Номер части раздела.
+
+    Returns:
+        Файл части.
+    """
+    if section not in {item.name for item in sitemaps.SECTIONS}:
+        raise Http404('Такого раздела карты сайта нет.')
+    return _sitemap_file(sitemaps.chunk_name(section, number))
+
+
+def _render_post_detail(
+    request: HttpRequest,
+    post: Post,
+    form: CommentForm,
+) -> HttpResponse:
+    """Рендерит страницу поста с переданной формой комментария.
+
+    Args:
+        request: Передаваемый запрос.
+        post: Показываемый пост.
+        form: Пустая форма или отклонённая форма с ошибками.
+
+    Returns:
+        Рендер страницы поста.
+    """
+    return render(
+        request,
+        'posts/post_detail.html',
+        {
+            'post': post,
+            'form': form,
+            # Похожие посты читаются только при промахе кэша фрагмента,
+            # ключ которого меняется с версией их тега.
+            'related': post.related_links.select_related(
+                'related',
+            ).order_by('rank')[: settings.RELATED_SIZE],
+            'related_version': versions([invalidation.related_tag(post.pk)]),
+            'related_timeout': settings.RELATED_FRAGMENT_TIMEOUT,
+            'page_obj': paginate(
+                request,
+                post.comments.select_related('author'),
+                settings.COMMENTS_ON_PAGE,
+                keyset=FEED_KEYSET,
+            ),
+        },
+    )
+
+
+@view_counts.count_views
+@cache_page_shared(
+    tags=invalidation.post_detail_tags,
+    conditional=True,
+    personal_tags=invalidation.personal_tags,
+)
 def post_detail(request: HttpRequest, pk: int) -> HttpResponse:
     """Обработка перехода на страницу определённого поста.
 
@@ -95,16 +273,62 @@ def post_detail(request: HttpRequest, pk: int) -> HttpResponse:
     Returns:
         Рендер страницы выбранного поста.
     """
-    post = get_object_or_404(Post, id=pk)
-    form = CommentForm(
-        request.POST or None,
+    post = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group'),
+        id=pk,
     )
+    return _render_post_detail(request, post, CommentForm())
+
+
+@cache_page_shared(tags=invalidation.comments_tags)
+def post_comments(request: HttpRequest, pk: int) -> HttpResponse:
+    """Обработка запроса очередной порции комментариев к посту.
+
+    Args:
+        request: Передаваемый запрос.
+        pk: id поста, комментарии к которому запрашиваются
+
+    Returns:
+        HTML-фрагмент со списком комментариев.
+    """
+    post = get_object_or_404(Post, id=pk)
     return render(
         request,
-        'posts/post_detail.html',
+        'posts/comments.html',
         {
             'post': post,
-            'form': form,
+            'page_obj': paginate(
+                request,
+                post.comments.select_related('author'),
+                settings.COMMENTS_ON_PAGE,
+                keyset=FEED_KEYSET,
+            ),
+        },
+    )
+
+
+def post_search(request: HttpRequest) -> HttpResponse:
+    """Обработка перехода на страницу поиска по постам.
+
+    Args:
+        request: Передаваемый запрос.
+
+    Returns:
+        Рендер страницы с найденными постами.
+    """
+    query = request.GET.get('q', '')
+    return render(
+        request,
+        'posts/search.html',
+        {
+            'page_obj': paginate(
+                request,
+                search.POSTS.search(
+                    query,
+                    Post.objects.select_related('author', 'group'),
+                ),
+            ),
+            'query': query,
         },
     )
 
@@ -176,19 +400,21 @@ def add_comment(request: HttpRequest, pk: str) -> HttpResponse:
         pk: id поста, подвергаемого комментированию
 
     Returns:
-        Рендер страницы выбранного поста.
+        Редирект на страницу поста или её рендер с ошибками формы.
     """
     post = get_object_or_404(Post, id=pk)
     form = CommentForm(request.POST or None)
-    if not form.is_valid():
-        return redirect('posts:post_detail', pk=pk)
-    form.instance.author = request.user
-    form.instance.post = post
-    form.save()
+    if form.is_valid():
+        form.instance.author = request.user
+        form.instance.post = post
+        form.save()
+    elif form.is_bound:
+        return _render_post_detail(request, post, form)
     return redirect('posts:post_detail', pk=pk)
 
 
 @login_required
+@cache_page_shared(tags=invalidation.follow_tags, per_user=True)
 def follow_index(request: HttpRequest) -> HttpResponse:
     """Обработка перехода на страницу постов из подписок.
 
@@ -198,17 +424,47 @@ def follow_index(request: HttpRequest) -> HttpResponse:
     Returns:
         Рендер страницы редактирования поста.
     """
+    page = paginate(
+        request,
+        timeline_rows(
+            TimelineEntry.objects.filter(user=request.user).order_by(
+                '-created',
+                '-id',
+            ),
+        ),
+        keyset=FEED_KEYSET,
+    )
+    # Курсоры уже построены по записям ленты, шаблону нужны сами посты.
+    page.object_list = [entry.post for entry in page.object_list]
+    return render(request, 'posts/follow.html', {'page_obj': page})
+
+
+@cache_page_shared(
+    tags=invalidation.trending_tags,
+    conditional=True,
+    personal_tags=invalidation.personal_tags,
+)
+def trending(request: HttpRequest) -> HttpResponse:
+    """Обработка перехода на страницу популярных постов.
+
+    Порядок постов заранее рассчитан командой ``compute_trending``.
+
+    Args:
+        request: Передаваемый запрос.
+
+    Returns:
+        Рендер страницы популярных постов.
+    """
     return render(
         request,
-        'posts/follow.html',
+        'posts/trending.html',
         {
             'page_obj': paginate(
                 request,
-                Post.objects.filter(
-                    author__following__user=request.user,
-                ).select_related(
-                    'author',
-                    'group',
+                post_rows(
+                    Post.objects.filter(trending__isnull=False).order_by(
+                        'trending__rank',
+                    ),
                 ),
             ),
         },
@@ -227,13 +483,8 @@ def profile_follow(request: HttpRequest, username: str) -> HttpResponse:
         Рендер страницы редактирования поста.
     """
     author = get_object_or_404(User, username=username)
-    if (
-        author != request.user
-        and not author.following.filter(
-            user=request.user,
-        ).exists()
-    ):
-        Follow.objects.create(author=author, user=request.user)
+    if author != request.user:
+        Follow.objects.get_or_create(author=author, user=request.user)
     return redirect('posts:profile', username=username)
 
 
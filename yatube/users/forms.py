@@ -1,5 +1,10 @@
+import typing
+
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+from django.template import loader
+
+from users import tasks
 
 User = get_user_model()
 
@@ -11,3 +16,31 @@ class CreationForm(UserCreationForm):
             'username': 'логин пользователя',
         }
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Форма сброса пароля, отправляющая письмо фоновой задачей."""
+
+    def send_mail(
+        self,
+        subject_template_name: str,
+        email_template_name: str,
+        context: typing.Dict[str, typing.Any],
+        from_email: typing.Optional[str],
+        to_email: str,
+        html_email_template_name: typing.Optional[str] = None,
+    ) -> None:
+        subject = ''.join(
+            loader.render_to_string(subject_template_name, context)
+            .strip()
+            .splitlines(),
+        )
+        tasks.send_email.enqueue(
+            subject,
+            loader.render_to_string(email_template_name, context),
+            from_email,
+            [to_email],
+            loader.render_to_string(html_email_template_name, context)
+            if html_email_template_name is not None
+            else None,
+        )
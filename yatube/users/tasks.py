@@ -0,0 +1,28 @@
+import typing
+
+from django.core.mail import EmailMultiAlternatives
+
+from outbox.queue import task
+
+
+@task(priority=20)
+def send_email(
+    subject: str,
+    body: str,
+    from_email: typing.Optional[str],
+    to: typing.List[str],
+    html: typing.Optional[str] = None,
+) -> None:
+    """Отправляет письмо, подготовленное во время запроса.
+
+    Args:
+        subject: Тема письма.
+        body: Текст письма.
+        from_email: Отправитель, по умолчанию ``DEFAULT_FROM_EMAIL``.
+        to: Получатели.
+        html: HTML-версия письма.
+    """
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html is not None:
+        message.attach_alternative(html, 'text/html')
+    message.send()
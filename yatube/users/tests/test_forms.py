@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.core import mail
 from django.test import Client, TestCase
 from django.urls import reverse
 
+from outbox import worker
 from users.forms import CreationForm
 
 User = get_user_model()
@@ -45,3 +47,17 @@ class PostFormTests(TestCase):
                 email='test_email@mail.ru',
             ).exists(),
         )
+
+    def test_password_reset_email_sent_by_worker(self) -> None:
+        """Письмо для сброса пароля отправляет фоновая задача."""
+        self.user.email = 'auth@mail.ru'
+        self.user.set_password('test_password')
+        self.user.save()
+        self.guest_client.post(
+            reverse('users:pass_reset'),
+            {'email': self.user.email},
+        )
+        self.assertEqual(mail.outbox, [])
+        worker.run(once=True)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
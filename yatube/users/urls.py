@@ -1,6 +1,7 @@
 from django.contrib.auth import views
 from django.urls import include, path
 
+from users.forms import QueuedPasswordResetForm
 from users.views import SignUp
 
 app_name = '%(app_label)s'
@@ -21,7 +22,11 @@ passwords = [
         views.PasswordResetDoneView.as_view(),
         name='pass_reset_done',
     ),
-    path('reset/', views.PasswordResetView.as_view(), name='pass_reset'),
+    path(
+        'reset/',
+        views.PasswordResetView.as_view(form_class=QueuedPasswordResetForm),
+        name='pass_reset',
+    ),
     path(
         'reset/complete/',
         views.PasswordResetCompleteView.as_view(),
@@ -1,3 +1,6 @@
+import os
+import sys
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
@@ -29,12 +32,14 @@ INSTALLED_APPS = [
 
     'about.apps.AboutConfig',
     'core.apps.CoreConfig',
+    'outbox.apps.OutboxConfig',
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
 ]
 # fmt: on
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,7 +58,7 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -107,8 +112,62 @@ STATIC_URL = '/yatube/static/'
 
 OBJECTS_ON_PAGE = 10
 
+COMMENTS_ON_PAGE = 20
+
 TEXT_LENGTH = 15
 
+TIMELINE_BATCH_SIZE = 500
+
+TIMELINE_SYNC_LIMIT = 500
+
+COUNTERS_BATCH_SIZE = 1000
+
+VIEW_COUNTS_FLUSH_INTERVAL = 10
+
+VIEW_COUNTS_MAX_PENDING = 1000
+
+VIEW_COUNTS_BATCH_SIZE = 300
+
+TRENDING_WINDOW_HOURS = 24 * 7
+
+TRENDING_SIZE = 500
+
+TRENDING_GRAVITY = 1.5
+
+TRENDING_WEIGHTS = {'comments': 3, 'views': 0.1, 'follows': 5}
+
+SUGGESTIONS_SIZE = 10
+
+SUGGESTIONS_SHOWN = 5
+
+SUGGESTIONS_ACTIVITY_DAYS = 30
+
+SUGGESTIONS_BATCH_SIZE = 1000
+
+RELATED_SIZE = 5
+
+RELATED_TERMS = 64
+
+RELATED_MAX_DF = 0.5
+
+RELATED_MIN_SCORE = 0.05
+
+RELATED_BLOCK_SIZE = 256
+
+RELATED_PROCESSES = os.cpu_count() or 1
+
+RELATED_FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+DUPLICATES_DISTANCE = 3
+
+DUPLICATES_MIN_TOKENS = 5
+
+DUPLICATES_WINDOW_HOURS = 24
+
+DUPLICATES_CANDIDATES = 50
+
+DUPLICATES_BATCH_SIZE = 2000
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -123,12 +182,79 @@ MEDIA_ROOT = str(BASE_DIR / 'media')
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
+# Тесты очищают кэш при создании базы, поэтому у них свой файл кэша.
+CACHE_LOCATION = os.getenv(
+    'CACHE_LOCATION',
+    Path(tempfile.gettempdir(), 'yatube-test-cache.sqlite3')
+    if TESTING
+    else BASE_DIR / 'cache.sqlite3',
+)
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache_backends.SQLiteCache',
+        'LOCATION': CACHE_LOCATION,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100_000,
+            'MAX_SIZE': 256 * 1024 * 1024,
+        },
     },
 }
 
+CACHE_L1_MAX_ENTRIES = 200
+
+CACHE_L1_TIMEOUT = 5
+
+CACHE_STALE_TIMEOUT = 60
+
+CACHE_LOCK_TIMEOUT = 10
+
+PAGE_CACHE_TIMEOUT = 60 * 60 * 3
+
+POST_CARD_TIMEOUT = 60 * 60 * 24
+
+FEED_ITEMS = 50
+
+FEED_CHUNK_SIZE = 10
+
+FEED_TITLE_WORDS = 10
+
+FEED_CACHE_TIMEOUT = PAGE_CACHE_TIMEOUT
+
+TASKS_CONCURRENCY = 4
+
+TASKS_BATCH_SIZE = 20
+
+TASKS_POLL_INTERVAL = 1
+
+TASKS_MAX_ATTEMPTS = 5
+
+TASKS_RETRY_DELAY = 10
+
+TASKS_RETRY_MAX_DELAY = 60 * 60
+
+TASKS_LEASE_TIMEOUT = 60 * 5
+
+SITE_URL = os.getenv('SITE_URL', 'http://127.0.0.1:8000')
+
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
+SITEMAP_CHUNK_SIZE = 50_000
+
+SITEMAP_BATCH_SIZE = 2_000
+
+METRICS_WINDOW = 1000
+
+METRICS_PREFIX = 'yatube'
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+BENCHMARK_RESULTS_DIR = BASE_DIR / 'benchmarks'
+
+THUMBNAIL_BACKEND = 'posts.thumbnails.DeferredThumbnailBackend'
+
 OBJECTS_ON_PAGE = 10
 
 INTERNAL_IPS = [
@@ -4,6 +4,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import metrics_view
 
 handler404 = 'core.views.page_not_found'
 handler403 = 'core.views.csrf_failure'
@@ -14,6 +15,7 @@ urlpatterns = [
         include('about.urls', namespace=apps.get_app_config('about').name),
     ),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path(
         'auth/',
         include('users.urls', namespace=apps.get_app_config('users').name),
@@ -31,8 +33,9 @@ urlpatterns += static(
 )
 
 if settings.DEBUG:
-    import debug_toolbar
     import mimetypes
 
+    import debug_toolbar
+
     mimetypes.add_type("application/javascript", ".js", True)
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)